@@ -2,10 +2,8 @@ import sys
 from PySide6.QtWidgets import QApplication
 
 from core.config_manager import ConfigManager
-from ui.startup.role_select import RoleSelectDialog
-from ui.startup.game_select import GameSelectDialog
-from ui.main.pl_window import PLMainWindow
 
+# 各界面按需导入：只选身份/游戏时不加载主窗口、角色卡标签页与静态数据
 def main():
     app = QApplication(sys.argv)
     config_mgr = ConfigManager()
@@ -14,6 +12,7 @@ def main():
         role = config_mgr.get_role()
         
         if not role:
+            from ui.startup.role_select import RoleSelectDialog
             role_dialog = RoleSelectDialog()
             if role_dialog.exec():
                 role = role_dialog.selected_role
@@ -21,6 +20,7 @@ def main():
             else:
                 sys.exit(0)
 
+        from ui.startup.game_select import GameSelectDialog
         game_dialog = GameSelectDialog(role)
         result = game_dialog.exec()
         
@@ -34,6 +34,7 @@ def main():
 
         main_window = None
         if role == "PL":
+            from ui.main.pl_window import PLMainWindow
             main_window = PLMainWindow(game_name)
         elif role == "GM":
             from ui.main.gm_window import GMMainWindow
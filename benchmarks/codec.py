@@ -0,0 +1,132 @@
+"""
+消息体编码基准：按消息类型比较各编码实现的编码 / 解码耗时与大小
+
+    python benchmarks/codec.py                # 使用 compression.py 的示例会话 (角色卡、掷骰日志、混沌值)
+    python benchmarks/codec.py --rounds 20
+
+json (旧) 为改动前的写法 (json.dumps(ensure_ascii=False) 再 encode)；没有安装的可选实现 (orjson / msgpack) 不参与比较
+文件块为 256 KB 随机数据：JSON 中为 base64 文本，msgpack 中为二进制
+最后比较广播一条日志给使用不同压缩算法的多个 PL 时，每种压缩算法各自编码 (旧) 与共用一个 Frame 的耗时
+"""
+import argparse
+import base64
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from benchmarks.compression import sample_session
+from core.network import codec
+from core.network.protocol import pack_msg, available_compression, Frame, FILE_CHUNK_SIZE, MsgType
+
+def implementations():
+    """名称 -> (编码函数, 解码函数, 文件内容是否为二进制)"""
+    impls = {
+        "json (旧)": (
+            lambda obj: json.dumps(obj, ensure_ascii=False).encode("utf-8"),
+            lambda data: json.loads(data.decode("utf-8")),
+            False,
+        ),
+        "json": (
+            lambda obj: json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8"),
+            json.loads,
+            False,
+        ),
+    }
+    if codec.orjson is not None:
+        orjson = codec.orjson
+        impls["orjson"] = (lambda obj: orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS), orjson.loads, False)
+    if codec.msgpack is not None:
+        msgpack = codec.msgpack
+        impls["msgpack"] = (
+            lambda obj: msgpack.packb(obj, use_bin_type=True),
+            lambda data: msgpack.unpackb(data, raw=False, strict_map_key=False),
+            True,
+        )
+    return impls
+
+CATEGORIES = {
+    MsgType.SHEET_UPDATE: "角色卡",
+    MsgType.LOG_SYNC: "掷骰日志",
+    MsgType.CHAOS_SYNC: "混沌值",
+    MsgType.FILE_SEND: "文本资料",
+}
+
+def grouped_messages():
+    groups = defaultdict(list)
+    for msg_type, data in sample_session():
+        groups[CATEGORIES.get(msg_type, msg_type)].append({"type": msg_type, "data": data})
+    chunk = os.urandom(FILE_CHUNK_SIZE)
+    groups["文件块"] = [{"type": MsgType.FILE_CHUNK, "data": {"hash": "0" * 64, "offset": 0, "content": chunk}}]
+    return groups
+
+def for_impl(messages, binary):
+    """文件块在不支持二进制的编码中以 base64 文本传输"""
+    result = []
+    for msg in messages:
+        content = msg["data"].get("content") if isinstance(msg["data"], dict) else None
+        if isinstance(content, bytes) and not binary:
+            msg = {"type": msg["type"], "data": dict(msg["data"], content=base64.b64encode(content).decode("utf-8"))}
+        result.append(msg)
+    return result
+
+def measure(messages, encode, decode, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        bodies = [encode(msg) for msg in messages]
+    encode_us = (time.perf_counter() - start) / rounds / len(messages) * 1e6
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for body in bodies:
+            decode(body)
+    decode_us = (time.perf_counter() - start) / rounds / len(messages) * 1e6
+    return encode_us, decode_us, sum(map(len, bodies)) // len(bodies)
+
+def measure_broadcast(html, peers, rounds):
+    """广播一条日志：每种压缩算法各打包一次 (各自编码消息体)，与所有 PL 共用一个 Frame"""
+    compressions = [None] + available_compression()
+    targets = [compressions[i % len(compressions)] for i in range(peers)]
+    start = time.perf_counter()
+    for _ in range(rounds):
+        frames = {}
+        for compression in targets:
+            if compression not in frames:
+                frames[compression] = pack_msg(MsgType.LOG_SYNC, html, compression)
+    per_compression = (time.perf_counter() - start) / rounds * 1e6
+    start = time.perf_counter()
+    for _ in range(rounds):
+        frame = Frame(MsgType.LOG_SYNC, html)
+        for compression in targets:
+            frame.packed(compression=compression)
+    shared = (time.perf_counter() - start) / rounds * 1e6
+    return per_compression, shared
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=50, help="每组消息重复编码 / 解码的次数")
+    parser.add_argument("--peers", type=int, default=8, help="广播测试中的 PL 数")
+    args = parser.parse_args()
+
+    impls = implementations()
+    groups = grouped_messages()
+    print(f"编码 / 解码 (每条消息 µs) 与平均大小 (bytes)；当前使用: {', '.join(codec.available_encodings())}"
+          f"{' (orjson)' if codec.orjson is not None else ''}")
+    print(f"{'':<10} {'实现':<10} {'编码':>10} {'解码':>10} {'大小':>10}")
+    for category, messages in groups.items():
+        for name, (encode, decode, binary) in impls.items():
+            enc, dec, size = measure(for_impl(messages, binary), encode, decode, args.rounds)
+            print(f"{category:<10} {name:<10} {enc:10.1f} {dec:10.1f} {size:10d}")
+
+    html = groups["掷骰日志"][0]["data"]
+    per_compression, shared = measure_broadcast(html, args.peers, args.rounds * 20)
+    print(f"\n广播一条日志给 {args.peers} 个 PL (压缩: {', '.join(['none'] + available_compression())})")
+    print(f"按压缩算法编码 {per_compression:8.1f} µs    共用 Frame {shared:8.1f} µs")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+"""
+协议压缩基准：按实际的帧格式打包一段会话中的消息，比较不压缩 / zlib / zstd 的传输字节数与耗时
+
+    python benchmarks/compression.py                      # 使用内置的示例会话
+    python benchmarks/compression.py --game 我的游戏       # 使用该 PL 存档中记录的日志与角色卡
+    python benchmarks/compression.py --session s.jsonl    # 每行一个 {"type": ..., "data": ...}
+
+示例会话由规则包数据生成：角色卡推送、掷骰日志 (HTML)、混沌值同步以及一份文本资料
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from core.network.protocol import pack_msg, available_compression, MsgType
+
+def sample_session():
+    from models.game_data import get_game_data
+    game_data = get_game_data("zh_CN")
+    anomaly = next(iter(game_data.anomalies))
+    competency = next(iter(game_data.competencies))
+    reality = next(iter(game_data.realities))
+    sheet = {
+        "name": "测试特工",
+        "anomaly": anomaly,
+        "competency": competency,
+        "reality": reality,
+        "abilities": game_data.abilities_for(anomaly),
+        "requisitions": game_data.requisitions_for(competency),
+        "quality_assurances": {key: 1 for key in game_data.qualities},
+        "notes": "与外勤主管的关系紧张。上次任务中遗失了一份文件。" * 5,
+    }
+
+    messages = []
+    for i in range(20):
+        sheet["notes"] += f"第 {i} 次更新。"
+        messages.append((MsgType.SHEET_UPDATE, {"name": sheet["name"], "sheet": sheet}))
+        messages.append((MsgType.LOG_SYNC, (
+            f"<span style='color:gray'>[12:{i:02d}]</span> <b>测试特工</b> 掷骰 6d4："
+            f"<span style='color:#2E7D32'>3, 3, 1, 4, 2, 3</span> → 成功 {i % 4} 个，"
+            f"获得 {i % 3} 点混沌<br>使用素质保障：{game_data.quality_name(next(iter(game_data.qualities)))}"
+        )))
+        messages.append((MsgType.CHAOS_SYNC, i))
+    handout = "\n".join(f"第 {n} 条：异常现象记录。目击者称在午夜看到了无法解释的光。" for n in range(2000))
+    messages.append((MsgType.FILE_SEND, {"name": "资料.txt", "content": handout}))
+    return messages
+
+def game_session(game):
+    from core.storage import get_storage
+    storage = get_storage()
+    messages = [(MsgType.LOG_SYNC, html) for _, html in storage.query_logs("PL", game)]
+    sheet = storage.load_character(game)
+    if sheet:
+        messages.append((MsgType.SHEET_UPDATE, {"name": sheet.get("name", ""), "sheet": sheet}))
+    return messages
+
+def file_session(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return [(m["type"], m["data"]) for m in map(json.loads, f) if m]
+
+def measure(messages, codec):
+    start = time.perf_counter()
+    total = sum(len(pack_msg(msg_type, data, codec)) for msg_type, data in messages)
+    return total, (time.perf_counter() - start) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--game", help="PL 存档名 (需要 sqlite 存储后端才有日志记录)")
+    source.add_argument("--session", type=Path, help="JSONL 格式的会话记录")
+    args = parser.parse_args()
+
+    if args.game:
+        messages = game_session(args.game)
+    elif args.session:
+        messages = file_session(args.session)
+    else:
+        messages = sample_session()
+    if not messages:
+        print("会话中没有消息")
+        return 1
+
+    raw, raw_ms = measure(messages, None)
+    print(f"{len(messages)} 条消息")
+    print(f"{'none':<6} {raw:>10} bytes  {raw_ms:7.1f} ms")
+    for codec in available_compression():
+        size, ms = measure(messages, codec)
+        print(f"{codec:<6} {size:>10} bytes  {ms:7.1f} ms  节省 {(1 - size / raw) * 100:5.1f}%")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+"""
+内置中继吞吐量基准：N 个 PL 各自经中继向 GM 端发送数据，与直连本机端口比较
+
+    python benchmarks/relay.py                    # 1 / 4 / 8 个 PL，每个 16 MB
+    python benchmarks/relay.py --peers 2 --mb 64
+
+中继、GM 端 (RelayHost) 与 PL 都运行在同一个事件循环中，结果包含三者的全部开销，
+可视为单机部署时的下限
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from PySide6.QtCore import QCoreApplication, QEventLoop, QTimer
+from PySide6.QtNetwork import QTcpServer, QTcpSocket, QHostAddress
+from core.network.relay import RelayServer, RelayHost, join_line
+
+CHUNK = b"\x00" * (64 * 1024)
+
+class Sink(QTcpServer):
+    """代替 GMServer：只统计收到的字节数"""
+    def __init__(self):
+        super().__init__()
+        self.received = 0
+        self.newConnection.connect(self._accept)
+
+    def _accept(self):
+        while self.hasPendingConnections():
+            sock = self.nextPendingConnection()
+            sock.readyRead.connect(lambda sock=sock: self._read(sock))
+
+    def _read(self, sock):
+        self.received += len(sock.readAll())
+
+class Sender:
+    """连接后持续写入 total 字节，写缓冲保持在 1 MB 以内"""
+    def __init__(self, port, total, preamble=b""):
+        self.left = total
+        self.preamble = preamble
+        self.sock = QTcpSocket()
+        self.sock.connected.connect(self._on_connected)
+        self.sock.bytesWritten.connect(self._fill)
+        self.sock.connectToHost("127.0.0.1", port)
+
+    def _on_connected(self):
+        if self.preamble:
+            self.sock.write(self.preamble)
+        self._fill()
+
+    def _fill(self):
+        while self.left > 0 and self.sock.bytesToWrite() < 1024 * 1024:
+            n = min(len(CHUNK), self.left)
+            self.sock.write(CHUNK[:n])
+            self.left -= n
+
+def wait_until(predicate, timeout=120):
+    loop = QEventLoop()
+    deadline = time.monotonic() + timeout
+    timer = QTimer()
+    timer.timeout.connect(lambda: (predicate() or time.monotonic() > deadline) and loop.quit())
+    timer.start(1)
+    loop.exec()
+    timer.stop()
+    return predicate()
+
+def run(peers, size, via_relay):
+    sink = Sink()
+    sink.listen(QHostAddress.LocalHost, 0)
+    relay = host = None
+    port = sink.serverPort()
+    if via_relay:
+        relay = RelayServer(0)
+        relay.server.listen(QHostAddress.LocalHost, 0)
+        port = relay.server.serverPort()
+        host = RelayHost("127.0.0.1", port, "bench", sink.serverPort())
+        host.start()
+        wait_until(lambda: len(relay.hosts) == 1, timeout=5)
+
+    start = time.perf_counter()
+    senders = [Sender(port, size, join_line("bench") if via_relay else b"") for _ in range(peers)]
+    ok = wait_until(lambda: sink.received >= peers * size)
+    elapsed = time.perf_counter() - start
+
+    for s in senders:
+        s.sock.abort()
+    if via_relay:
+        host.stop()
+        relay.stop()
+    sink.close()
+    # 等已关闭的连接处理完，再让 Python 回收这些对象
+    wait_until(lambda: False, timeout=0.2)
+    return ok, elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--peers", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--mb", type=int, default=16, help="每个 PL 发送的数据量 (MB)")
+    args = parser.parse_args()
+
+    app = QCoreApplication(sys.argv)
+    size = args.mb * 1024 * 1024
+    print(f"{'PL 数':>5} {'直连 MB/s':>10} {'中继 MB/s':>10}")
+    for peers in args.peers:
+        results = []
+        for via_relay in (False, True):
+            ok, elapsed = run(peers, size, via_relay)
+            results.append(f"{peers * args.mb / elapsed:10.1f}" if ok else f"{'超时':>10}")
+        print(f"{peers:>5} {results[0]} {results[1]}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
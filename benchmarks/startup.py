@@ -0,0 +1,70 @@
+"""
+启动耗时基准：用 `python -X importtime` 统计各启动阶段需要导入的模块耗时
+
+    python benchmarks/startup.py            # 输出各阶段耗时，超出预算时返回非零
+    python benchmarks/startup.py --top 15   # 同时列出最慢的本项目模块
+
+预算同样适用于 releases/ 下 PyInstaller 打包的程序 (冻结后导入只会更快)
+"""
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# 阶段名 -> (要执行的导入语句, 预算毫秒)
+SCENARIOS = {
+    "startup": ("import app; import ui.startup.role_select; import ui.startup.game_select", 250),
+    "pl_window": ("import ui.main.pl_window", 400),
+    "gm_window": ("import ui.main.gm_window", 400),
+    "character_editor": ("import ui.character.editor", 400),
+}
+
+PROJECT_PREFIXES = ("app", "core", "models", "ui")
+
+def measure(statement):
+    """返回 [(模块名, 自身耗时us, 累计耗时us)]"""
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=ROOT, env=env, capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr)
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.rstrip(), int(self_us), int(cumulative_us)))
+    return rows
+
+def total_ms(rows):
+    # 顶层导入 (缩进为一个空格) 的累计耗时之和即为整个阶段耗时
+    return sum(cum for name, _, cum in rows if not name.startswith("  ")) / 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--top", type=int, default=0, help="列出每个阶段最慢的 N 个本项目模块")
+    args = parser.parse_args()
+
+    over_budget = False
+    for scenario, (statement, budget_ms) in SCENARIOS.items():
+        rows = measure(statement)
+        elapsed = total_ms(rows)
+        flag = "OK" if elapsed <= budget_ms else "OVER"
+        over_budget |= elapsed > budget_ms
+        print(f"{scenario:<18} {elapsed:8.1f} ms  (budget {budget_ms} ms)  {flag}")
+
+        if args.top:
+            own = [r for r in rows if r[0].strip().split(".")[0] in PROJECT_PREFIXES]
+            for name, self_us, cum_us in sorted(own, key=lambda r: -r[2])[:args.top]:
+                print(f"    {name.strip():<40} self {self_us / 1000:7.1f} ms  cumulative {cum_us / 1000:7.1f} ms")
+
+    return 1 if over_budget else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+"""
+界面帧时间基准：PL 接收一个大文件期间，GUI 线程的事件循环能否按时 (每 16 ms) 处理定时器
+
+    python benchmarks/ui_latency.py               # 100 MB，分别在网络线程 / GUI 线程中解码
+    python benchmarks/ui_latency.py --mb 200
+
+GM 端运行在子进程中，只测量 PL 进程：拆帧、解压、JSON 与 base64 解码在网络线程中进行时，
+帧间隔应与空闲时基本一致；"GUI 线程" 各行为改动前的行为，作为对比
+分块: 按哈希提供、256 KB 一块的正常传输；整文件: 旧版协议的 FILE_SEND，整个文件在一帧中
+接收到的内容与 PL 窗口一样写入 FileStore (临时目录)
+"""
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from PySide6.QtCore import QCoreApplication, QEventLoop, QTimer, Qt
+from core.network.client import PLClient
+from core.network.protocol import MsgType
+from core.file_store import FileStore
+
+FRAME_MS = 16
+
+def serve(port, mb, whole):
+    """GM 端：PL 握手后提供 (或整个发送) 一个 mb MB 的文件，传输完成或 PL 断开后退出"""
+    import base64
+    import hashlib
+    from core.network.server import GMServer
+    app = QCoreApplication(sys.argv)
+    content = os.urandom(mb * 1024 * 1024)
+    server = GMServer(port)
+    if whole:
+        legacy = {
+            "name": "bench.bin", "hash": hashlib.sha256(content).hexdigest(),
+            "content": base64.b64encode(content).decode("utf-8")
+        }
+        server.player_hello.connect(lambda uid, info: server.send_to(uid, MsgType.FILE_SEND, legacy))
+    else:
+        server.player_hello.connect(lambda uid, info: server.offer_file("bench.bin", content, uid=uid))
+    server.file_progress.connect(lambda uid, name, acked, total: acked >= total and app.quit())
+    server.player_disconnected.connect(lambda uid: app.quit())
+    ok, msg = server.start()
+    print("ready" if ok else msg, flush=True)
+    return app.exec() if ok else 1
+
+class FrameProbe:
+    """每 FRAME_MS 触发一次的定时器，记录实际间隔"""
+    def __init__(self):
+        self.gaps = []
+        self._last = None
+        self.timer = QTimer()
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.timeout.connect(self._tick)
+
+    def start(self):
+        self._last = time.perf_counter()
+        self.timer.start(FRAME_MS)
+
+    def stop(self):
+        self.timer.stop()
+
+    def _tick(self):
+        now = time.perf_counter()
+        self.gaps.append((now - self._last) * 1000)
+        self._last = now
+
+    def summary(self):
+        gaps = sorted(self.gaps) or [0.0]
+        p99 = gaps[min(len(gaps) - 1, int(len(gaps) * 0.99))]
+        late = sum(1 for g in gaps if g > 2 * FRAME_MS)
+        return gaps[len(gaps) // 2], p99, gaps[-1], late
+
+def wait_until(predicate, timeout):
+    loop = QEventLoop()
+    deadline = time.monotonic() + timeout
+    timer = QTimer()
+    timer.timeout.connect(lambda: (predicate() or time.monotonic() > deadline) and loop.quit())
+    timer.start(5)
+    loop.exec()
+    timer.stop()
+    return predicate()
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def run(mb, threaded, whole, workdir):
+    port = free_port()
+    gm = subprocess.Popen(
+        [sys.executable, __file__, "--serve", str(port), "--mb", str(mb)] + (["--whole"] if whole else []),
+        stdout=subprocess.PIPE, text=True
+    )
+    if gm.stdout.readline().strip() != "ready":
+        gm.kill()
+        raise RuntimeError("GM 子进程启动失败")
+
+    store = FileStore(Path(workdir) / f"files-{port}", Path(workdir) / f"downloads-{port}")
+    client = PLClient(threaded=threaded)
+    client.auto_reconnect = False
+    done = []
+
+    def on_offered(name, digest, size):
+        client.request_file(digest, name, size, store.begin_partial(digest, name, size))
+
+    def on_chunk(digest, offset, data):
+        received = store.write_partial(digest, offset, data)
+        client.send(MsgType.FILE_ACK, {"hash": digest, "offset": received})
+        if received >= store.partial_size(digest):
+            store.finish_partial(digest)
+            done.append(received)
+
+    def on_received(name, content, digest):
+        store.put(name, content, digest)
+        done.append(len(content))
+
+    client.file_offered.connect(on_offered)
+    client.file_received.connect(on_received)
+    client.file_chunk_received.connect(on_chunk)
+
+    probe = FrameProbe()
+    probe.start()
+    start = time.perf_counter()
+    client.connect_to_host("127.0.0.1", port)
+    ok = wait_until(lambda: bool(done), timeout=300)
+    elapsed = time.perf_counter() - start
+    probe.stop()
+
+    client.disconnect_from_host()
+    gm.wait(timeout=10)
+    return ok, elapsed, probe.summary()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mb", type=int, default=100, help="传输的文件大小 (MB)")
+    parser.add_argument("--serve", type=int, metavar="PORT", help=argparse.SUPPRESS)
+    parser.add_argument("--whole", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.serve:
+        return serve(args.serve, args.mb, args.whole)
+
+    app = QCoreApplication(sys.argv)
+    idle = FrameProbe()
+    idle.start()
+    wait_until(lambda: False, timeout=2)
+    idle.stop()
+
+    rows = [("空闲", None, idle.summary())]
+    with tempfile.TemporaryDirectory() as workdir:
+        for whole in (False, True):
+            for threaded in (True, False):
+                label = ("整文件" if whole else "分块") + (" 网络线程" if threaded else " GUI 线程")
+                ok, elapsed, stats = run(args.mb, threaded, whole, workdir)
+                rows.append((label, f"{args.mb / elapsed:.1f} MB/s" if ok else "超时", stats))
+
+    print(f"帧间隔 (目标 {FRAME_MS} ms)，传输 {args.mb} MB")
+    print(f"{'':<14} {'吞吐量':>12} {'中位数':>8} {'p99':>8} {'最大':>8} {'>2帧':>6}")
+    for label, rate, (median, p99, worst, late) in rows:
+        print(f"{label:<14} {rate or '-':>12} {median:8.1f} {p99:8.1f} {worst:8.1f} {late:6d}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
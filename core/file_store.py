@@ -0,0 +1,203 @@
+import hashlib
+import json
+import os
+import re
+import shutil
+from pathlib import Path
+
+DIGEST_RE = re.compile(r"[0-9a-f]{64}")
+
+def hash_bytes(data):
+    return hashlib.sha256(data).hexdigest()
+
+def is_valid_digest(digest):
+    """哈希来自网络，用于拼接路径前必须是 64 位小写十六进制 (sha256)"""
+    return isinstance(digest, str) and DIGEST_RE.fullmatch(digest) is not None
+
+def _check_digest(digest):
+    if not is_valid_digest(digest):
+        raise ValueError(f"无效的文件哈希: {digest!r}")
+
+class FileStore:
+    """
+    PL 端内容寻址文件存储
+
+        <root>/blobs/<哈希前2位>/<哈希>   文件内容，同样的内容只保存一份
+        <root>/index.json                 {文件名: 哈希}
+        <root>/partial/<哈希>.part        未传输完成的内容，断线重连后从其大小处续传
+        <root>/partial/<哈希>.json        {"name", "size"}
+        <downloads>/<文件名>              供查看/打开的文件名副本 (复制，修改副本不影响 blob)
+
+    同名但内容不同的文件不会互相覆盖，而是另取 "名称 (1).ext" 这样的新名字
+    """
+    def __init__(self, root, downloads_dir):
+        self.root = Path(root)
+        self.blob_dir = self.root / "blobs"
+        self.partial_dir = self.root / "partial"
+        self.index_path = self.root / "index.json"
+        self.downloads_dir = Path(downloads_dir)
+        self.index = {}
+        self._partial_sizes = {}
+        # 本次运行中从头开始接收的内容边写边计算哈希，完成时不必重新读取整个文件
+        self._hashers = {}
+        if self.index_path.exists():
+            try:
+                with open(self.index_path, "r", encoding="utf-8") as f:
+                    self.index = json.load(f)
+            except Exception as e:
+                print(f"Error loading file index: {e}")
+
+    def blob_path(self, digest):
+        _check_digest(digest)
+        return self.blob_dir / digest[:2] / digest
+
+    def has(self, digest):
+        return self.blob_path(digest).exists()
+
+    def put(self, name, data, digest=None):
+        """保存内容并返回文件名副本的路径；digest 给出时校验内容是否一致"""
+        actual = hash_bytes(data)
+        if digest and actual != digest:
+            raise ValueError(f"文件校验失败: {name}")
+        blob = self.blob_path(actual)
+        if not blob.exists():
+            blob.parent.mkdir(parents=True, exist_ok=True)
+            tmp = blob.with_suffix(".tmp")
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, blob)
+        return self.link(name, actual)
+
+    def _partial_paths(self, digest):
+        _check_digest(digest)
+        return self.partial_dir / f"{digest}.part", self.partial_dir / f"{digest}.json"
+
+    def begin_partial(self, digest, name, size):
+        """开始 (或继续) 接收一个文件，返回已收到的字节数"""
+        part, meta = self._partial_paths(digest)
+        self.partial_dir.mkdir(parents=True, exist_ok=True)
+        if not meta.exists():
+            with open(meta, "w", encoding="utf-8") as f:
+                json.dump({"name": name, "size": size}, f, ensure_ascii=False)
+        self._partial_sizes[digest] = size
+        return part.stat().st_size if part.exists() else 0
+
+    def discard_partial(self, digest):
+        """丢弃未完成的传输，返回其文件名 (没有时返回 None)"""
+        part, meta = self._partial_paths(digest)
+        name = None
+        if meta.exists():
+            try:
+                with open(meta, "r", encoding="utf-8") as f:
+                    name = json.load(f)["name"]
+            except Exception as e:
+                print(f"Error loading partial file info: {e}")
+            meta.unlink()
+        if part.exists():
+            part.unlink()
+        self._hashers.pop(digest, None)
+        self._partial_sizes.pop(digest, None)
+        return name
+
+    def partial_size(self, digest):
+        """未完成传输的总大小，未知时返回 None"""
+        if digest not in self._partial_sizes:
+            _, meta = self._partial_paths(digest)
+            if not meta.exists():
+                return None
+            with open(meta, "r", encoding="utf-8") as f:
+                self._partial_sizes[digest] = json.load(f)["size"]
+        return self._partial_sizes[digest]
+
+    def partials(self):
+        """未完成的传输 [(哈希, 文件名, 总大小, 已收到字节数)]"""
+        result = []
+        if not self.partial_dir.exists():
+            return result
+        for meta in self.partial_dir.glob("*.json"):
+            try:
+                with open(meta, "r", encoding="utf-8") as f:
+                    info = json.load(f)
+            except Exception as e:
+                print(f"Error loading partial file info: {e}")
+                continue
+            part = meta.with_suffix(".part")
+            offset = part.stat().st_size if part.exists() else 0
+            result.append((meta.stem, info["name"], info["size"], offset))
+        return result
+
+    def write_partial(self, digest, offset, data):
+        """
+        在 offset 处写入一块数据并返回新的已收到字节数
+        offset 与本地进度不一致的块 (重连后重复发送的数据) 被忽略
+        """
+        part, _ = self._partial_paths(digest)
+        current = part.stat().st_size if part.exists() else 0
+        if offset != current:
+            return current
+        with open(part, "ab") as f:
+            f.write(data)
+        h = self._hashers.get(digest)
+        if h is None and current == 0:
+            h = self._hashers[digest] = hashlib.sha256()
+        if h is not None:
+            h.update(data)
+        return current + len(data)
+
+    def finish_partial(self, digest):
+        """校验并把已完整收到的内容移入 blobs，返回文件名副本的路径"""
+        part, meta = self._partial_paths(digest)
+        with open(meta, "r", encoding="utf-8") as f:
+            name = json.load(f)["name"]
+        h = self._hashers.pop(digest, None)
+        if h is None:
+            # 上次运行时开始的续传
+            h = hashlib.sha256()
+            with open(part, "rb") as f:
+                while chunk := f.read(1024 * 1024):
+                    h.update(chunk)
+        if h.hexdigest() != digest:
+            part.unlink()
+            meta.unlink()
+            self._partial_sizes.pop(digest, None)
+            raise ValueError(f"文件校验失败: {name}")
+        blob = self.blob_path(digest)
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(part, blob)
+        meta.unlink()
+        self._partial_sizes.pop(digest, None)
+        return self.link(name, digest)
+
+    def link(self, name, digest):
+        """为已有的内容创建 (或复用) 文件名副本"""
+        name = Path(name).name
+        for candidate in self._candidates(name):
+            target = self.downloads_dir / candidate
+            known = self.index.get(candidate)
+            if known == digest:
+                if target.exists():
+                    return target
+                break   # 副本被用户删除了，在原来的名字处重新复制
+            if known is None and not target.exists():
+                break
+        self.downloads_dir.mkdir(parents=True, exist_ok=True)
+        # 不使用硬链接：就地编辑副本会改掉 blob，之后仍按哈希当作已有内容回复 FILE_HAVE
+        shutil.copyfile(self.blob_path(digest), target)
+        self.index[candidate] = digest
+        self._save_index()
+        return target
+
+    def _candidates(self, name):
+        yield name
+        stem, suffix = Path(name).stem, Path(name).suffix
+        n = 1
+        while True:
+            yield f"{stem} ({n}){suffix}"
+            n += 1
+
+    def _save_index(self):
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.index_path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.index, f, ensure_ascii=False, indent=4)
+        os.replace(tmp, self.index_path)
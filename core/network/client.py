@@ -1,75 +1,315 @@
-import struct
+import time
+import random
+import secrets
+from collections import OrderedDict
 from PySide6.QtNetwork import QTcpSocket
-from PySide6.QtCore import QObject, Signal
-from .protocol import unpack_msg, pack_msg, HEADER_SIZE,MsgType
+from PySide6.QtCore import QObject, Signal, QTimer
+from .protocol import (
+    pack_msg, hello_msg, FEATURE_HEARTBEAT, FEATURE_RESYNC, FEATURE_CHAOS_OPS, HEARTBEAT_INTERVAL, HEARTBEAT_TIMEOUT, MsgType
+)
+from .telemetry import TransferTelemetry
+from .reader import MessageReader
+from .codec import ENCODING_JSON
+from .relay import describe_error, MAX_PREAMBLE
+from core.file_store import is_valid_digest
 
 class PLClient(QObject):
     connected = Signal()
     disconnected = Signal()
     error_occurred = Signal(str)
 
-    chaos_updated = Signal(int)
+    chaos_updated = Signal(int)                     # 应显示的混沌值 (GM 的值加上尚未确认的本地增量)
     log_updated = Signal(str)
-    file_received = Signal(str, str)
+    file_received = Signal(str, bytes, str)         # 文件名, 内容, 哈希
+    file_offered = Signal(str, str, int)        # 文件名, 哈希, 大小
+    file_chunk_received = Signal(str, int, bytes)   # 哈希, 偏移, 内容
+    file_unavailable = Signal(str)                  # 哈希：GM 已不再保留该文件
+    transfer_progress = Signal(str)                 # 哈希，详情见 telemetry
+    handshake_done = Signal(int, list)              # GM 协议版本, 双方都支持的功能
+    session_started = Signal(bool)                  # 是否恢复了断线前的会话
+    reconnecting = Signal(int, float)               # 第几次重连, 等待秒数
 
-    def __init__(self):
+    # 意外断开后按指数退避自动重连：1, 2, 4 ... 最长 30 秒，并加入随机抖动避免多个 PL 同时重连
+    RECONNECT_BASE = 1.0
+    RECONNECT_MAX = 30.0
+    RECONNECT_JITTER = 0.2
+
+    def __init__(self, threaded=True):
         super().__init__()
         self.socket = QTcpSocket()
-        self.socket.connected.connect(self.connected)
-        self.socket.disconnected.connect(self.disconnected)
+        self.socket.connected.connect(self.on_socket_connected)
+        self.socket.disconnected.connect(self.on_socket_disconnected)
         self.socket.readyRead.connect(self.read_data)
         self.socket.errorOccurred.connect(self.handle_error)
 
-        self._buffer = b""
+        # 收到的数据在网络线程中拆帧解码；每次连接一个序号，旧连接残留的消息不会混入新连接
+        self.reader = MessageReader(threaded, self)
+        self.reader.message.connect(self.on_message)
+        self._conn = 0
+        # 在 HELLO 中告诉 GM 的身份信息，如 {"name": ..., "game": ...}
+        self.identity = {}
+        # 要加入的房间 (GM 在同一端口上主持多桌时使用)，None 表示默认房间
+        self.room = None
+        # 连接建立后最先发送的原始数据，如通过内置中继连接时的 JOIN 行；
+        # 对方先回复一行 OK 或 ERR <原因>，之后才是 GM 的消息
+        self.preamble = b""
+        self._awaiting_reply = False
+        self.server_version = None
+        self.server_features = set()
+        self.compression = None
+        self.encoding = ENCODING_JSON
+        self.telemetry = TransferTelemetry()
+
+        # GM 分配的会话令牌与已收到的最后一条日志序号，重连时据此补发错过的内容
+        self.session_token = None
+        self.last_seq = 0
+
+        # GM 端的混沌值及其版本号；本地增量在 GM 确认前保存在 pending_ops 中，重连后原样重发
+        self.chaos_value = 0
+        self.chaos_version = 0
+        self.pending_ops = OrderedDict()    # 操作 ID -> 增量
+        self._ops_supported = False
+        self._op_prefix = secrets.token_hex(4)
+        self._op_counter = 0
+
+        self.auto_reconnect = True
+        self._host = None
+        self._port = None
+        self._user_closed = False
+        self._attempt = 0
+        self.reconnect_timer = QTimer(self)
+        self.reconnect_timer.setSingleShot(True)
+        self.reconnect_timer.timeout.connect(self._reconnect)
+
+        # GM 支持心跳时，超过 HEARTBEAT_TIMEOUT 没有收到任何数据就主动断开
+        self._last_seen = 0.0
+        self.watchdog = QTimer(self)
+        self.watchdog.setInterval(HEARTBEAT_INTERVAL * 1000)
+        self.watchdog.timeout.connect(self.check_alive)
 
     def connect_to_host(self, host, port):
+        # 连接到另一个地址时开始新的会话 (首次连接可沿用上次运行保存的会话)
+        if self._host is not None and (host, int(port)) != (self._host, self._port):
+            self.session_token = None
+            self.last_seq = 0
+        self._host, self._port = host, int(port)
+        self._user_closed = False
+        self._attempt = 0
+        self.reconnect_timer.stop()
+        self._open()
+
+    def _open(self):
         self.socket.abort()
-        self._buffer = b""
-        self.socket.connectToHost(host, int(port))
-    
+        self._awaiting_reply = False
+        self.reader.drop(self._conn)
+        self._conn += 1
+        self.server_version = None
+        self.server_features = set()
+        self.compression = None
+        self.encoding = ENCODING_JSON
+        # 新连接上 GM 的版本号重新开始比较
+        self.chaos_version = 0
+        self.socket.connectToHost(self._host, self._port)
+
+    @property
+    def is_reconnecting(self):
+        return self._attempt > 0
+
+    def schedule_reconnect(self):
+        if self._user_closed or not self.auto_reconnect or self._host is None:
+            return
+        delay = min(self.RECONNECT_MAX, self.RECONNECT_BASE * 2 ** self._attempt)
+        delay *= random.uniform(1 - self.RECONNECT_JITTER, 1 + self.RECONNECT_JITTER)
+        self._attempt += 1
+        self.reconnecting.emit(self._attempt, delay)
+        self.reconnect_timer.start(int(delay * 1000))
+
+    def _reconnect(self):
+        if not self._user_closed:
+            self._open()
+
+    def on_socket_disconnected(self):
+        self.watchdog.stop()
+        self.disconnected.emit()
+        self.schedule_reconnect()
+
+    def on_socket_connected(self):
+        self._attempt = 0
+        if self.preamble:
+            self.socket.write(self.preamble)
+            self._awaiting_reply = True
+        # GM 回复 HELLO 之前发送的消息都不压缩、使用 JSON；旧版 GM 会忽略 HELLO，此时保持旧协议
+        self.send(MsgType.HELLO, hello_msg(self.identity, self.session_token, self.last_seq, self.room))
+        self._last_seen = time.monotonic()
+        self.watchdog.start()
+        self.connected.emit()
+
+    def check_alive(self):
+        if self.socket.state() != QTcpSocket.ConnectedState:
+            self.watchdog.stop()
+            return
+        if FEATURE_HEARTBEAT in self.server_features and time.monotonic() - self._last_seen > HEARTBEAT_TIMEOUT:
+            self.watchdog.stop()
+            self.error_occurred.emit("连接超时：长时间未收到 GM 的数据")
+            self.socket.abort()
+
     def disconnect_from_host(self):
+        self._user_closed = True
+        self._attempt = 0
+        self.reconnect_timer.stop()
         if self.socket.state() == QTcpSocket.ConnectedState:
             self.socket.disconnectFromHost()
+        else:
+            self.socket.abort()
 
     def handle_error(self):
         if self.socket.error() == QTcpSocket.RemoteHostClosedError:
             return
+        if self.is_reconnecting and self.socket.state() != QTcpSocket.ConnectedState:
+            # 重连尝试失败，继续退避重试
+            self.schedule_reconnect()
+            return
         self.error_occurred.emit(self.socket.errorString())
 
     def read_data(self):
-        data = self.socket.readAll().data()
-        self._buffer += data
-        
-        while True:
-            if len(self._buffer) < HEADER_SIZE:
-                break
-
-            body_length = struct.unpack('!I', self._buffer[:HEADER_SIZE])[0]
-
-            if len(self._buffer) < HEADER_SIZE + body_length:
-                break
-
-            body_data = self._buffer[HEADER_SIZE : HEADER_SIZE + body_length]
-            self._buffer = self._buffer[HEADER_SIZE + body_length :]
+        self._last_seen = time.monotonic()
+        if self._awaiting_reply:
+            if not self.socket.canReadLine():
+                if self.socket.bytesAvailable() > MAX_PREAMBLE:
+                    self._awaiting_reply = False
+                    self.error_occurred.emit("中继的回复格式错误")
+                    self.socket.abort()
+                return
+            self._awaiting_reply = False
+            reply = self.socket.readLine(MAX_PREAMBLE).data().decode("utf-8", errors="replace").split()
+            if reply[:1] != ["OK"]:
+                # 例如房间中还没有 GM；中继随后断开，按断线重连
+                self.error_occurred.emit(f"中继: {describe_error(' '.join(reply[1:]))}")
+                return
+        self.reader.feed(self._conn, self.socket.readAll().data())
 
-            self.process_message(body_data)
-
-    def process_message(self, body_data):
-        msg = unpack_msg(body_data)
-        if not msg: return
+    def on_message(self, conn, msg):
+        if conn == self._conn:
+            self.process_message(msg)
 
+    def process_message(self, msg):
         m_type = msg.get("type")
         val = msg.get("data")
         
-        if m_type == MsgType.CHAOS_SYNC:
-            self.chaos_updated.emit(val)
+        if m_type == MsgType.HELLO:
+            if val.get("error"):
+                # 例如房间不存在，重连也没有意义
+                # 消息在网络线程中解码，GM 断开连接可能先于此处理，已安排的重连一并取消
+                self._user_closed = True
+                self.reconnect_timer.stop()
+                self.error_occurred.emit(val["error"])
+                return
+            self.server_version = val.get("version", 1)
+            self.server_features = set(val.get("features", []))
+            self.compression = val.get("compression")
+            self.encoding = val.get("encoding") or ENCODING_JSON
+            self.handshake_done.emit(self.server_version, sorted(self.server_features))
+            self._flush_chaos_ops()
+            if FEATURE_RESYNC in self.server_features:
+                resumed = bool(val.get("resumed")) and val.get("session") == self.session_token
+                if not resumed:
+                    self.last_seq = 0
+                self.session_token = val.get("session")
+                self.session_started.emit(resumed)
+        elif m_type == MsgType.RESYNC:
+            # 错过的日志 (按序号，可能分多批) 与当前混沌值 (最后一批)
+            for seq, html in val.get("logs", []):
+                self.log_updated.emit(html)
+            self.last_seq = val.get("seq", self.last_seq)
+            if val.get("chaos") is not None:
+                self._update_chaos(val["chaos"], val.get("chaos_version"))
+        elif m_type == MsgType.PING:
+            self.send(MsgType.PONG, val)
+        elif m_type == MsgType.CHAOS_SYNC:
+            if isinstance(val, dict):
+                self.pending_ops.pop(val.get("op"), None)
+                self._update_chaos(val.get("value", 0), val.get("version"))
+            else:
+                self._update_chaos(val)
         elif m_type == MsgType.LOG_SYNC:
+            if isinstance(val, dict):
+                self.last_seq = val.get("seq", self.last_seq)
+                val = val.get("html", "")
             self.log_updated.emit(val)
+        elif m_type in (MsgType.FILE_OFFER, MsgType.FILE_CHUNK, MsgType.FILE_GONE) and not is_valid_digest(val.get("hash")):
+            # 哈希会用于本地文件路径，格式不对的消息 (如 "../x") 直接丢弃
+            print(f"Ignoring {m_type} with invalid hash: {val.get('hash')!r}")
         elif m_type == MsgType.FILE_SEND:
-            self.file_received.emit(val.get("name"), val.get("content"))
+            # 哈希只用于校验，格式不对时按内容重新计算
+            digest = val.get("hash", "")
+            self.file_received.emit(val.get("name"), val.get("content"), digest if is_valid_digest(digest) else "")
+        elif m_type == MsgType.FILE_OFFER:
+            self.file_offered.emit(val.get("name"), val.get("hash"), val.get("size", 0))
+        elif m_type == MsgType.FILE_CHUNK:
+            digest = val.get("hash")
+            offset = val.get("offset", 0)
+            data = val.get("content", b"")
+            self.file_chunk_received.emit(digest, offset, data)
+            stat = self.telemetry.update("GM", digest, offset + len(data))
+            if stat is not None:
+                if stat.done >= stat.total:
+                    self.telemetry.finish("GM", digest)
+                self.transfer_progress.emit(digest)
+        elif m_type == MsgType.FILE_GONE:
+            digest = val.get("hash")
+            self.telemetry.cancel("GM", digest)
+            self.file_unavailable.emit(digest)
+            self.transfer_progress.emit(digest)
 
     def send(self, msg_type, data):
+        """发送消息，未连接时丢弃并返回 False"""
         if self.socket.state() == QTcpSocket.ConnectedState:
-            payload = pack_msg(msg_type, data)
+            payload = pack_msg(msg_type, data, self.compression, self.encoding)
             self.socket.write(payload)
-            self.socket.flush()
\ No newline at end of file
+            self.socket.flush()
+            return True
+        return False
+
+    def add_chaos(self, delta):
+        """
+        增加混沌值：支持 chaos_ops 的 GM 由其计数并推送结果，本地立即显示 GM 的值加上未确认的增量；
+        断线期间的增量在重连后重发，GM 按操作 ID 去重
+        """
+        if self._ops_supported:
+            self._op_counter += 1
+            op_id = f"{self._op_prefix}-{self._op_counter}"
+            self.pending_ops[op_id] = delta
+            if FEATURE_CHAOS_OPS in self.server_features:
+                self.send(MsgType.CHAOS_OP, {"op": op_id, "delta": delta})
+        else:
+            # 旧版 GM：发送增量，由 GM 广播新的绝对值
+            self.send(MsgType.CHAOS_SYNC, delta)
+            self.chaos_value += delta
+        self.chaos_updated.emit(self.display_chaos())
+
+    def display_chaos(self):
+        return max(0, self.chaos_value + sum(self.pending_ops.values()))
+
+    def _update_chaos(self, value, version=None):
+        if version is not None:
+            if version <= self.chaos_version:
+                self.chaos_updated.emit(self.display_chaos())
+                return  # 过期的状态
+            self.chaos_version = version
+        self.chaos_value = value
+        self.chaos_updated.emit(self.display_chaos())
+
+    def _flush_chaos_ops(self):
+        self._ops_supported = FEATURE_CHAOS_OPS in self.server_features
+        if self._ops_supported:
+            for op_id, delta in self.pending_ops.items():
+                self.send(MsgType.CHAOS_OP, {"op": op_id, "delta": delta})
+        elif self.pending_ops:
+            # GM 换成了旧版本，合并为一次增量发送
+            self.send(MsgType.CHAOS_SYNC, sum(self.pending_ops.values()))
+            self.pending_ops.clear()
+
+    def request_file(self, digest, name, size, offset=0):
+        """请求从 offset 处开始传输文件，并开始统计该传输"""
+        self.telemetry.begin("GM", digest, name, size, offset)
+        self.send(MsgType.FILE_WANT, {"hash": digest, "offset": offset})
@@ -0,0 +1,60 @@
+"""
+消息体编码：
+
+    json     默认，所有版本都支持；安装了 orjson 时用它直接编码为 UTF-8 字节，输出与标准库兼容
+    msgpack  需要 msgpack，且双方在 HELLO 中都声明支持；文件内容以二进制传输，不再经过 base64
+
+接收方不需要知道对方用的是哪种编码：JSON 消息体总是以 "{" 开头，MessagePack 的 map 不会以此字节开头
+"""
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+ENCODING_JSON = "json"
+ENCODING_MSGPACK = "msgpack"
+
+def available_encodings():
+    """本机支持的编码，按优先顺序排列"""
+    return ([ENCODING_MSGPACK] if msgpack is not None else []) + [ENCODING_JSON]
+
+def choose_encoding(offered):
+    """从对方支持的编码中选出双方都支持的第一个，旧版 PL 不声明时为 json"""
+    local = available_encodings()
+    for name in offered or ():
+        if name in local:
+            return name
+    return ENCODING_JSON
+
+def binary_content(encoding):
+    """该编码能否直接携带 bytes (否则文件内容需要 base64)"""
+    return encoding == ENCODING_MSGPACK
+
+def _json_dumps(obj):
+    if orjson is not None:
+        try:
+            # 与标准库一样允许非字符串的键 (如整数)
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # orjson 不支持的类型 (如超过 64 位的整数) 交给标准库
+            pass
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def encode_body(obj, encoding=ENCODING_JSON):
+    if encoding == ENCODING_MSGPACK:
+        return msgpack.packb(obj, use_bin_type=True)
+    return _json_dumps(obj)
+
+def decode_body(data):
+    if data[:1] == b"{":
+        return orjson.loads(data) if orjson is not None else json.loads(data)
+    if msgpack is None:
+        raise ValueError("收到 MessagePack 编码的消息，但未安装 msgpack")
+    return msgpack.unpackb(data, raw=False, strict_map_key=False)
@@ -0,0 +1,63 @@
+import json
+from array import array
+from collections import deque
+from pathlib import Path
+
+class LogJournal:
+    """
+    本次会话的日志历史，每条日志有单调递增的序号 (从 1 开始)
+    最近 memory_limit 条保存在内存中，更早的写入磁盘 (JSON Lines)，供中途加入或重连的 PL 补发
+    没有指定 spill_path 时超出的日志直接丢弃
+    """
+    def __init__(self, spill_path=None, memory_limit=500):
+        self.memory = deque()
+        self.memory_limit = memory_limit
+        self.seq = 0
+        self.spill_path = Path(spill_path) if spill_path else None
+        self._spill = None
+        self._offsets = array("Q")   # 第 n 条日志在溢出文件中的位置，下标为 n - 1
+
+    def append(self, html, origin=None):
+        """记录一条日志并返回其序号；origin 为发出者的会话令牌 (GM 自己为 None)"""
+        self.seq += 1
+        self.memory.append((self.seq, html, origin))
+        if len(self.memory) > self.memory_limit:
+            self._spill_entry(self.memory.popleft())
+        return self.seq
+
+    def _spill_entry(self, entry):
+        if self.spill_path is None:
+            return
+        try:
+            if self._spill is None:
+                self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+                # 每次会话从空文件开始
+                self._spill = open(self.spill_path, "w+b")
+            self._spill.seek(0, 2)
+            self._offsets.append(self._spill.tell())
+            self._spill.write(json.dumps(entry, ensure_ascii=False).encode("utf-8") + b"\n")
+        except Exception as e:
+            print(f"Error spilling log journal: {e}")
+            self.spill_path = None
+
+    def since(self, seq, limit=None):
+        """序号大于 seq 的日志 [(序号, html, 来源)]，最多 limit 条"""
+        result = []
+        if self._spill is not None and seq < len(self._offsets):
+            self._spill.flush()
+            self._spill.seek(self._offsets[seq])
+            for line in self._spill:
+                result.append(tuple(json.loads(line)))
+                if limit and len(result) >= limit:
+                    return result
+        for entry in self.memory:
+            if limit and len(result) >= limit:
+                break
+            if entry[0] > seq:
+                result.append(entry)
+        return result
+
+    def close(self):
+        if self._spill is not None:
+            self._spill.close()
+            self._spill = None
@@ -1,27 +1,161 @@
-import json
 import struct
+import zlib
 from enum import Enum
 
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+from .codec import encode_body, decode_body, available_encodings, ENCODING_JSON
+
 class MsgType(str, Enum):
-    CHAOS_SYNC = "chaos"        # 同步混沌值
+    CHAOS_SYNC = "chaos"        # GM→PL 混沌绝对值 (支持 chaos_ops 时为 {"value", "version", "op"})；旧版 PL→GM 为增量
+    CHAOS_OP = "chaos_op"       # PL→GM 混沌增量 {"op": 操作 ID, "delta"}，同一 ID 只生效一次
     LOG_SYNC = "log"            # 同步日志文本
     SHEET_UPDATE = "sheet"      # PL 推送角色卡给 GM
     FILE_SEND = "file"          # GM 发送文件给 PL
+    FILE_OFFER = "file_offer"   # GM 告知文件哈希 {"name", "hash", "size"}
+    FILE_HAVE = "file_have"     # PL 已有该内容，无需传输 {"hash"}
+    FILE_WANT = "file_want"     # PL 请求从 offset 处开始传输 {"hash", "offset"}
+    FILE_CHUNK = "file_chunk"   # GM 发送一块内容 {"hash", "offset", "content"}
+    FILE_ACK = "file_ack"       # PL 确认已写入磁盘的字节数 {"hash", "offset"}
+    FILE_GONE = "file_gone"     # GM 已不再保留该文件 (被移出内存或 GM 重启)，PL 丢弃未完成的部分 {"hash"}
+    HELLO = "hello"             # 连接建立时的握手，见 hello_msg
+    PING = "ping"               # 心跳 {"t": 发送方时间戳 ms}
+    PONG = "pong"               # 原样返回 PING 的数据，用于计算往返延迟
+    RESYNC = "resync"           # 握手后分批补发错过的日志 {"logs": [[seq, html]], "seq"}，最后一批带当前 "chaos"
+
+# 协议版本：1 为没有握手的旧版本，2 起连接后先交换 HELLO
+PROTOCOL_VERSION = 2
+
+# 可按连接启用的功能；只有双方都在 HELLO 中声明的功能才会使用
+FEATURE_FILE_OFFER = "file_offer"     # 按哈希提供文件、分块续传
+FEATURE_COMPRESSION = "compression"   # 帧压缩
+FEATURE_HEARTBEAT = "heartbeat"       # PING/PONG 心跳与超时断开
+FEATURE_RESYNC = "resync"             # 会话令牌、带序号的日志 ({"seq", "html"}) 与重连后补发
+FEATURE_CHAOS_OPS = "chaos_ops"       # 混沌值由 GM 端计数，PL 发送带 ID 的增量，GM 推送带版本号的绝对值
+FEATURES = (FEATURE_FILE_OFFER, FEATURE_COMPRESSION, FEATURE_HEARTBEAT, FEATURE_RESYNC, FEATURE_CHAOS_OPS)
+
+# 心跳间隔与超时 (秒)：超过 HEARTBEAT_TIMEOUT 没有收到任何数据的连接视为已断开
+HEARTBEAT_INTERVAL = 5
+HEARTBEAT_TIMEOUT = 20
+
+HEADER_SIZE = 4
+FILE_CHUNK_SIZE = 256 * 1024
 
-HEADER_SIZE = 4 
+# 帧头为 4 字节大端整数：高 2 位是压缩标志，低 30 位是数据长度
+FLAG_ZLIB = 0x80000000
+FLAG_ZSTD = 0x40000000
+LENGTH_MASK = 0x3FFFFFFF
 
-def pack_msg(msg_type, data):
+# 小于此大小的消息 (混沌值、ACK 等) 压缩后几乎不会变小，直接发送原文
+COMPRESS_THRESHOLD = 512
+
+COMPRESSION_FLAGS = {"zlib": FLAG_ZLIB, "zstd": FLAG_ZSTD}
+
+def available_compression():
+    """本机支持的压缩算法，按优先顺序排列"""
+    return (["zstd"] if zstandard is not None else []) + ["zlib"]
+
+def choose_compression(offered):
+    """从对方支持的算法中选出双方都支持的第一个，没有则为 None"""
+    local = available_compression()
+    for name in offered or ():
+        if name in local:
+            return name
+    return None
+
+def hello_msg(identity=None, session=None, last_seq=0, room=None):
     """
-    将消息打包成：[4字节长度][JSON数据]
+    PL 发送: {"version", "role": "PL", "identity": {...}, "features": [...], "compression": [本机支持的算法],
+              "encodings": [本机支持的消息体编码],
+              "session": 上次连接得到的会话令牌或 None, "last_seq": 已收到的最后一条日志序号,
+              "room": 要加入的房间 (GM 的游戏名)，None 表示默认房间}
+    GM 回复: {"version", "role": "GM", "features": [双方都支持的功能], "compression": 选定的算法或 None,
+              "encoding": 选定的编码,
+              "session": 会话令牌, "resumed": 是否恢复了原有会话, "room": 所在房间}
+    房间不存在时 GM 回复 {"error": 原因} 后断开连接
     """
-    msg_dict = {"type": msg_type, "data": data}
-    json_bytes = json.dumps(msg_dict, ensure_ascii=False).encode('utf-8')
-    header = struct.pack('!I', len(json_bytes))
-    return header + json_bytes
+    return {
+        "version": PROTOCOL_VERSION,
+        "role": "PL",
+        "identity": identity or {},
+        "features": list(FEATURES),
+        "compression": available_compression(),
+        "encodings": available_encodings(),
+        "session": session,
+        "last_seq": last_seq,
+        "room": room,
+    }
+
+def negotiate_features(offered):
+    """双方都支持的功能"""
+    return [f for f in FEATURES if f in (offered or ())]
+
+def _compress(codec, raw):
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=3).compress(raw)
+    return zlib.compress(raw, 6)
+
+def encode_msg(msg_type, data, encoding=ENCODING_JSON):
+    """消息体 (未压缩)，同一消息发给多个 PL 时可以只编码一次"""
+    return encode_body({"type": msg_type, "data": data}, encoding)
+
+def frame_body(body, compression=None):
+    """
+    将消息体打包成：[4字节长度 | 压缩标志][消息体]
+    compression 为协商得到的算法，超过阈值且确实变小时才压缩
+    """
+    flags = 0
+    if compression and len(body) >= COMPRESS_THRESHOLD:
+        packed = _compress(compression, body)
+        if len(packed) < len(body):
+            body = packed
+            flags = COMPRESSION_FLAGS[compression]
+    header = struct.pack('!I', len(body) | flags)
+    return header + body
+
+def pack_msg(msg_type, data, compression=None, encoding=ENCODING_JSON):
+    return frame_body(encode_msg(msg_type, data, encoding), compression)
+
+class Frame:
+    """
+    一条要发给一个或多个对端的消息：每种编码的消息体、每种 (编码, 压缩算法) 的帧在第一次用到时生成并缓存，
+    发给 N 个 PL 只需编码一次，所有 socket 写入同一个 bytes 对象
+    """
+    __slots__ = ("msg_type", "data", "_bodies", "_packed")
+
+    def __init__(self, msg_type, data):
+        self.msg_type = msg_type
+        self.data = data
+        self._bodies = {}
+        self._packed = {}
+
+    def packed(self, encoding=ENCODING_JSON, compression=None):
+        key = (encoding, compression)
+        payload = self._packed.get(key)
+        if payload is None:
+            body = self._bodies.get(encoding)
+            if body is None:
+                body = self._bodies[encoding] = encode_msg(self.msg_type, self.data, encoding)
+            payload = self._packed[key] = frame_body(body, compression)
+        return payload
+
+def parse_header(header_bytes):
+    """返回 (数据长度, 压缩标志)"""
+    value = struct.unpack('!I', header_bytes)[0]
+    return value & LENGTH_MASK, value & ~LENGTH_MASK
 
-def unpack_msg(data_bytes):
+def unpack_msg(data_bytes, flags=0):
     try:
-        return json.loads(data_bytes.decode('utf-8'))
+        if flags & FLAG_ZSTD:
+            if zstandard is None:
+                raise ValueError("收到 zstd 压缩的消息，但未安装 zstandard")
+            data_bytes = zstandard.ZstdDecompressor().decompress(data_bytes)
+        elif flags & FLAG_ZLIB:
+            data_bytes = zlib.decompress(data_bytes)
+        return decode_body(data_bytes)
     except Exception as e:
         print(f"Protocol Decode Error: {e}")
-        return None
\ No newline at end of file
+        return None
@@ -0,0 +1,98 @@
+import atexit
+import base64
+from PySide6.QtCore import QObject, QThread, Signal, Slot, QCoreApplication
+from .protocol import parse_header, unpack_msg, HEADER_SIZE, MsgType
+
+def decode_content(msg):
+    """FILE_CHUNK / FILE_SEND 的 "content" 由 base64 文本解码为 bytes (MessagePack 中已是 bytes)，失败时返回 None"""
+    if msg.get("type") in (MsgType.FILE_CHUNK, MsgType.FILE_SEND) and isinstance(msg.get("data"), dict):
+        if isinstance(msg["data"].get("content"), bytes):
+            return msg
+        try:
+            msg["data"]["content"] = base64.b64decode(msg["data"].get("content") or "")
+        except Exception as e:
+            print(f"Protocol Decode Error: {e}")
+            return None
+    return msg
+
+class FrameDecoder(QObject):
+    """按连接拆帧并解码 (解压、JSON、文件内容的 base64)，每条完整的消息通过 reader.message 发出"""
+    def __init__(self):
+        super().__init__()
+        self._buffers = {}
+
+    @Slot(object, object, object)
+    def feed(self, reader, conn, data):
+        buffer = self._buffers.setdefault((reader, conn), bytearray())
+        buffer += data
+        pos = 0
+        while len(buffer) - pos >= HEADER_SIZE:
+            body_length, flags = parse_header(buffer[pos:pos + HEADER_SIZE])
+            end = pos + HEADER_SIZE + body_length
+            if len(buffer) < end:
+                break
+            msg = unpack_msg(buffer[pos + HEADER_SIZE:end], flags)
+            pos = end
+            if msg and decode_content(msg):
+                reader.message.emit(conn, msg)
+        # 已处理的帧一次性移出缓冲，大帧分多次到达时不会反复复制
+        del buffer[:pos]
+
+    @Slot(object, object)
+    def drop(self, reader, conn):
+        self._buffers.pop((reader, conn), None)
+
+class NetworkThread:
+    """
+    网络解码线程：所有 MessageReader 共用一个 FrameDecoder，在此线程中处理收到的数据，
+    大文件块的解压和解码不会阻塞界面重绘；程序退出时结束线程
+    """
+    def __init__(self):
+        self.thread = QThread()
+        self.thread.setObjectName("network")
+        self.decoder = FrameDecoder()
+        self.decoder.moveToThread(self.thread)
+        self.thread.start()
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.stop)
+        atexit.register(self.stop)
+
+    def stop(self):
+        try:
+            self.thread.quit()
+            self.thread.wait()
+        except RuntimeError:
+            # 解释器退出时 Qt 对象可能已经销毁
+            pass
+
+_network_thread = None
+
+def get_network_thread():
+    global _network_thread
+    if _network_thread is None:
+        _network_thread = NetworkThread()
+    return _network_thread
+
+class MessageReader(QObject):
+    """
+    socket 读到的原始数据交给网络线程拆帧解码，完整的消息 {"type", "data"} 经排队信号 message 回到本对象所在线程
+    conn 由调用方用来区分连接 (GMServer 为 socket，PLClient 为连接序号)；同一连接的消息保持顺序
+    threaded=False 时在当前线程同步解码 (基准测试对比用)
+    """
+    message = Signal(object, object)        # conn, 消息
+    _feed = Signal(object, object, object)
+    _drop = Signal(object, object)
+
+    def __init__(self, threaded=True, parent=None):
+        super().__init__(parent)
+        self.decoder = get_network_thread().decoder if threaded else FrameDecoder()
+        self._feed.connect(self.decoder.feed)
+        self._drop.connect(self.decoder.drop)
+
+    def feed(self, conn, data):
+        self._feed.emit(self, conn, data)
+
+    def drop(self, conn):
+        """连接已关闭，丢弃其未完成的帧"""
+        self._drop.emit(self, conn)
@@ -0,0 +1,295 @@
+"""
+内置中继：GM 与 PL 都主动连接到中继，由中继转发数据，局域网或本机多开测试时不需要 gs-netcat 等外部工具
+
+    python -m core.network.relay --port 7000        # 无界面运行中继
+
+每个连接先发送一行文本说明身份，之后的数据原样转发:
+    HOST <房间>\\n           GM 的控制连接；有 PL 加入时中继在此连接上发送 PEER <编号>\\n
+    DATA <房间> <编号>\\n    GM 为每个 PL 建立的数据连接，与对应的 PL 连接配对后开始转发
+    JOIN <房间>\\n           PL 的连接；配对前发送的数据 (HELLO 等) 留在中继的接收缓冲中
+中继对 HOST 与 JOIN 先回复一行 OK\\n，或回复 ERR <原因>\\n 后断开：房间已有 GM 时拒绝新的 HOST，房间没有 GM 时拒绝 JOIN
+"""
+import argparse
+import sys
+from PySide6.QtNetwork import QTcpServer, QTcpSocket, QHostAddress
+from PySide6.QtCore import QObject, Signal, QTimer
+
+RELAY_PORT = 7000
+DEFAULT_ROOM = "TriangleAgency"
+MAX_PREAMBLE = 256
+# 对端尚未写出的数据超过此值时暂停读取，避免慢的一方把中继内存撑爆
+MAX_BUFFERED = 1024 * 1024
+
+ERRORS = {
+    "no host": "房间中没有 GM",
+    "room taken": "房间中已有 GM",
+    "bad request": "请求格式错误",
+}
+
+def describe_error(reason):
+    """中继 ERR 行中的原因 -> 显示给用户的文本"""
+    return ERRORS.get(reason, reason)
+
+def join_line(room):
+    """PL 连接中继后首先发送的一行"""
+    return f"JOIN {room}\n".encode("utf-8")
+
+def parse_address(text, default_port=RELAY_PORT):
+    """"host:port" -> (host, port)，省略端口时使用默认端口"""
+    host, sep, port = text.strip().rpartition(":")
+    if not sep:
+        return text.strip(), default_port
+    return host, int(port)
+
+class Pipe(QObject):
+    """双向转发两个已连接 socket 之间的数据，任意一端断开后关闭另一端"""
+    closed = Signal()
+
+    def __init__(self, a, b, parent=None):
+        super().__init__(parent)
+        self.a, self.b = a, b
+        self.transferred = 0
+        self._closed = False
+        for sock in (a, b):
+            sock.setReadBufferSize(MAX_BUFFERED)
+            sock.readyRead.connect(self._pump)
+            sock.bytesWritten.connect(self._pump)
+            sock.disconnected.connect(self.close)
+        # 配对前已经收到的数据
+        self._pump()
+
+    def _pump(self):
+        for src, dst in ((self.a, self.b), (self.b, self.a)):
+            room = MAX_BUFFERED - dst.bytesToWrite()
+            if room > 0 and src.bytesAvailable():
+                data = src.read(room)
+                self.transferred += len(data)
+                dst.write(data)
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._pump()
+        for sock in (self.a, self.b):
+            sock.disconnectFromHost()
+            sock.deleteLater()
+        self.closed.emit()
+        self.deleteLater()
+
+class RelayServer(QObject):
+    """中继服务端：按房间把 PL 的连接与 GM 的数据连接配对"""
+    log = Signal(str)
+
+    def __init__(self, port=RELAY_PORT, parent=None):
+        super().__init__(parent)
+        self.port = port
+        self.server = QTcpServer(self)
+        self.server.newConnection.connect(self.handle_new_connection)
+        self.hosts = {}         # 房间 -> GM 控制连接
+        self.waiting = {}       # (房间, 编号) -> 等待配对的 PL 连接
+        self.pipes = set()
+        self._next_id = 0
+
+    def start(self):
+        if not self.server.listen(QHostAddress.Any, self.port):
+            return False, self.server.errorString()
+        return True, f"Relay listening on port {self.port}"
+
+    def stop(self):
+        self.server.close()
+        for pipe in list(self.pipes):
+            pipe.close()
+        for sock in list(self.hosts.values()) + list(self.waiting.values()):
+            sock.abort()
+        self.hosts.clear()
+        self.waiting.clear()
+
+    def handle_new_connection(self):
+        while self.server.hasPendingConnections():
+            sock = self.server.nextPendingConnection()
+            sock.readyRead.connect(self._read_preamble)
+            sock.disconnected.connect(sock.deleteLater)
+
+    def _read_preamble(self):
+        sock = self.sender()
+        if not sock.canReadLine():
+            if sock.bytesAvailable() > MAX_PREAMBLE:
+                sock.abort()
+            return
+        sock.readyRead.disconnect(self._read_preamble)
+        parts = sock.readLine(MAX_PREAMBLE).data().decode("utf-8", errors="replace").split()
+        command, args = (parts[0].upper(), parts[1:]) if parts else ("", [])
+
+        if command == "HOST" and len(args) == 1:
+            self.add_host(args[0], sock)
+        elif command == "JOIN" and len(args) == 1:
+            self.add_peer(args[0], sock)
+        elif command == "DATA" and len(args) == 2:
+            self.pair(args[0], args[1], sock)
+        else:
+            sock.write(b"ERR bad request\n")
+            sock.disconnectFromHost()
+
+    def add_host(self, room, sock):
+        # 已有 GM 的房间不允许被其他连接接管；原 GM 断开后 (RelayHost 会定时重试) 才能进入
+        if room in self.hosts:
+            sock.write(b"ERR room taken\n")
+            sock.disconnectFromHost()
+            return
+        self.hosts[room] = sock
+        sock.disconnected.connect(lambda: self._on_host_gone(room, sock))
+        sock.write(b"OK\n")
+        self.log.emit(f"GM 已进入房间 {room}")
+
+    def _on_host_gone(self, room, sock):
+        if self.hosts.get(room) is sock:
+            del self.hosts[room]
+            self.log.emit(f"GM 已离开房间 {room}")
+        # 尚未配对的 PL 无法再连上 GM
+        for key in [k for k in self.waiting if k[0] == room]:
+            self.waiting.pop(key).abort()
+
+    def add_peer(self, room, sock):
+        host = self.hosts.get(room)
+        if host is None:
+            sock.write(b"ERR no host\n")
+            sock.disconnectFromHost()
+            return
+        self._next_id += 1
+        key = (room, str(self._next_id))
+        self.waiting[key] = sock
+        sock.write(b"OK\n")
+        sock.disconnected.connect(lambda: self.waiting.pop(key, None))
+        host.write(f"PEER {key[1]}\n".encode("utf-8"))
+
+    def pair(self, room, peer_id, sock):
+        peer = self.waiting.pop((room, peer_id), None)
+        if peer is None:
+            sock.disconnectFromHost()
+            return
+        pipe = Pipe(peer, sock, self)
+        self.pipes.add(pipe)
+        pipe.closed.connect(lambda: self.pipes.discard(pipe))
+
+class RelayHost(QObject):
+    """
+    GM 端：保持与中继的控制连接 (断开后定时重连)，
+    每有一个 PL 加入就建立一条到中继的数据连接和一条到本机 GMServer 的连接并互相转发
+    """
+    log = Signal(str)
+    state_changed = Signal(bool)    # 控制连接是否已建立
+
+    RETRY_INTERVAL = 3000
+
+    def __init__(self, relay_host, relay_port, room, local_port, parent=None):
+        super().__init__(parent)
+        self.relay_host = relay_host
+        self.relay_port = relay_port
+        self.room = room
+        self.local_port = local_port
+        self.pipes = set()
+        self._running = False
+        # 中继最近一次拒绝的原因，同样的拒绝在重试时不重复记录
+        self._error = None
+
+        self.control = QTcpSocket(self)
+        self.control.connected.connect(self._on_control_connected)
+        self.control.readyRead.connect(self._read_control)
+        self.control.disconnected.connect(self._on_control_lost)
+        self.control.errorOccurred.connect(self._on_control_error)
+        self.retry_timer = QTimer(self)
+        self.retry_timer.setSingleShot(True)
+        self.retry_timer.timeout.connect(self._connect)
+
+    def start(self):
+        self._running = True
+        self._connect()
+
+    def stop(self):
+        self._running = False
+        self.retry_timer.stop()
+        self.control.abort()
+        for pipe in list(self.pipes):
+            pipe.close()
+
+    def _connect(self):
+        if self._running:
+            self.control.abort()
+            self.control.connectToHost(self.relay_host, self.relay_port)
+
+    def _on_control_connected(self):
+        self.control.write(f"HOST {self.room}\n".encode("utf-8"))
+
+    def _on_control_lost(self):
+        self.state_changed.emit(False)
+        if self._running:
+            if self._error is None:
+                self.log.emit("与中继的连接已断开，稍后重试")
+            self.retry_timer.start(self.RETRY_INTERVAL)
+
+    def _on_control_error(self):
+        if self.control.state() != QTcpSocket.ConnectedState and self._running and not self.retry_timer.isActive():
+            self.log.emit(f"无法连接到中继: {self.control.errorString()}")
+            self.retry_timer.start(self.RETRY_INTERVAL)
+
+    def _read_control(self):
+        while self.control.canReadLine():
+            parts = self.control.readLine().data().decode("utf-8", errors="replace").split()
+            if len(parts) == 2 and parts[0] == "PEER":
+                self._open_peer(parts[1])
+            elif parts and parts[0] == "OK":
+                self._error = None
+                self.log.emit(f"已连接到中继 {self.relay_host}:{self.relay_port} (房间 {self.room})")
+                self.state_changed.emit(True)
+            elif parts and parts[0] == "ERR":
+                error = describe_error(" ".join(parts[1:]))
+                if error != self._error:
+                    self._error = error
+                    self.log.emit(f"中继拒绝进入房间 {self.room}: {error}，稍后重试")
+
+    def _open_peer(self, peer_id):
+        upstream = QTcpSocket(self)
+        local = QTcpSocket(self)
+        pending = {upstream, local}
+
+        def on_connected(sock):
+            pending.discard(sock)
+            if sock is upstream:
+                upstream.write(f"DATA {self.room} {peer_id}\n".encode("utf-8"))
+            if not pending:
+                pipe = Pipe(upstream, local, self)
+                self.pipes.add(pipe)
+                pipe.closed.connect(lambda: self.pipes.discard(pipe))
+
+        def on_error(sock):
+            if pending:
+                self.log.emit(f"无法为 PL 建立转发连接: {sock.errorString()}")
+                for s in (upstream, local):
+                    s.abort()
+                    s.deleteLater()
+                pending.clear()
+
+        for sock in (upstream, local):
+            sock.connected.connect(lambda sock=sock: on_connected(sock))
+            sock.errorOccurred.connect(lambda _, sock=sock: on_error(sock))
+        upstream.connectToHost(self.relay_host, self.relay_port)
+        local.connectToHost("127.0.0.1", self.local_port)
+
+def main():
+    from PySide6.QtCore import QCoreApplication
+    parser = argparse.ArgumentParser(description="TA Assistant 中继")
+    parser.add_argument("--port", type=int, default=RELAY_PORT)
+    args = parser.parse_args()
+
+    app = QCoreApplication(sys.argv)
+    relay = RelayServer(args.port)
+    relay.log.connect(print)
+    ok, msg = relay.start()
+    print(msg)
+    if not ok:
+        return 1
+    return app.exec()
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,62 +1,272 @@
-import struct
+import time
+import base64
+import hashlib
+import secrets
+from collections import OrderedDict
 from PySide6.QtNetwork import QTcpServer, QHostAddress, QTcpSocket, QAbstractSocket
 from PySide6.QtCore import QObject, Signal, QTimer
-from .protocol import unpack_msg, pack_msg, HEADER_SIZE, MsgType
+from .protocol import (
+    unpack_msg, pack_msg, parse_header, choose_compression, negotiate_features, Frame,
+    HEADER_SIZE, FILE_CHUNK_SIZE, PROTOCOL_VERSION, FEATURE_FILE_OFFER, FEATURE_COMPRESSION, FEATURE_HEARTBEAT,
+    FEATURE_RESYNC, FEATURE_CHAOS_OPS, HEARTBEAT_INTERVAL, HEARTBEAT_TIMEOUT, MsgType
+)
+from .telemetry import TransferTelemetry
+from .journal import LogJournal
+from .reader import MessageReader
+from .codec import choose_encoding, binary_content, ENCODING_JSON
+
+class ChaosCounter:
+    """
+    GM 端权威的混沌值：每次变化版本号加一
+    PL 的增量带有操作 ID，最近 MAX_OPS 个 ID 被记住，重连后重发的同一操作不会重复计入
+    """
+    MAX_OPS = 1000
+
+    def __init__(self, value=0):
+        self.value = value
+        self.version = 0
+        self._ops = OrderedDict()
+
+    def apply(self, op_id, delta):
+        """应用一次增量，返回是否实际生效 (op_id 为 None 时总是生效)"""
+        if op_id is not None:
+            if op_id in self._ops:
+                return False
+            self._ops[op_id] = True
+            if len(self._ops) > self.MAX_OPS:
+                self._ops.popitem(last=False)
+        self.value = max(0, self.value + int(delta))
+        self.version += 1
+        return True
+
+    def set(self, value):
+        self.value = max(0, int(value))
+        self.version += 1
+
+    def state(self, op_id=None):
+        return {"value": self.value, "version": self.version, "op": op_id}
+
+class ServerHub(QObject):
+    """
+    一个监听端口上的多个游戏房间 (多桌)：每个房间是一个 GMServer，只管理和广播给自己房间的连接
+    新连接的第一条消息是 HELLO 时按其中的 "room" 交给对应的 GMServer；
+    没有指定房间或旧版客户端 (不发送 HELLO) 交给默认房间，即最早开始的房间
+    """
+    # 新连接在此时间内没有发来完整的第一条消息时直接交给默认房间
+    ROUTE_TIMEOUT = 3000
+    # 最后一个房间结束、端口不再监听 (共用该端口的端口转发等随之结束)
+    closed = Signal()
+
+    def __init__(self, port):
+        super().__init__()
+        self.port = port
+        self.server = QTcpServer(self)
+        self.server.newConnection.connect(self.handle_new_connection)
+        self.rooms = {}         # 房间 -> GMServer，按开始顺序
+        self.pending = {}       # 尚未分配房间的 socket -> 已收到的数据
+
+    def register(self, room, gm_server):
+        if room in self.rooms:
+            return False, f"房间 {room} 已在端口 {self.port} 上运行"
+        if not self.server.isListening() and not self.server.listen(QHostAddress.Any, self.port):
+            return False, self.server.errorString()
+        self.rooms[room] = gm_server
+        return True, f"Server listening on port {self.port}" + (f" (房间 {room})" if room else "")
+
+    def unregister(self, room):
+        self.rooms.pop(room, None)
+        if not self.rooms:
+            self.server.close()
+            for sock in list(self.pending):
+                sock.abort()
+            self.pending.clear()
+            _hubs.pop(self.port, None)
+            self.closed.emit()
+
+    def handle_new_connection(self):
+        while self.server.hasPendingConnections():
+            sock = self.server.nextPendingConnection()
+            self.pending[sock] = b""
+            sock.readyRead.connect(self._read_pending)
+            sock.disconnected.connect(self._drop_pending)
+            QTimer.singleShot(self.ROUTE_TIMEOUT, self, lambda sock=sock: self._route(sock, None))
+
+    def _drop_pending(self):
+        sock = self.sender()
+        if self.pending.pop(sock, None) is not None:
+            sock.deleteLater()
+
+    def _read_pending(self):
+        sock = self.sender()
+        if sock not in self.pending:
+            return
+        buffer = self.pending[sock] + sock.readAll().data()
+        self.pending[sock] = buffer
+        if len(buffer) < HEADER_SIZE:
+            return
+        body_length, flags = parse_header(buffer[:HEADER_SIZE])
+        if len(buffer) < HEADER_SIZE + body_length:
+            return
+        msg = unpack_msg(buffer[HEADER_SIZE:HEADER_SIZE + body_length], flags) or {}
+        room = None
+        if msg.get("type") == MsgType.HELLO and isinstance(msg.get("data"), dict):
+            room = msg["data"].get("room") or None
+        self._route(sock, room)
+
+    def _route(self, sock, room):
+        buffer = self.pending.pop(sock, None)
+        if buffer is None:
+            return
+        sock.readyRead.disconnect(self._read_pending)
+        sock.disconnected.disconnect(self._drop_pending)
+        if room is not None and room not in self.rooms:
+            # 不把 PL 放进别的桌
+            sock.write(pack_msg(MsgType.HELLO, {
+                "version": PROTOCOL_VERSION, "role": "GM", "features": [], "compression": None,
+                "error": f"房间 {room} 不存在"
+            }))
+            sock.disconnectFromHost()
+            sock.disconnected.connect(sock.deleteLater)
+            return
+        server = self.rooms.get(room) or next(iter(self.rooms.values()), None)
+        if server is None:
+            sock.abort()
+            sock.deleteLater()
+            return
+        server.adopt(sock, buffer)
+
+_hubs = {}
+
+def get_hub(port):
+    """同一进程中监听同一端口的 GMServer 共用一个 ServerHub"""
+    if port not in _hubs:
+        _hubs[port] = ServerHub(port)
+    return _hubs[port]
 
 class GMServer(QObject):
     log_received = Signal(str)
-    chaos_received = Signal(int)
+    chaos_changed = Signal(int)                 # 混沌值 (绝对值)，由 PL 的增量或 set_chaos 引起
     sheet_received = Signal(str, str, dict)
     player_connected = Signal(str, str)
     player_disconnected = Signal(str)
+    player_hello = Signal(str, dict)            # uid, {"version", "identity", "features", "resumed"}
+    player_rtt = Signal(str, float)             # uid, 往返延迟 ms
+    player_timed_out = Signal(str)              # uid，随后还会发出 player_disconnected
+    file_delivered = Signal(str, str, bool)     # uid, 文件名, 是否已在 PL 端存在
+    file_progress = Signal(str, str, int, int)  # uid, 文件名, 已确认字节, 总字节
+
+    # 内存中保留的日志条数，更早的写入 journal_path
+    LOG_HISTORY = 500
+    # 补发历史日志时每条 RESYNC 消息包含的条数
+    LOG_BATCH = 100
+    # socket 中尚未写出的数据超过此值时暂停补发
+    BACKLOG_PENDING_WRITE = 256 * 1024
 
-    def __init__(self, port=12345):
+    def __init__(self, port=12345, journal_path=None, room=None, threaded=True):
         super().__init__()
-        self.server = QTcpServer()
-        self.server.newConnection.connect(self.handle_new_connection)
+        # 房间名 (通常为游戏名)，同一端口上的多个 GMServer 以此区分
+        self.room = room
+        self.hub = None
 
         self.clients = {}
+        # 各 PL 发来的数据在网络线程中拆帧解码，以 socket 区分连接
+        self.reader = MessageReader(threaded, self)
+        self.reader.message.connect(self.on_message)
+        # 会话令牌 -> {"name", "sheet"}，PL 断线重连后凭令牌恢复
+        self.sessions = {}
+        self.journal = LogJournal(journal_path, self.LOG_HISTORY)
+        self.chaos = ChaosCounter()
+
+        # 有待补发历史日志的 PL 由事件循环分批发送，每轮每个 PL 一批
+        self.backlog_timer = QTimer(self)
+        self.backlog_timer.setInterval(0)
+        self.backlog_timer.timeout.connect(self.stream_backlog)
+        self.telemetry = TransferTelemetry()
+        self.distributor = FileDistributor(self.telemetry, self.encoding_for, self)
+        self.distributor.progress.connect(self.file_progress)
+        self.distributor.finished.connect(self.on_file_distributed)
+        self.distributor.unavailable.connect(self.on_file_unavailable)
+
+        self.heartbeat_timer = QTimer(self)
+        self.heartbeat_timer.setInterval(HEARTBEAT_INTERVAL * 1000)
+        self.heartbeat_timer.timeout.connect(self.heartbeat)
         
         self.port = port
 
     def start(self):
-        if not self.server.listen(QHostAddress.Any, self.port):
-            return False, self.server.errorString()
-        return True, f"Server listening on port {self.port}"
+        hub = get_hub(self.port)
+        ok, msg = hub.register(self.room, self)
+        if not ok:
+            return False, msg
+        self.hub = hub
+        self.heartbeat_timer.start()
+        return True, msg
 
     def stop(self):
+        self.heartbeat_timer.stop()
         for client_socket in list(self.clients.keys()):
+            self.reader.drop(client_socket)
             if client_socket.state() != QAbstractSocket.UnconnectedState:
                 client_socket.disconnectFromHost()
-        self.server.close()
+        if self.hub is not None:
+            self.hub.unregister(self.room)
+            self.hub = None
         self.clients.clear()
     
-    def handle_new_connection(self):
-        while self.server.hasPendingConnections():
-            client_socket = self.server.nextPendingConnection()
-            peer_ip = client_socket.peerAddress().toString()
-            peer_port = client_socket.peerPort()
-            uid = f"{peer_ip}:{peer_port}"
-            self.clients[client_socket] = {
-                "uid": uid,
-                "buffer": b"",
-                "name": "Unknown"
-
-            }
-            client_socket.readyRead.connect(self.on_ready_read)
-            client_socket.disconnected.connect(self.on_disconnected)
-            self.player_connected.emit(uid, peer_ip)
+    def adopt(self, client_socket, buffered=b""):
+        """接管 ServerHub 分配到本房间的连接；buffered 为分配前已收到的数据"""
+        peer_ip = client_socket.peerAddress().toString()
+        peer_port = client_socket.peerPort()
+        uid = f"{peer_ip}:{peer_port}"
+        self.clients[client_socket] = {
+            "uid": uid,
+            "name": "Unknown",
+            # 在收到 HELLO 之前按旧版客户端处理：不压缩、整文件发送
+            "version": 1,
+            "role": "PL",
+            "identity": {},
+            "features": set(),
+            "compression": None,
+            "encoding": ENCODING_JSON,
+            "last_seen": time.monotonic(),
+            "rtt": None,
+            "session": None,
+            # 已补发到的日志序号，None 表示没有待补发的日志
+            "catch_up": None
+        }
+        client_socket.readyRead.connect(self.on_ready_read)
+        client_socket.disconnected.connect(self.on_disconnected)
+        self.player_connected.emit(uid, peer_ip)
+        if buffered:
+            self.consume(client_socket, buffered)
 
     def on_disconnected(self):
         sender_socket = self.sender()
+        self.drop_client(sender_socket)
+        sender_socket.deleteLater()
 
-        if sender_socket in self.clients:
-            ctx = self.clients[sender_socket]
-            uid = ctx["uid"]
-            del self.clients[sender_socket]
-            self.player_disconnected.emit(uid)
+    def drop_client(self, sock):
+        ctx = self.clients.pop(sock, None)
+        if ctx is None:
+            return
+        self.reader.drop(sock)
+        self.distributor.drop(sock)
+        self.player_disconnected.emit(ctx["uid"])
 
-        sender_socket.deleteLater()
+    def heartbeat(self):
+        """向支持心跳的 PL 发送 PING，并断开长时间没有任何数据的连接 (隧道半开时 TCP 不会报告断开)"""
+        now = time.monotonic()
+        ping = Frame(MsgType.PING, {"t": now * 1000})
+        for sock, ctx in list(self.clients.items()):
+            if FEATURE_HEARTBEAT not in ctx["features"]:
+                continue
+            if now - ctx["last_seen"] > HEARTBEAT_TIMEOUT:
+                self.player_timed_out.emit(ctx["uid"])
+                self.drop_client(sock)
+                sock.abort()
+                sock.deleteLater()
+                continue
+            self._write(sock, ping)
 
     def on_ready_read(self):
         sender_socket = self.sender()
@@ -64,36 +274,30 @@ class GMServer(QObject):
         if sender_socket not in self.clients:
             return
 
-        
-        ctx = self.clients[sender_socket]
-        new_data = sender_socket.readAll().data()
-        ctx["buffer"] += new_data
-
-        while True:
-            buffer = ctx["buffer"]
-            if len(buffer) < HEADER_SIZE:
-                break
-            
-            body_length = struct.unpack('!I', buffer[:HEADER_SIZE])[0]
-            if len(buffer) < HEADER_SIZE + body_length:
-                break
-
-            body_data = buffer[HEADER_SIZE : HEADER_SIZE + body_length]
-            ctx["buffer"] = buffer[HEADER_SIZE + body_length :]
+        self.consume(sender_socket, sender_socket.readAll().data())
 
-            self.process_message(body_data, sender_socket)
+    def consume(self, sender_socket, new_data):
+        self.clients[sender_socket]["last_seen"] = time.monotonic()
+        self.reader.feed(sender_socket, new_data)
 
-    def process_message(self, body_data, sender_socket):
-        msg = unpack_msg(body_data)
-        if not msg: return
+    def on_message(self, sender_socket, msg):
+        # 解码期间连接可能已经断开
+        if sender_socket in self.clients:
+            self.process_message(msg, sender_socket)
 
+    def process_message(self, msg, sender_socket):
         m_type = msg.get("type")
         data = msg.get("data")
         sender_uid = self.clients[sender_socket]["uid"]
 
         if m_type == MsgType.CHAOS_SYNC:
-            self.chaos_received.emit(data)
-            self.broadcast(MsgType.CHAOS_SYNC, data, exclude=sender_socket)
+            # 旧版 PL 发送的是增量，没有操作 ID
+            self.apply_chaos(None, data)
+
+        elif m_type == MsgType.CHAOS_OP:
+            if not self.apply_chaos(data.get("op"), data.get("delta", 0)):
+                # 重复的操作 (确认丢失后重发)：只向发送者确认
+                self._send(sender_socket, MsgType.CHAOS_SYNC, self.chaos.state(data.get("op")))
             
         elif m_type == MsgType.LOG_SYNC:
             self.log_received.emit(data)
@@ -103,22 +307,355 @@ class GMServer(QObject):
             new_name = data.get("name", "Unknown")
             sheet_content = data.get("sheet", {})
             self.clients[sender_socket]["name"] = new_name
+            session = self.sessions.get(self.clients[sender_socket]["session"])
+            if session is not None:
+                session["name"], session["sheet"] = new_name, sheet_content
             self.sheet_received.emit(sender_uid, new_name, sheet_content)
-    
+
+        elif m_type == MsgType.HELLO:
+            ctx = self.clients[sender_socket]
+            ctx["version"] = data.get("version", 1)
+            ctx["role"] = data.get("role", "PL")
+            ctx["identity"] = data.get("identity", {})
+            ctx["features"] = set(negotiate_features(data.get("features")))
+            codec = None
+            if FEATURE_COMPRESSION in ctx["features"]:
+                codec = choose_compression(data.get("compression"))
+            encoding = choose_encoding(data.get("encodings"))
+            reply = {
+                "version": PROTOCOL_VERSION,
+                "role": "GM",
+                "features": sorted(ctx["features"]),
+                "compression": codec,
+                "encoding": encoding,
+                "room": self.room,
+            }
+            token = None
+            if FEATURE_RESYNC in ctx["features"]:
+                token = data.get("session")
+                reply["resumed"] = token in self.sessions
+                if not reply["resumed"]:
+                    token = secrets.token_hex(16)
+                reply["session"] = token
+            sender_socket.write(pack_msg(MsgType.HELLO, reply))
+            # 回复本身不压缩且总是 JSON，之后发给该 PL 的消息按协商结果编码和压缩
+            ctx["compression"] = codec
+            ctx["encoding"] = encoding
+            resumed = token is not None and self.start_session(sender_socket, token, data.get("last_seq", 0))
+            self.player_hello.emit(sender_uid, {
+                "version": ctx["version"], "identity": ctx["identity"], "features": sorted(ctx["features"]),
+                "resumed": resumed
+            })
+            session = self.sessions.get(token)
+            if resumed and session["sheet"] is not None:
+                # PL 断线期间角色卡没有变化时不会重新推送，沿用会话中保存的角色卡
+                ctx["name"] = session["name"]
+                self.sheet_received.emit(sender_uid, session["name"], session["sheet"])
+
+        elif m_type == MsgType.PONG:
+            ctx = self.clients[sender_socket]
+            rtt = time.monotonic() * 1000 - data.get("t", 0)
+            ctx["rtt"] = rtt if ctx["rtt"] is None else ctx["rtt"] * 0.7 + rtt * 0.3
+            self.player_rtt.emit(sender_uid, ctx["rtt"])
+
+        elif m_type == MsgType.PING:
+            self._send(sender_socket, MsgType.PONG, data)
+
+        elif m_type == MsgType.FILE_HAVE:
+            name = self.distributor.name(data.get("hash"))
+            if name:
+                self.file_delivered.emit(sender_uid, name, True)
+
+        elif m_type == MsgType.FILE_WANT:
+            # offset 为 PL 已持有的字节数，断线重连后从此处续传
+            offset = max(0, int(data.get("offset", 0)))
+            self.distributor.start(sender_socket, sender_uid, data.get("hash"), offset)
+
+        elif m_type == MsgType.FILE_ACK:
+            self.distributor.ack(sender_socket, data.get("hash"), data.get("offset", 0))
+
+    def on_file_distributed(self, uid, name):
+        self.file_delivered.emit(uid, name, False)
+
+    def on_file_unavailable(self, sock, digest):
+        # 文件已被移出内存 (或 GM 重启过)，PL 不必保留未完成的部分反复请求
+        if sock in self.clients:
+            self._send(sock, MsgType.FILE_GONE, {"hash": digest})
+
+    def offer_file(self, name, content, uid=None):
+        """
+        先只发送文件哈希，PL 已有相同内容时回复 HAVE，否则回复 WANT 后再分块传输
+        每块都需要 PL 写入磁盘后确认，连接中断后 PL 重新 WANT 时从已确认的位置续传
+        uid 为 None 时发给所有 PL
+        """
+        digest = self.distributor.add_file(name, content)
+        offer = Frame(MsgType.FILE_OFFER, {"name": name, "hash": digest, "size": len(content)})
+        legacy = None
+        for sock, ctx in self.clients.items():
+            if uid is not None and ctx["uid"] != uid:
+                continue
+            if FEATURE_FILE_OFFER in ctx["features"]:
+                self._write(sock, offer)
+            else:
+                # 旧版客户端不支持按哈希提供，整个文件一次发送
+                if legacy is None:
+                    legacy = Frame(MsgType.FILE_SEND, {"name": name, "content": base64.b64encode(content).decode("utf-8")})
+                self._write(sock, legacy)
+        return digest
+
+    def start_session(self, sock, token, last_seq):
+        """
+        登记或恢复 PL 的会话，并开始补发当前混沌值与其错过的日志，返回是否恢复了原有会话
+        新会话 (中途加入的 PL) 补发本次会话的全部日志；恢复的会话只补发序号大于 last_seq 的日志
+        """
+        resumed = token in self.sessions
+        if resumed:
+            # 隧道断开时旧连接可能还没被发现，直接丢弃
+            for other, ctx in list(self.clients.items()):
+                if other is not sock and ctx["session"] == token:
+                    self.drop_client(other)
+                    other.abort()
+                    other.deleteLater()
+        else:
+            self.sessions[token] = {"name": None, "sheet": None}
+            last_seq = 0
+        self.clients[sock]["session"] = token
+        self.clients[sock]["catch_up"] = min(last_seq, self.journal.seq)
+        self.backlog_timer.start()
+        return resumed
+
+    def stream_backlog(self):
+        """
+        向补发中的 PL 发送下一批历史日志 (跳过该 PL 自己发出的)，最后一批附带当前混沌值
+        补发期间新的日志也由此按顺序发送，不会插到历史日志之前
+        """
+        pending = False
+        for sock, ctx in list(self.clients.items()):
+            after = ctx["catch_up"]
+            if after is None:
+                continue
+            if sock.bytesToWrite() > self.BACKLOG_PENDING_WRITE:
+                pending = True
+                continue
+            batch = self.journal.since(after, self.LOG_BATCH)
+            data = {
+                "logs": [[seq, html] for seq, html, origin in batch if origin != ctx["session"]],
+                "seq": batch[-1][0] if batch else after,
+            }
+            if len(batch) < self.LOG_BATCH:
+                ctx["catch_up"] = None
+                data["chaos"] = self.chaos.value
+                data["chaos_version"] = self.chaos.version
+            else:
+                ctx["catch_up"] = data["seq"]
+                pending = True
+            self._send(sock, MsgType.RESYNC, data)
+        if not pending:
+            self.backlog_timer.stop()
+
+    def apply_chaos(self, op_id, delta):
+        """应用一次增量并推送新的混沌值，重复的操作返回 False"""
+        if not self.chaos.apply(op_id, delta):
+            return False
+        self.chaos_changed.emit(self.chaos.value)
+        self.broadcast(MsgType.CHAOS_SYNC, self.chaos.state(op_id))
+        return True
+
+    def set_chaos(self, value):
+        """GM 直接修改混沌值"""
+        if int(value) == self.chaos.value:
+            return
+        self.chaos.set(value)
+        self.broadcast(MsgType.CHAOS_SYNC, self.chaos.state())
+
+    def encoding_for(self, sock):
+        """(消息体编码, 压缩算法)"""
+        ctx = self.clients.get(sock)
+        return (ctx["encoding"], ctx["compression"]) if ctx else (ENCODING_JSON, None)
+
     def broadcast(self, msg_type, data, exclude=None):
-        payload = pack_msg(msg_type, data)
-        for sock in self.clients:
-            if sock != exclude and sock.state() == QTcpSocket.ConnectedState:
-                sock.write(payload)
-                sock.flush()
+        # 日志记入历史，供重连的 PL 补发；支持补发的 PL 收到带序号的日志
+        # 混沌值对支持 chaos_ops 的 PL 发送带版本号的状态，旧版 PL 只收到绝对值
+        sequenced = None
+        legacy = data
+        if msg_type == MsgType.CHAOS_SYNC:
+            sequenced, legacy = data, data["value"]
+        elif msg_type == MsgType.LOG_SYNC:
+            origin = self.clients[exclude]["session"] if exclude in self.clients else None
+            sequenced = {"seq": self.journal.append(data, origin), "html": data}
+
+        # 两种格式各一个 Frame，所有 PL 共享，每种 (编码, 压缩算法) 只打包一次
+        frames = {False: Frame(msg_type, legacy), True: Frame(msg_type, sequenced)}
+        feature = FEATURE_CHAOS_OPS if msg_type == MsgType.CHAOS_SYNC else FEATURE_RESYNC
+        for sock, ctx in self.clients.items():
+            if sock != exclude:
+                if msg_type == MsgType.LOG_SYNC and ctx["catch_up"] is not None:
+                    continue    # 补发完历史后由 stream_backlog 发送
+                self._write(sock, frames[sequenced is not None and feature in ctx["features"]])
     
     def send_to_all(self, msg_type, data):
+        if msg_type == MsgType.CHAOS_SYNC and not isinstance(data, dict):
+            # 直接给出绝对值时仍经由计数器，保证版本号递增
+            self.set_chaos(data)
+            return
         self.broadcast(msg_type, data, exclude=None)
     
     def send_to(self, uid, msg_type, content):
         for socket, data in self.clients.items():
             if data.get("uid") == uid:
-                if socket.state() == QTcpSocket.ConnectedState:
-                    socket.write(pack_msg(msg_type, content))
-                    socket.flush()
-                break
\ No newline at end of file
+                self._send(socket, msg_type, content)
+                break
+
+    def supports(self, uid, feature):
+        """该 PL 是否在握手中声明支持某功能"""
+        return any(ctx["uid"] == uid and feature in ctx["features"] for ctx in self.clients.values())
+
+    def _send(self, sock, msg_type, data):
+        self._write(sock, Frame(msg_type, data))
+
+    def _write(self, sock, frame):
+        """按该 PL 协商的编码和压缩算法写入 frame"""
+        if sock.state() == QTcpSocket.ConnectedState:
+            ctx = self.clients[sock]
+            sock.write(frame.packed(ctx["encoding"], ctx["compression"]))
+            sock.flush()
+
+class FileDistributor(QObject):
+    """
+    文件分发调度器
+    每个文件只保存一份不可变内容 (memoryview)，所有接收者共享；编码后的分块帧也被缓存复用
+    发送由事件循环驱动：每轮给每个活动传输最多发一块 (轮转)，受确认窗口和 socket 写缓冲限制，
+    因此多个 PL 并行接收，GUI 线程不会被一次性写入数 MB 数据阻塞
+    """
+    progress = Signal(str, str, int, int)   # uid, 文件名, 已确认字节, 总字节
+    finished = Signal(str, str)             # uid, 文件名
+    unavailable = Signal(object, str)       # socket, 哈希：请求或正在传输的文件已不在内存中
+
+    # 最近提供的文件内容保留在内存中等待 PL 的 WANT 请求，总大小超过上限时移出最早提供的文件 (最新的文件总是保留)
+    MAX_CACHE_BYTES = 256 * 1024 * 1024
+    # 每个传输最多允许多少块未被确认
+    WINDOW = 4
+    # socket 中尚未写出的数据超过此值时暂停向其发送
+    MAX_PENDING_WRITE = 1024 * 1024
+    MAX_CACHED_FRAMES = 32
+
+    def __init__(self, telemetry, encoding_for, parent=None):
+        super().__init__(parent)
+        self.telemetry = telemetry
+        self.encoding_for = encoding_for
+        self.files = OrderedDict()          # 哈希 -> {"name", "data"}
+        self.transfers = OrderedDict()      # (socket, 哈希) -> {"uid", "sent", "acked"}
+        self._frames = OrderedDict()        # (哈希, 偏移, (编码, 压缩算法)) -> 已打包的帧
+        self._watched = set()
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self._tick)
+
+    def add_file(self, name, content):
+        digest = hashlib.sha256(content).hexdigest()
+        if digest not in self.files:
+            self.files[digest] = {"name": name, "data": memoryview(bytes(content))}
+        self.files[digest]["name"] = name
+        self.files.move_to_end(digest)
+        while len(self.files) > 1 and sum(len(e["data"]) for e in self.files.values()) > self.MAX_CACHE_BYTES:
+            self._evict(next(iter(self.files)))
+        return digest
+
+    def _evict(self, digest):
+        """移出文件内容与其缓存的帧，进行中的传输通知 PL 放弃"""
+        entry = self.files.pop(digest)
+        for key in [k for k in self._frames if k[0] == digest]:
+            del self._frames[key]
+        for sock, d in [k for k in self.transfers if k[1] == digest]:
+            self._cancel(sock, d, entry)
+
+    def _cancel(self, sock, digest, entry=None):
+        state = self.transfers.pop((sock, digest), None)
+        if state is not None:
+            self.telemetry.cancel(state["uid"], digest)
+            if entry is not None:
+                # 让界面按剩余的传输刷新该玩家的进度
+                self.progress.emit(state["uid"], entry["name"], state["acked"], len(entry["data"]))
+        self.unavailable.emit(sock, digest)
+
+    def name(self, digest):
+        entry = self.files.get(digest)
+        return entry["name"] if entry else None
+
+    def start(self, sock, uid, digest, offset):
+        if digest not in self.files:
+            self.unavailable.emit(sock, digest)
+            return
+        self.transfers[(sock, digest)] = {"uid": uid, "sent": offset, "acked": offset}
+        entry = self.files[digest]
+        self.telemetry.begin(uid, digest, entry["name"], len(entry["data"]), offset)
+        if sock not in self._watched:
+            self._watched.add(sock)
+            sock.bytesWritten.connect(self._wake)
+        self._wake()
+
+    def ack(self, sock, digest, offset):
+        state = self.transfers.get((sock, digest))
+        entry = self.files.get(digest)
+        if state is None or entry is None:
+            return
+        state["acked"] = offset
+        state["sent"] = max(state["sent"], offset)
+        total = len(entry["data"])
+        self.telemetry.update(state["uid"], digest, offset)
+        self.progress.emit(state["uid"], entry["name"], offset, total)
+        if offset >= total:
+            del self.transfers[(sock, digest)]
+            self.telemetry.finish(state["uid"], digest)
+            self.finished.emit(state["uid"], entry["name"])
+        else:
+            self._wake()
+
+    def drop(self, sock):
+        for key in [k for k in self.transfers if k[0] is sock]:
+            self.telemetry.drop_peer(self.transfers.pop(key)["uid"])
+        self._watched.discard(sock)
+
+    def _wake(self, *args):
+        if self.transfers and not self._timer.isActive():
+            self._timer.start()
+
+    def _frame(self, digest, offset, encoding):
+        key = (digest, offset, encoding)
+        frame = self._frames.get(key)
+        if frame is None:
+            body_encoding, compression = encoding
+            chunk = self.files[digest]["data"][offset:offset + FILE_CHUNK_SIZE]
+            content = bytes(chunk) if binary_content(body_encoding) else base64.b64encode(chunk).decode("utf-8")
+            frame = pack_msg(MsgType.FILE_CHUNK, {
+                "hash": digest, "offset": offset, "content": content
+            }, compression, body_encoding)
+            self._frames[key] = frame
+            while len(self._frames) > self.MAX_CACHED_FRAMES:
+                self._frames.popitem(last=False)
+        else:
+            self._frames.move_to_end(key)
+        return frame
+
+    def _tick(self):
+        window = self.WINDOW * FILE_CHUNK_SIZE
+        sent_any = False
+        for (sock, digest), state in list(self.transfers.items()):
+            entry = self.files.get(digest)
+            if entry is None:
+                self._cancel(sock, digest)
+                continue
+            if sock.state() != QTcpSocket.ConnectedState:
+                continue
+            if state["sent"] >= len(entry["data"]) or state["sent"] - state["acked"] >= window:
+                continue
+            if sock.bytesToWrite() > self.MAX_PENDING_WRITE:
+                continue
+            offset = state["sent"]
+            sock.write(self._frame(digest, offset, self.encoding_for(sock)))
+            state["sent"] = min(offset + FILE_CHUNK_SIZE, len(entry["data"]))
+            sent_any = True
+        # 所有传输都在等待确认或写缓冲时停止，由 ack / bytesWritten 重新唤醒
+        if not sent_any:
+            self._timer.stop()
@@ -0,0 +1,100 @@
+import time
+
+def format_bytes(n):
+    for unit in ("B", "KB", "MB", "GB"):
+        if n < 1024 or unit == "GB":
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+
+def format_eta(seconds):
+    if seconds is None:
+        return "--:--"
+    seconds = int(seconds)
+    return f"{seconds // 60:02d}:{seconds % 60:02d}"
+
+class TransferStat:
+    """单个传输的进度与速率 (指数滑动平均)"""
+    __slots__ = ("name", "total", "done", "started", "rate", "_last_time", "_last_done")
+
+    SMOOTHING = 0.3
+
+    def __init__(self, name, total, done=0, now=None):
+        now = time.monotonic() if now is None else now
+        self.name = name
+        self.total = total
+        self.done = done
+        self.started = now
+        self.rate = 0.0
+        self._last_time = now
+        self._last_done = done
+
+    def update(self, done, now=None):
+        now = time.monotonic() if now is None else now
+        delta = done - self.done
+        self.done = done
+        dt = now - self._last_time
+        # 间隔太短时累计到下一次再计算，避免速率剧烈跳动
+        if dt >= 0.2:
+            instant = (done - self._last_done) / dt
+            self.rate = instant if self.rate == 0 else self.rate + self.SMOOTHING * (instant - self.rate)
+            self._last_time = now
+            self._last_done = done
+        return delta
+
+    def percent(self):
+        return 100 if self.total <= 0 else min(100, self.done * 100 // self.total)
+
+    def eta(self):
+        if self.rate <= 0:
+            return None
+        return max(0.0, (self.total - self.done) / self.rate)
+
+class TransferTelemetry:
+    """
+    记录一次会话中的所有文件传输
+    传输以 (对端, 哈希) 为键；按对端汇总可得到列表中每个玩家的总体进度
+    """
+    def __init__(self):
+        self.transfers = {}
+        self.session_started = time.monotonic()
+        self.total_bytes = 0
+        self.files_completed = 0
+
+    def begin(self, peer, digest, name, total, done=0):
+        self.transfers[(peer, digest)] = TransferStat(name, total, done)
+
+    def update(self, peer, digest, done):
+        stat = self.transfers.get((peer, digest))
+        if stat is None:
+            return None
+        self.total_bytes += max(0, stat.update(done))
+        return stat
+
+    def finish(self, peer, digest):
+        if self.transfers.pop((peer, digest), None) is not None:
+            self.files_completed += 1
+
+    def cancel(self, peer, digest):
+        """传输中止 (不计入已完成的文件)"""
+        self.transfers.pop((peer, digest), None)
+
+    def drop_peer(self, peer):
+        for key in [k for k in self.transfers if k[0] == peer]:
+            del self.transfers[key]
+
+    def peer(self, peer):
+        """对端所有进行中传输的汇总 (已完成字节, 总字节, 速率, 剩余秒数)；没有传输时返回 None"""
+        stats = [s for (p, _), s in self.transfers.items() if p == peer]
+        if not stats:
+            return None
+        done = sum(s.done for s in stats)
+        total = sum(s.total for s in stats)
+        rate = sum(s.rate for s in stats)
+        return done, total, rate, (total - done) / rate if rate > 0 else None
+
+    def summary(self):
+        elapsed = time.monotonic() - self.session_started
+        return (
+            f"本次会话共传输 {format_bytes(self.total_bytes)}，完成 {self.files_completed} 个文件，"
+            f"平均 {format_bytes(self.total_bytes / elapsed if elapsed > 0 else 0)}/s"
+        )
@@ -0,0 +1,124 @@
+import shlex
+import time
+from PySide6.QtNetwork import QTcpSocket
+from PySide6.QtCore import QObject, Signal, QTimer
+from core.process_supervisor import get_supervisor
+
+class TunnelManager(QObject):
+    """
+    异步启动隧道命令 (如 gs-netcat) 并探测本地端口
+    进程启动后每隔 PROBE_INTERVAL 尝试连接 127.0.0.1:port，第一次连接成功即视为隧道就绪，
+    超过 PROBE_TIMEOUT 仍未就绪则结束进程并报告失败；整个过程不阻塞事件循环
+    进程由 ProcessSupervisor 监管：意外退出后自动重启并重新探测，就绪后再次发出 ready
+    """
+    IDLE = "idle"
+    STARTING = "starting"       # 进程已启动，正在探测端口
+    READY = "ready"
+    RESTARTING = "restarting"   # 进程意外退出，等待重启
+    FAILED = "failed"
+
+    state_changed = Signal(str)
+    ready = Signal(int)         # 本地端口
+    failed = Signal(str)        # 失败原因
+    output = Signal(str)        # 进程输出的一行
+
+    PROBE_INTERVAL = 100        # ms
+    PROBE_TIMEOUT = 15          # 秒
+    PROCESS_NAME = "tunnel"
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.state = self.IDLE
+        self.port = None
+        self.command = ""
+        self.process = None
+        self._deadline = 0.0
+
+        self.probe = QTcpSocket(self)
+        self.probe.connected.connect(self._on_probe_connected)
+        self.probe.errorOccurred.connect(self._on_probe_error)
+        self.probe_timer = QTimer(self)
+        self.probe_timer.setSingleShot(True)
+        self.probe_timer.timeout.connect(self._probe)
+
+    @property
+    def running(self):
+        return self.process is not None
+
+    def start(self, command, port):
+        self.stop()
+        try:
+            args = shlex.split(command)
+        except ValueError as e:
+            self._fail(f"命令格式错误: {e}")
+            return
+        if not args:
+            self._fail("隧道命令为空")
+            return
+        self.command = command
+        self.port = int(port)
+        self.process = get_supervisor().spawn(self.PROCESS_NAME, args)
+        self.process.started.connect(self._on_process_started)
+        self.process.output.connect(self.output)
+        self.process.exited.connect(self._on_process_exited)
+        self.process.failed.connect(self._on_process_failed)
+        self._set_state(self.STARTING)
+        self.process.start()
+
+    def stop(self):
+        self.probe_timer.stop()
+        self.probe.abort()
+        if self.process is not None:
+            # 先置为 IDLE，结束进程时的 exited 不会被当成意外退出
+            self._set_state(self.IDLE)
+            self.process = None
+            get_supervisor().stop(self.PROCESS_NAME)
+        self._set_state(self.IDLE)
+
+    def _set_state(self, state):
+        if state != self.state:
+            self.state = state
+            self.state_changed.emit(state)
+
+    def _fail(self, reason):
+        self.stop()
+        self._set_state(self.FAILED)
+        self.failed.emit(reason)
+
+    def _on_process_started(self):
+        self._deadline = time.monotonic() + self.PROBE_TIMEOUT
+        self._set_state(self.STARTING)
+        self.probe_timer.start(self.PROBE_INTERVAL)
+
+    def _on_process_exited(self, exit_code, restart_delay):
+        if self.state == self.IDLE:
+            return
+        self.probe_timer.stop()
+        self.probe.abort()
+        if restart_delay >= 0:
+            self._set_state(self.RESTARTING)
+            self.output.emit(f"隧道进程已退出 (退出码 {exit_code})，{restart_delay:.1f} 秒后重启")
+
+    def _on_process_failed(self, reason):
+        if self.state != self.IDLE:
+            self._fail(reason)
+
+    def _probe(self):
+        if self.state != self.STARTING:
+            return
+        if time.monotonic() > self._deadline:
+            self._fail(f"等待隧道超时 ({self.PROBE_TIMEOUT} 秒内本地端口 {self.port} 未就绪)")
+            return
+        self.probe.abort()
+        self.probe.connectToHost("127.0.0.1", self.port)
+
+    def _on_probe_connected(self):
+        self.probe.abort()
+        if self.state == self.STARTING:
+            self._set_state(self.READY)
+            self.ready.emit(self.port)
+
+    def _on_probe_error(self):
+        # 端口还没有监听，稍后重试
+        if self.state == self.STARTING:
+            self.probe_timer.start(self.PROBE_INTERVAL)
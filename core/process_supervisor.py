@@ -0,0 +1,153 @@
+import atexit
+import random
+import time
+from PySide6.QtCore import QObject, Signal, QTimer, QProcess, QCoreApplication
+
+class SupervisedProcess(QObject):
+    """
+    受监管的外部进程 (端口转发 / 隧道命令)
+    输出异步逐行转发到 output；非主动停止的退出视为崩溃，按指数退避自动重启
+    连续崩溃超过 MAX_RESTARTS 次后放弃；稳定运行 STABLE_TIME 秒后重新计数
+    """
+    started = Signal()
+    output = Signal(str)
+    exited = Signal(int, float)     # 退出码, 多少秒后重启 (不再重启时为 -1)
+    failed = Signal(str)            # 无法启动或已放弃重启
+
+    RESTART_BASE = 1.0
+    RESTART_MAX = 30.0
+    MAX_RESTARTS = 5
+    STABLE_TIME = 30
+
+    def __init__(self, name, args, restart=True, parent=None):
+        super().__init__(parent)
+        self.name = name
+        self.args = list(args)
+        self.restart = restart
+        self.restarts = 0
+        self._stopping = False
+        self._started_at = 0.0
+        self._partial = ""
+
+        self.process = QProcess(self)
+        self.process.setProcessChannelMode(QProcess.MergedChannels)
+        self.process.started.connect(self._on_started)
+        self.process.readyReadStandardOutput.connect(self._read_output)
+        self.process.errorOccurred.connect(self._on_error)
+        self.process.finished.connect(self._on_finished)
+
+        self.restart_timer = QTimer(self)
+        self.restart_timer.setSingleShot(True)
+        self.restart_timer.timeout.connect(self._spawn)
+
+    @property
+    def running(self):
+        return self.process.state() != QProcess.NotRunning
+
+    @property
+    def command(self):
+        return " ".join(self.args)
+
+    def start(self):
+        self._stopping = False
+        self.restarts = 0
+        self._spawn()
+
+    def _spawn(self):
+        if self._stopping or self.running:
+            return
+        self._partial = ""
+        self.process.start(self.args[0], self.args[1:])
+
+    def stop(self, timeout=1000):
+        """结束进程并等待其退出，超时后强制结束"""
+        self._stopping = True
+        self.restart_timer.stop()
+        if not self.running:
+            return
+        self.process.terminate()
+        if not self.process.waitForFinished(timeout):
+            self.process.kill()
+            self.process.waitForFinished(timeout)
+
+    def _on_started(self):
+        self._started_at = time.monotonic()
+        self.started.emit()
+
+    def _read_output(self):
+        text = self._partial + self.process.readAllStandardOutput().data().decode("utf-8", errors="replace")
+        lines = text.splitlines(keepends=True)
+        # 最后一行可能还没有输出完
+        self._partial = lines.pop() if lines and not lines[-1].endswith(("\n", "\r")) else ""
+        for line in lines:
+            if line.strip():
+                self.output.emit(line.rstrip())
+
+    def _on_error(self, error):
+        if error == QProcess.FailedToStart:
+            # 找不到程序等情况重启也没有意义
+            self.restart_timer.stop()
+            self.failed.emit(f"无法启动 {self.args[0]}: {self.process.errorString()}")
+
+    def _on_finished(self, exit_code, exit_status):
+        if self._partial.strip():
+            self.output.emit(self._partial.rstrip())
+            self._partial = ""
+        if self._stopping or not self.restart:
+            self.exited.emit(exit_code, -1)
+            return
+        if time.monotonic() - self._started_at > self.STABLE_TIME:
+            self.restarts = 0
+        if self.restarts >= self.MAX_RESTARTS:
+            self.exited.emit(exit_code, -1)
+            self.failed.emit(f"{self.name} 连续退出 {self.restarts + 1} 次，已停止重启")
+            return
+        delay = min(self.RESTART_MAX, self.RESTART_BASE * 2 ** self.restarts) * random.uniform(0.8, 1.2)
+        self.restarts += 1
+        self.exited.emit(exit_code, delay)
+        self.restart_timer.start(int(delay * 1000))
+
+class ProcessSupervisor(QObject):
+    """
+    管理程序启动的所有外部进程，按名称区分；同名进程再次启动时先结束旧的
+    程序退出 (aboutToQuit / 解释器退出) 时结束所有进程，不会留下孤儿隧道
+    """
+    def __init__(self):
+        super().__init__()
+        self.processes = {}
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.stop_all)
+        atexit.register(self.stop_all)
+
+    def spawn(self, name, args, restart=True):
+        """创建 (但不启动) 受监管的进程，连接好信号后调用其 start()"""
+        self.stop(name)
+        proc = SupervisedProcess(name, args, restart, self)
+        self.processes[name] = proc
+        return proc
+
+    def get(self, name):
+        return self.processes.get(name)
+
+    def stop(self, name):
+        proc = self.processes.pop(name, None)
+        if proc is not None:
+            proc.stop()
+            proc.deleteLater()
+
+    def stop_all(self):
+        for name in list(self.processes):
+            try:
+                self.stop(name)
+            except RuntimeError:
+                # 解释器退出时 Qt 对象可能已经销毁
+                self.processes.pop(name, None)
+
+_supervisor = None
+
+def get_supervisor():
+    global _supervisor
+    if _supervisor is None:
+        _supervisor = ProcessSupervisor()
+    return _supervisor
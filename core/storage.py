@@ -0,0 +1,308 @@
+import json
+import shutil
+import sqlite3
+import time
+from pathlib import Path
+
+from core.config_manager import ConfigManager
+
+class JsonStorage:
+    """
+    默认后端：沿用 data/<role>/<game>/ 下的 JSON 文件布局
+    日志与笔记在此后端下不持久化 (与旧版行为一致)
+    """
+    def __init__(self, base_dir=Path("data")):
+        self.base_dir = Path(base_dir)
+
+    def game_dir(self, role, game):
+        return self.base_dir / role / game
+
+    def list_games(self, role):
+        root = self.base_dir / role
+        root.mkdir(parents=True, exist_ok=True)
+        return sorted(item.name for item in root.iterdir() if item.is_dir())
+
+    def create_game(self, role, game):
+        path = self.game_dir(role, game)
+        if path.exists():
+            return False
+        path.mkdir(parents=True)
+        return True
+
+    def delete_game(self, role, game):
+        shutil.rmtree(self.game_dir(role, game))
+
+    def load_character(self, game):
+        path = self.game_dir("PL", game) / "character.json"
+        if not path.exists():
+            # 旧版编辑器写入的是 data/pl/...，在大小写敏感的系统上与 data/PL/... 不是同一个文件
+            path = self.game_dir("pl", game) / "character.json"
+            if not path.exists():
+                return {}
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"Error loading character: {e}")
+            return {}
+
+    def save_character(self, game, data):
+        path = self.game_dir("PL", game) / "character.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=4)
+
+    def get_setting(self, role, game, key, default=None):
+        path = self.game_dir(role, game) / "settings.json"
+        if not path.exists():
+            return default
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f).get(key, default)
+        except Exception as e:
+            print(f"Error loading game settings: {e}")
+            return default
+
+    def set_setting(self, role, game, key, value):
+        path = self.game_dir(role, game) / "settings.json"
+        settings = {}
+        if path.exists():
+            with open(path, "r", encoding="utf-8") as f:
+                settings = json.load(f)
+        settings[key] = value
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(settings, f, indent=4, ensure_ascii=False)
+
+    def append_log(self, role, game, html):
+        pass
+
+    def query_logs(self, role, game, since=None, limit=None):
+        return []
+
+    def record_file(self, role, game, name, path, size):
+        pass
+
+    def list_files(self, role, game):
+        return []
+
+    def load_notes(self, role, game):
+        return ""
+
+    def save_notes(self, role, game, content):
+        pass
+
+class SQLiteStorage:
+    """
+    可选后端：整个安装目录共用一个 SQLite 数据库
+    游戏列表、角色卡、日志、收到的文件信息与笔记都通过索引查询，不再遍历目录
+    收到的文件本体仍然保存在 data/<role>/<game>/ 下
+    """
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS games (
+            id INTEGER PRIMARY KEY,
+            role TEXT NOT NULL,
+            name TEXT NOT NULL,
+            created REAL NOT NULL,
+            UNIQUE (role, name)
+        );
+        CREATE TABLE IF NOT EXISTS characters (
+            game_id INTEGER PRIMARY KEY REFERENCES games(id) ON DELETE CASCADE,
+            data TEXT NOT NULL,
+            updated REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS logs (
+            id INTEGER PRIMARY KEY,
+            game_id INTEGER NOT NULL REFERENCES games(id) ON DELETE CASCADE,
+            ts REAL NOT NULL,
+            html TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_logs_game_ts ON logs (game_id, ts);
+        CREATE TABLE IF NOT EXISTS files (
+            id INTEGER PRIMARY KEY,
+            game_id INTEGER NOT NULL REFERENCES games(id) ON DELETE CASCADE,
+            ts REAL NOT NULL,
+            name TEXT NOT NULL,
+            path TEXT NOT NULL,
+            size INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_files_game_ts ON files (game_id, ts);
+        CREATE TABLE IF NOT EXISTS settings (
+            game_id INTEGER NOT NULL REFERENCES games(id) ON DELETE CASCADE,
+            key TEXT NOT NULL,
+            value TEXT NOT NULL,
+            PRIMARY KEY (game_id, key)
+        );
+        CREATE TABLE IF NOT EXISTS notes (
+            game_id INTEGER PRIMARY KEY REFERENCES games(id) ON DELETE CASCADE,
+            content TEXT NOT NULL,
+            updated REAL NOT NULL
+        );
+    """
+
+    def __init__(self, db_path, base_dir=Path("data")):
+        self.db_path = Path(db_path)
+        self.base_dir = Path(base_dir)
+        is_new = not self.db_path.exists()
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(self.SCHEMA)
+        self._game_ids = {}
+
+        if is_new:
+            self.import_json(JsonStorage(self.base_dir))
+
+    def import_json(self, json_storage):
+        """首次创建数据库时导入已有的 JSON 存档"""
+        for role in ("PL", "GM"):
+            for game in json_storage.list_games(role):
+                self.create_game(role, game)
+                ruleset = json_storage.get_setting(role, game, "ruleset")
+                if ruleset:
+                    self.set_setting(role, game, "ruleset", ruleset)
+                if role == "PL":
+                    data = json_storage.load_character(game)
+                    if data:
+                        self.save_character(game, data)
+
+    def _game_id(self, role, game, create=False):
+        key = (role, game)
+        if key in self._game_ids:
+            return self._game_ids[key]
+        row = self.conn.execute("SELECT id FROM games WHERE role=? AND name=?", key).fetchone()
+        if row is None:
+            if not create:
+                return None
+            with self.conn:
+                cur = self.conn.execute(
+                    "INSERT INTO games (role, name, created) VALUES (?, ?, ?)", (role, game, time.time())
+                )
+            row = (cur.lastrowid,)
+        self._game_ids[key] = row[0]
+        return row[0]
+
+    def game_dir(self, role, game):
+        return self.base_dir / role / game
+
+    def list_games(self, role):
+        rows = self.conn.execute("SELECT name FROM games WHERE role=? ORDER BY name", (role,))
+        return [r[0] for r in rows]
+
+    def create_game(self, role, game):
+        if self._game_id(role, game) is not None:
+            return False
+        self._game_id(role, game, create=True)
+        return True
+
+    def delete_game(self, role, game):
+        game_id = self._game_id(role, game)
+        if game_id is not None:
+            with self.conn:
+                self.conn.execute("DELETE FROM games WHERE id=?", (game_id,))
+            self._game_ids.pop((role, game), None)
+        path = self.game_dir(role, game)
+        if path.exists():
+            shutil.rmtree(path)
+
+    def load_character(self, game):
+        game_id = self._game_id("PL", game)
+        if game_id is None:
+            return {}
+        row = self.conn.execute("SELECT data FROM characters WHERE game_id=?", (game_id,)).fetchone()
+        return json.loads(row[0]) if row else {}
+
+    def save_character(self, game, data):
+        game_id = self._game_id("PL", game, create=True)
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO characters (game_id, data, updated) VALUES (?, ?, ?)",
+                (game_id, json.dumps(data, ensure_ascii=False), time.time())
+            )
+
+    def get_setting(self, role, game, key, default=None):
+        game_id = self._game_id(role, game)
+        if game_id is None:
+            return default
+        row = self.conn.execute("SELECT value FROM settings WHERE game_id=? AND key=?", (game_id, key)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def set_setting(self, role, game, key, value):
+        game_id = self._game_id(role, game, create=True)
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO settings (game_id, key, value) VALUES (?, ?, ?)",
+                (game_id, key, json.dumps(value, ensure_ascii=False))
+            )
+
+    def append_log(self, role, game, html):
+        game_id = self._game_id(role, game, create=True)
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO logs (game_id, ts, html) VALUES (?, ?, ?)", (game_id, time.time(), html)
+            )
+
+    def query_logs(self, role, game, since=None, limit=None):
+        """按时间顺序返回 [(ts, html)]；limit 取最近的若干条"""
+        game_id = self._game_id(role, game)
+        if game_id is None:
+            return []
+        sql = "SELECT ts, html FROM logs WHERE game_id=? AND ts>=? ORDER BY ts DESC"
+        params = [game_id, since or 0]
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        rows = self.conn.execute(sql, params).fetchall()
+        rows.reverse()
+        return rows
+
+    def record_file(self, role, game, name, path, size):
+        game_id = self._game_id(role, game, create=True)
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO files (game_id, ts, name, path, size) VALUES (?, ?, ?, ?, ?)",
+                (game_id, time.time(), name, str(path), size)
+            )
+
+    def list_files(self, role, game):
+        game_id = self._game_id(role, game)
+        if game_id is None:
+            return []
+        return self.conn.execute(
+            "SELECT ts, name, path, size FROM files WHERE game_id=? ORDER BY ts", (game_id,)
+        ).fetchall()
+
+    def load_notes(self, role, game):
+        game_id = self._game_id(role, game)
+        if game_id is None:
+            return ""
+        row = self.conn.execute("SELECT content FROM notes WHERE game_id=?", (game_id,)).fetchone()
+        return row[0] if row else ""
+
+    def save_notes(self, role, game, content):
+        game_id = self._game_id(role, game, create=True)
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO notes (game_id, content, updated) VALUES (?, ?, ?)",
+                (game_id, content, time.time())
+            )
+
+_storage = None
+
+def get_storage():
+    """
+    根据全局配置 storage_backend ("json" / "sqlite") 返回存储后端单例
+    """
+    global _storage
+    if _storage is None:
+        backend = ConfigManager().get("storage_backend", "json")
+        # 与 global_config.json 同一个 data 目录，不受启动时的工作目录影响；SQLite 导入的 JSON 存档也在此处
+        base_dir = ConfigManager.BASE_DIR / "data"
+        if backend == "sqlite":
+            _storage = SQLiteStorage(base_dir / "campaigns.db", base_dir)
+        else:
+            _storage = JsonStorage(base_dir)
+    return _storage
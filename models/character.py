@@ -0,0 +1,51 @@
+from PySide6.QtCore import QObject, Signal
+
+class CharacterModel(QObject):
+    """
+    PL 角色卡的唯一内存副本，由主窗口持有，编辑器与掷骰工具共享
+    fieldChanged(key): 某个字段发生变化
+    dataChanged(): 一批修改结束 (用于落盘与同步)
+    """
+    fieldChanged = Signal(str)
+    dataChanged = Signal()
+
+    def __init__(self, storage, game_name, parent=None):
+        super().__init__(parent)
+        self.storage = storage
+        self.game_name = game_name
+        self._data = self.load()
+
+    @property
+    def data(self):
+        return self._data
+
+    def get(self, key, default=None):
+        return self._data.get(key, default)
+
+    def set(self, key, value):
+        if self._data.get(key) == value:
+            return
+        self._data[key] = value
+        self.fieldChanged.emit(key)
+        self.dataChanged.emit()
+
+    def update(self, new_data):
+        """整体替换角色卡 (编辑器保存时调用)，只对变化的字段发信号"""
+        changed = [k for k in set(self._data) | set(new_data) if self._data.get(k) != new_data.get(k)]
+        self._data.clear()
+        self._data.update(new_data)
+        for key in changed:
+            self.fieldChanged.emit(key)
+        if changed:
+            self.dataChanged.emit()
+
+    def notify(self, key):
+        """字段被原地修改 (如 quality_assurances 中的数值) 后调用"""
+        self.fieldChanged.emit(key)
+        self.dataChanged.emit()
+
+    def load(self):
+        return self.storage.load_character(self.game_name)
+
+    def save(self):
+        self.storage.save_character(self.game_name, self._data)
@@ -0,0 +1,126 @@
+import copy
+
+from models.ruleset import RulesetLoader, RulesetError
+
+DEFAULT_RULESET = "zh_CN"
+
+class _Record:
+    """只读记录的基类，字段由子类的 __slots__ 决定"""
+    __slots__ = ()
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            object.__setattr__(self, name, fields.get(name, ""))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def get(self, name, default=None):
+        return getattr(self, name, default)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.name!r})"
+
+class QualityAssurance(_Record):
+    __slots__ = ("key", "name")
+
+class Reality(_Record):
+    __slots__ = (
+        "name", "trigger", "trigger_desc", "burnout", "burnout_desc", "track_name", "track_desc"
+    )
+
+class Competency(_Record):
+    __slots__ = ("name", "directive", "directive_desc", "behaviors", "requisitions")
+
+    def __init__(self, **fields):
+        fields["behaviors"] = tuple(fields.get("behaviors", ()))
+        fields["requisitions"] = tuple(fields.get("requisitions", ()))
+        super().__init__(**fields)
+
+class Anomaly(_Record):
+    __slots__ = ("name", "abilities")
+
+    def __init__(self, **fields):
+        fields["abilities"] = tuple(fields.get("abilities", ()))
+        super().__init__(**fields)
+
+def _int_keys(mapping):
+    return {int(k): v for k, v in mapping.items()}
+
+class GameData:
+    """
+    游戏静态数据 (现实身份、公司职能、异常共鸣、素质保障、轨道标签)
+    所有查询都是字典查找；*_by_name 为名称 -> 键的反向索引
+    """
+    def __init__(self, doc):
+        self.qualities = {q["key"]: QualityAssurance(**q) for q in doc.get("qualities", [])}
+        self.quality_key_by_name = {q.name: key for key, q in self.qualities.items()}
+
+        self.realities = {r["name"]: Reality(**r) for r in doc.get("realities", [])}
+        self.competencies = {c["name"]: Competency(**c) for c in doc.get("competencies", [])}
+        self.anomalies = {a["name"]: Anomaly(**a) for a in doc.get("anomalies", [])}
+
+        track_labels = doc.get("track_labels", {})
+        self.track_labels = {k: _int_keys(track_labels.get(k, {})) for k in ("competency", "reality", "anomaly")}
+        self.competency_ranks_top = _int_keys(doc.get("competency_ranks_top", {}))
+        self.competency_ranks_bottom = _int_keys(doc.get("competency_ranks_bottom", {}))
+
+        self._default_abilities = tuple(doc.get("default_abilities", ()))
+        self._default_requisitions = tuple(doc.get("default_requisitions", ()))
+        self._empty_ability = doc.get("empty_ability", {})
+
+    def quality_name(self, key, default="未知"):
+        qa = self.qualities.get(key)
+        return qa.name if qa else default
+
+    def abilities_for(self, anomaly_name):
+        """返回某异常共鸣的默认技能 (可自由修改的副本)"""
+        anomaly = self.anomalies.get(anomaly_name)
+        return copy.deepcopy(list(anomaly.abilities if anomaly else self._default_abilities))
+
+    def requisitions_for(self, competency_name):
+        """返回某公司职能的默认补给 (可自由修改的副本)"""
+        competency = self.competencies.get(competency_name)
+        return copy.deepcopy(list(competency.requisitions if competency else self._default_requisitions))
+
+    def empty_ability(self):
+        return copy.deepcopy(self._empty_ability)
+
+_loader = None
+_active_ruleset = None
+_cache = {}
+
+def get_ruleset_loader():
+    global _loader
+    if _loader is None:
+        _loader = RulesetLoader()
+    return _loader
+
+def default_ruleset():
+    from core.config_manager import ConfigManager
+    return ConfigManager().get("default_ruleset", DEFAULT_RULESET)
+
+def set_active_ruleset(pack_id):
+    """进入游戏时调用，之后不带参数的 get_game_data() 都使用该规则包"""
+    global _active_ruleset
+    _active_ruleset = pack_id
+
+def get_game_data(ruleset=None):
+    """
+    返回规则包对应的 GameData；规则包文件未变化时直接复用已构建的对象
+    找不到或无法解析的规则包回退到内置规则包
+    """
+    pack_id = ruleset or _active_ruleset or default_ruleset()
+    loader = get_ruleset_loader()
+    try:
+        doc = loader.load(pack_id)
+    except (RulesetError, OSError, ValueError) as e:
+        print(f"Error loading ruleset {pack_id}: {e}")
+        pack_id = DEFAULT_RULESET
+        doc = loader.load(pack_id)
+
+    cached = _cache.get(pack_id)
+    if cached is None or cached[0] is not doc:
+        cached = (doc, GameData(doc))
+        _cache[pack_id] = cached
+    return cached[1]
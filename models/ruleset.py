@@ -0,0 +1,160 @@
+"""
+规则包：一个目录即一个规则包，目录名为规则包 ID
+
+    <pack_id>/
+        pack.json        清单 {"name", "description", "version", "extends"}
+        *.json / *.toml  内容文件，顶层键会合并到一起 (qualities, realities, competencies, anomalies, ...)
+
+内置规则包位于 models/rulesets/，GM 自制的规则包放在 data/rulesets/ 下
+"extends" 指定基础规则包：列表中同名条目被覆盖，新条目追加在后
+内容文件中以 _ 开头的键是注释 (如译注 "_comment")，加载时去掉，不会进入角色卡等数据
+加载结果会预编译为 data/cache/rulesets/<pack_id>.json，任何文件的 mtime/大小变化都会使其失效
+(缓存目录可被其他程序写入，因此只用 JSON 保存，不使用 pickle)
+"""
+import json
+from pathlib import Path
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    tomllib = None
+
+BUILTIN_DIR = Path(__file__).parent / "rulesets"
+USER_DIR = Path("data") / "rulesets"
+CACHE_DIR = Path("data") / "cache" / "rulesets"
+MANIFEST = "pack.json"
+CACHE_VERSION = 3
+
+# 列表类内容按此字段识别同一条目
+RECORD_KEYS = {"qualities": "key"}
+
+class RulesetError(Exception):
+    pass
+
+def _check_pack_id(pack_id):
+    """规则包 ID 会拼接到路径中，只能是单个目录名"""
+    if not isinstance(pack_id, str) or pack_id in ("", ".") or any(bad in pack_id for bad in ("/", "\\", "..")):
+        raise RulesetError(f"无效的规则包 ID: {pack_id!r}")
+
+def _read(path):
+    if path.suffix == ".toml":
+        if tomllib is None:
+            raise RulesetError(f"需要 Python 3.11+ 才能读取 TOML 规则文件: {path}")
+        with open(path, "rb") as f:
+            return tomllib.load(f)
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def _strip_notes(value):
+    """递归去掉以 _ 开头的键"""
+    if isinstance(value, dict):
+        return {k: _strip_notes(v) for k, v in value.items() if not (isinstance(k, str) and k.startswith("_"))}
+    if isinstance(value, list):
+        return [_strip_notes(v) for v in value]
+    return value
+
+def _merge(base, overlay):
+    merged = dict(base)
+    for section, value in overlay.items():
+        old = merged.get(section)
+        if isinstance(old, list) and isinstance(value, list):
+            id_key = RECORD_KEYS.get(section, "name")
+            items = {item.get(id_key): item for item in old}
+            for item in value:
+                items[item.get(id_key)] = item
+            merged[section] = list(items.values())
+        elif isinstance(old, dict) and isinstance(value, dict):
+            merged[section] = {**old, **value}
+        else:
+            merged[section] = value
+    return merged
+
+class RulesetLoader:
+    def __init__(self, search_dirs=(USER_DIR, BUILTIN_DIR), cache_dir=CACHE_DIR):
+        self.search_dirs = [Path(d) for d in search_dirs]
+        self.cache_dir = Path(cache_dir)
+        self._memory = {}
+
+    def pack_dir(self, pack_id):
+        _check_pack_id(pack_id)
+        for root in self.search_dirs:
+            path = root / pack_id
+            if (path / MANIFEST).exists():
+                return path
+        raise RulesetError(f"找不到规则包: {pack_id}")
+
+    def available(self):
+        """返回 {pack_id: 清单}，用户目录中的同名规则包优先"""
+        packs = {}
+        for root in reversed(self.search_dirs):
+            if not root.exists():
+                continue
+            for path in sorted(root.iterdir()):
+                if (path / MANIFEST).exists():
+                    try:
+                        packs[path.name] = _read(path / MANIFEST)
+                    except Exception as e:
+                        print(f"Error reading ruleset manifest {path}: {e}")
+        return packs
+
+    def _files(self, pack_dir):
+        return sorted(p for p in pack_dir.iterdir() if p.suffix in (".json", ".toml") and p.name != MANIFEST)
+
+    def _signature(self, pack_id, seen=()):
+        """规则包及其所有基础包的文件指纹"""
+        if pack_id in seen:
+            raise RulesetError(f"规则包循环继承: {pack_id}")
+        pack_dir = self.pack_dir(pack_id)
+        manifest_path = pack_dir / MANIFEST
+        sig = []
+        for path in [manifest_path, *self._files(pack_dir)]:
+            st = path.stat()
+            sig.append((str(path), st.st_mtime_ns, st.st_size))
+        base = _read(manifest_path).get("extends")
+        if base:
+            sig.extend(self._signature(base, (*seen, pack_id)))
+        return tuple(sig)
+
+    def _compile(self, pack_id):
+        pack_dir = self.pack_dir(pack_id)
+        manifest = _read(pack_dir / MANIFEST)
+        base = manifest.get("extends")
+        doc = self._compile(base) if base else {}
+        for path in self._files(pack_dir):
+            doc = _merge(doc, _strip_notes(_read(path)))
+        return doc
+
+    def load(self, pack_id):
+        """返回规则包合并后的内容字典，依次使用内存缓存、磁盘缓存，最后才解析源文件"""
+        signature = self._signature(pack_id)
+        cached = self._memory.get(pack_id)
+        if cached and cached[0] == signature:
+            return cached[1]
+
+        cache_file = self.cache_dir / f"{pack_id}.json"
+        # JSON 中元组变为列表，按列表比较
+        sig_list = [list(entry) for entry in signature]
+        doc = None
+        if cache_file.exists():
+            try:
+                with open(cache_file, "r", encoding="utf-8") as f:
+                    cached = json.load(f)
+                if cached.get("version") == CACHE_VERSION and cached.get("signature") == sig_list:
+                    doc = cached["doc"]
+            except Exception as e:
+                print(f"Ignoring broken ruleset cache {cache_file}: {e}")
+
+        if doc is None:
+            doc = self._compile(pack_id)
+            try:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                tmp = cache_file.with_suffix(".tmp")
+                with open(tmp, "w", encoding="utf-8") as f:
+                    json.dump({"version": CACHE_VERSION, "signature": sig_list, "doc": doc}, f, ensure_ascii=False)
+                tmp.replace(cache_file)
+            except (OSError, TypeError, ValueError) as e:
+                # TypeError: TOML 中的日期等 JSON 无法表示的值，此时不缓存
+                print(f"Error writing ruleset cache: {e}")
+
+        self._memory[pack_id] = (signature, doc)
+        return doc
@@ -1,6 +1,4 @@
-import os
-import json
-from pathlib import Path
+import copy
 from PySide6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QTabWidget, QPushButton, QMessageBox
 )
@@ -13,9 +11,10 @@ from ui.character.tabs.relationships import RelationshipsTab
 from ui.character.tabs.custom_tracks import CustomTracksTab
 
 class CharacterEditor(QDialog):
-    def __init__(self, game_name):
-        super().__init__()
+    def __init__(self, game_name, model, parent=None):
+        super().__init__(parent)
         self.game_name = game_name
+        self.model = model
         self.setWindowTitle(f"为 {game_name} 创建角色卡")
         self.setStyleSheet(GLOBAL_STYLE_SHEET)
         self.setMinimumWidth(1100)
@@ -30,7 +29,8 @@ class CharacterEditor(QDialog):
             QPushButton:pressed { background-color: #004488; }
         """
         
-        self.character_data = self.load_character()
+        # 编辑副本，取消编辑时不影响共享模型
+        self.character_data = copy.deepcopy(self.model.data)
         self.tabs = QTabWidget()
         
         # 初始化 Tabs
@@ -78,9 +78,6 @@ class CharacterEditor(QDialog):
             current_competency = self.basic_tab.competency_combo.currentText()
             self.requisitions_tab.reset_to_competency(current_competency)
     
-    def _get_char_file_path(self) -> Path:
-        return Path("data") / "pl" / self.game_name / "character.json"
-
     def on_anomaly_changed(self, new_anomaly_name):
         self.abilities_tab.reset_to_anomaly(new_anomaly_name)
     
@@ -108,23 +105,7 @@ class CharacterEditor(QDialog):
         }
 
         try:
-            path = self._get_char_file_path()
-            path.parent.mkdir(parents=True, exist_ok=True)
-            
-            with open(path, "w", encoding="utf-8") as f:
-                json.dump(full_data, f, ensure_ascii=False, indent=4)
-            
+            self.model.update(full_data)
             self.accept()
         except Exception as e:
-            QMessageBox.critical(self, "错误", f"保存失败: {e}")
-
-    def load_character(self):
-        path = self._get_char_file_path()
-        if not path.exists():
-            return {}
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except Exception as e:
-            print(f"Error loading character: {e}")
-            return {}
\ No newline at end of file
+            QMessageBox.critical(self, "错误", f"保存失败: {e}")
\ No newline at end of file
@@ -4,13 +4,14 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtCore import Qt
 
-from models.static_data import ANOMALY_ABILITIES_DATA,EMPTY_ABILITY_TEMPLATE
+from models.game_data import get_game_data
 from ui.common.widgets import HLine, AbilityCard
 
 class AbilitiesTab(QWidget):
-    def __init__(self, character_data, parent=None):
+    def __init__(self, character_data, parent=None, ruleset=None):
         super().__init__(parent)
         self.data = character_data
+        self.ruleset = ruleset
         self.cards = []
         self.init_ui()
 
@@ -78,7 +79,7 @@ class AbilitiesTab(QWidget):
             for ab_data in saved_abilities:
                 self.add_card(ab_data)
 
-        self.add_btn.clicked.connect(lambda: self.add_card(EMPTY_ABILITY_TEMPLATE))
+        self.add_btn.clicked.connect(lambda: self.add_card(get_game_data(self.ruleset).empty_ability()))
         self.content_layout.addWidget(self.add_btn)
         
         self.content_layout.addStretch()
@@ -95,7 +96,7 @@ class AbilitiesTab(QWidget):
         """加载指定异常"""
         abilities=self.data.get("abilities",[])
         if self.data.get("anomaly")!=anomaly_name or not abilities:
-            abilities = ANOMALY_ABILITIES_DATA.get(anomaly_name, ANOMALY_ABILITIES_DATA.get("default", []))
+            abilities = get_game_data(self.ruleset).abilities_for(anomaly_name)
         for ab_data in abilities:
             self.add_card(ab_data)
 
@@ -3,9 +3,7 @@ from PySide6.QtWidgets import (
     QLabel, QSpinBox, QScrollArea, QFrame
 )
 from PySide6.QtCore import Qt
-from models.static_data import (
-    TRACK_LABELS, COMPETENCY_RANKS_TOP, COMPETENCY_RANKS_BOTTOM
-)
+from models.game_data import get_game_data
 from ui.common.widgets import create_label, HLine, TrackNode
 
 class TrackSectionWidget(QWidget):
@@ -105,9 +103,10 @@ class TrackSectionWidget(QWidget):
         return [n.get_state() for n in self.nodes]
 
 class WorkLifeBalanceTab(QWidget):
-    def __init__(self, character_data, parent=None):
+    def __init__(self, character_data, parent=None, ruleset=None):
         super().__init__(parent)
         self.data = character_data
+        self.game_data = get_game_data(ruleset)
         
         # 初始化为 30 个格子
         self.competency_states = self.data.get("wl_competency_track", [0]*30)
@@ -211,12 +210,12 @@ class WorkLifeBalanceTab(QWidget):
         self.competency_section = TrackSectionWidget(
             title="公 司 职 能 轨 迹",
             title_class="HeaderRed",
-            labels_map=TRACK_LABELS["competency"],
+            labels_map=self.game_data.track_labels["competency"],
             state_list=self.competency_states,
             desc_left="每次标记公司职能，增加一项素质保证的上限1点，最多到9。然后获得3嘉奖",
             desc_right="每次获得MVP时，可标记一个公司职能格子且不需要划掉其他轨迹的格子",
-            ranks_top=COMPETENCY_RANKS_TOP,
-            ranks_bottom=COMPETENCY_RANKS_BOTTOM,
+            ranks_top=self.game_data.competency_ranks_top,
+            ranks_bottom=self.game_data.competency_ranks_bottom,
             color="#C41E3A"
         )
         scroll_layout.addWidget(self.competency_section)
@@ -225,7 +224,7 @@ class WorkLifeBalanceTab(QWidget):
         self.reality_section = TrackSectionWidget(
             title="现 实 身 份 轨 迹",
             title_class="HeaderYellow",
-            labels_map=TRACK_LABELS["reality"],
+            labels_map=self.game_data.track_labels["reality"],
             state_list=self.reality_states,
             desc_left="每次标记现实身份，可增加一条关系轨迹的一点关系。然后每有一条网络化的关系轨迹可重复增加一次关系",
             desc_right="若你既没获得MVP也没获得观察期，可标记一个现实身份格子且不需要划掉其他轨迹的格子",
@@ -237,7 +236,7 @@ class WorkLifeBalanceTab(QWidget):
         self.anomaly_section = TrackSectionWidget(
             title="异 常 共 鸣 轨 迹", 
             title_class="LabelA", 
-            labels_map=TRACK_LABELS["anomaly"], 
+            labels_map=self.game_data.track_labels["anomaly"], 
             state_list=self.anomaly_states,
             desc_left="每次标记异常能力，选择一项：\n▶ 练习：将一项异常技能标记上已练习\n▶ 被了解：取消勾选的已练习标记，并从已练习的异常技能里选一个向你的队友提问技能问题。勾选票数最多的那个答案并获得解锁的技能\n(消耗一点时间解锁H4我就告诉你这是什么意思！)",
             desc_right="每次你获得观察期时，可标记一个异常共鸣格子且不需要划掉其他轨迹的格子",
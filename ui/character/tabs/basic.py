@@ -3,15 +3,14 @@ from PySide6.QtWidgets import (
     QLabel, QLineEdit, QComboBox, QSpinBox, QCheckBox, QSizePolicy, QFrame
 )
 from PySide6.QtCore import Qt
-from models.static_data import (
-    REALITY_DATA, COMPETENCY_DATA, ANOMALY_NAMES, QUALITY_ASSURANCES
-)
+from models.game_data import get_game_data
 from ui.common.widgets import create_label, HLine
 
 class BasicInfoTab(QWidget):
-    def __init__(self, character_data, parent=None):
+    def __init__(self, character_data, parent=None, ruleset=None):
         super().__init__(parent)
         self.data = character_data
+        self.game_data = get_game_data(ruleset)
 
         self.dynamic_labels = {} 
         self.sanctioned_behavior_labels = []
@@ -105,9 +104,9 @@ class BasicInfoTab(QWidget):
             grid.addWidget(combo, row_idx, 2)
             return combo
 
-        self.anomaly_combo = add_arc_row(0, "A", "异常共鸣", "anomaly", ANOMALY_NAMES)
-        self.reality_combo = add_arc_row(1, "R", "现实身份", "reality", list(REALITY_DATA.keys()), self._update_identity_fields)
-        self.competency_combo = add_arc_row(2, "C", "公司职能", "competency", list(COMPETENCY_DATA.keys()), self._update_behavior_fields)
+        self.anomaly_combo = add_arc_row(0, "A", "异常共鸣", "anomaly", list(self.game_data.anomalies))
+        self.reality_combo = add_arc_row(1, "R", "现实身份", "reality", list(self.game_data.realities), self._update_identity_fields)
+        self.competency_combo = add_arc_row(2, "C", "公司职能", "competency", list(self.game_data.competencies), self._update_behavior_fields)
         
         return grid
 
@@ -245,7 +244,8 @@ class BasicInfoTab(QWidget):
         self.quality_assurances = {}
         self.qa_values = self.data.get("quality_assurances", {})
 
-        for i, (key, cn) in enumerate(QUALITY_ASSURANCES.items()):
+        for i, (key, qa) in enumerate(self.game_data.qualities.items()):
+            cn = qa.name
             grid.addWidget(create_label(cn, class_name="QualityName"), i, 1)
             
             row = QHBoxLayout()
@@ -276,7 +276,7 @@ class BasicInfoTab(QWidget):
 
     def _update_identity_fields(self):
         identity = self.reality_combo.currentText()
-        data = REALITY_DATA.get(identity, {})
+        data = self.game_data.realities.get(identity, {})
 
         self.dynamic_labels["reality_trigger_title"].setText(data.get("trigger", ""))
         self.dynamic_labels["reality_trigger_desc"].setText(data.get("trigger_desc", ""))
@@ -289,7 +289,7 @@ class BasicInfoTab(QWidget):
 
     def _update_behavior_fields(self):
         func = self.competency_combo.currentText()
-        data = COMPETENCY_DATA.get(func, {})
+        data = self.game_data.competencies.get(func, {})
         
         self.dynamic_labels["prime_directive_title"].setText(data.get("directive", ""))
         self.dynamic_labels["prime_directive_desc"].setText(data.get("directive_desc", ""))
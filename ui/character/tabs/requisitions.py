@@ -4,13 +4,14 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtCore import Qt
 
-from models.static_data import COMPETENCY_REQUISITIONS_DATA
+from models.game_data import get_game_data
 from ui.common.widgets import RequisitionCard
 
 class RequisitionsTab(QWidget):
-    def __init__(self, character_data, parent=None):
+    def __init__(self, character_data, parent=None, ruleset=None):
         super().__init__(parent)
         self.data = character_data
+        self.ruleset = ruleset
         self.cards = []
         self.init_ui()
 
@@ -136,7 +137,7 @@ class RequisitionsTab(QWidget):
         """加载指定职能的补给"""
         requisitions=self.data.get("requisitions",[])
         if self.data.get("competency")!=competency_name or not requisitions:
-            requisitions = COMPETENCY_REQUISITIONS_DATA.get(competency_name, COMPETENCY_REQUISITIONS_DATA.get("default", []))
+            requisitions = get_game_data(self.ruleset).requisitions_for(competency_name)
         for req_data in requisitions:
             self.add_card(req_data)
 
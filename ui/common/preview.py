@@ -0,0 +1,243 @@
+import hashlib
+import os
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from PySide6.QtWidgets import QScrollArea, QLabel
+from PySide6.QtGui import QImage, QImageReader, QPixmap
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, QSize, Qt, Signal
+
+def preview_key(path):
+    """缓存键: 路径 + mtime + 大小，文件被覆盖后自动失效"""
+    st = os.stat(path)
+    return f"{os.path.abspath(path)}|{st.st_mtime_ns}|{st.st_size}"
+
+class _DecodeSignals(QObject):
+    finished = Signal(str, QImage)
+    failed = Signal(str, str)
+
+class _DecodeTask(QRunnable):
+    """在线程池中解码图片，超过 max_dim 的图片直接以缩小尺寸解码，不会生成全尺寸位图"""
+    def __init__(self, key, path, max_dim, signals):
+        super().__init__()
+        self.key = key
+        self.path = path
+        self.max_dim = max_dim
+        self.signals = signals
+
+    def run(self):
+        reader = QImageReader(self.path)
+        reader.setAutoTransform(True)
+        size = reader.size()
+        if size.isValid() and max(size.width(), size.height()) > self.max_dim:
+            reader.setScaledSize(size.scaled(QSize(self.max_dim, self.max_dim), Qt.KeepAspectRatio))
+        image = reader.read()
+        if image.isNull():
+            self.signals.failed.emit(self.key, reader.errorString())
+        else:
+            self.signals.finished.emit(self.key, image)
+
+class ImagePreviewLoader(QObject):
+    """
+    后台解码 + LRU 缓存的图片预览加载器
+    request() 命中缓存时立即返回 QImage，否则返回 None，解码完成后发出 loaded(key, image)
+    """
+    loaded = Signal(str, QImage)
+    failed = Signal(str, str)
+
+    def __init__(self, max_dim=2048, cache_bytes=256 * 1024 * 1024, parent=None):
+        super().__init__(parent)
+        self.max_dim = max_dim
+        self.cache_bytes = cache_bytes
+        self._cache = OrderedDict()
+        self._cached_bytes = 0
+        self._pending = set()
+
+        self._signals = _DecodeSignals()
+        self._signals.finished.connect(self._on_finished)
+        self._signals.failed.connect(self._on_failed)
+
+    def request(self, path):
+        key = preview_key(path)
+        image = self._cache.get(key)
+        if image is not None:
+            self._cache.move_to_end(key)
+            return key, image
+
+        if key not in self._pending:
+            self._pending.add(key)
+            QThreadPool.globalInstance().start(_DecodeTask(key, path, self.max_dim, self._signals))
+        return key, None
+
+    def _on_finished(self, key, image):
+        self._pending.discard(key)
+        self._cache[key] = image
+        self._cached_bytes += image.sizeInBytes()
+        while self._cached_bytes > self.cache_bytes and len(self._cache) > 1:
+            _, old = self._cache.popitem(last=False)
+            self._cached_bytes -= old.sizeInBytes()
+        self.loaded.emit(key, image)
+
+    def _on_failed(self, key, error):
+        self._pending.discard(key)
+        self.failed.emit(key, error)
+
+class ImageView(QScrollArea):
+    """显示 ImagePreviewLoader 结果的图片视图，宽度超出时按窗口宽度缩放"""
+    def __init__(self, loader, path, parent=None):
+        super().__init__(parent)
+        self.setWidgetResizable(True)
+        self.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.label = QLabel("加载中...")
+        self.label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.label.setStyleSheet("color: gray;")
+        self.setWidget(self.label)
+        self._image = None
+
+        loader.loaded.connect(self.on_loaded)
+        loader.failed.connect(self.on_failed)
+        self.key, image = loader.request(path)
+        if image is not None:
+            self.set_image(image)
+
+    def on_loaded(self, key, image):
+        if key == self.key and self._image is None:
+            self.set_image(image)
+
+    def on_failed(self, key, error):
+        if key == self.key:
+            self.label.setText(f"无法解码图片: {error}")
+
+    def set_image(self, image):
+        self._image = image
+        self.label.setStyleSheet("")
+        self._update_pixmap()
+
+    def _update_pixmap(self):
+        if self._image is None:
+            return
+        width = self.viewport().width() - 2
+        image = self._image
+        if width > 0 and image.width() > width:
+            image = image.scaledToWidth(width, Qt.SmoothTransformation)
+        self.label.setPixmap(QPixmap.fromImage(image))
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._update_pixmap()
+
+THUMB_DIR = Path("data") / "cache" / "thumbnails"
+THUMB_LEVELS = (256, 512, 1024)
+
+def file_digest(path, chunk_size=1024 * 1024):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            h.update(chunk)
+    return h.hexdigest()
+
+class _ThumbnailSignals(QObject):
+    finished = Signal(str, object)
+    failed = Signal(str, str)
+
+class _ThumbnailTask(QRunnable):
+    """
+    计算文件内容哈希，缺少的缩略图层级只解码一次 (按最大缺失层级缩小解码)，再逐级缩小保存
+    """
+    def __init__(self, request_id, path, cache_dir, levels, signals):
+        super().__init__()
+        self.request_id = request_id
+        self.path = path
+        self.cache_dir = cache_dir
+        self.levels = levels
+        self.signals = signals
+
+    def run(self):
+        try:
+            digest = file_digest(self.path)
+        except OSError as e:
+            self.signals.failed.emit(self.request_id, str(e))
+            return
+
+        paths = {dim: self.cache_dir / f"{digest}_{dim}.png" for dim in self.levels}
+        missing = sorted((dim for dim, p in paths.items() if not p.exists()), reverse=True)
+        if missing:
+            reader = QImageReader(str(self.path))
+            reader.setAutoTransform(True)
+            size = reader.size()
+            if size.isValid() and max(size.width(), size.height()) > missing[0]:
+                reader.setScaledSize(size.scaled(QSize(missing[0], missing[0]), Qt.KeepAspectRatio))
+            image = reader.read()
+            if image.isNull():
+                self.signals.failed.emit(self.request_id, reader.errorString())
+                return
+
+            # 数据目录只读、磁盘已满或文件被占用时也要发出 failed，否则占位图会一直留在文档中
+            try:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                for dim in missing:
+                    if max(image.width(), image.height()) > dim:
+                        image = image.scaled(dim, dim, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+                    # 同一图片可能同时被多个请求生成，各自写入不同的临时文件再替换
+                    tmp = paths[dim].with_suffix(f".{uuid.uuid4().hex}.tmp.png")
+                    if not image.save(str(tmp)):
+                        self.signals.failed.emit(self.request_id, f"无法写入缩略图缓存 {tmp}")
+                        return
+                    os.replace(tmp, paths[dim])
+            except OSError as e:
+                self.signals.failed.emit(self.request_id, str(e))
+                return
+
+        self.signals.finished.emit(self.request_id, {dim: str(p) for dim, p in paths.items()})
+
+class _PruneTask(QRunnable):
+    def __init__(self, cache_dir, max_bytes):
+        super().__init__()
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+
+    def run(self):
+        if not self.cache_dir.exists():
+            return
+        files = [(p.stat(), p) for p in self.cache_dir.glob("*.png")]
+        total = sum(st.st_size for st, _ in files)
+        for st, p in sorted(files, key=lambda item: item[0].st_atime):
+            if total <= self.max_bytes:
+                break
+            try:
+                p.unlink()
+                total -= st.st_size
+            except OSError:
+                pass
+
+class ThumbnailCache(QObject):
+    """
+    磁盘缩略图缓存：每张图片按内容哈希生成多个分辨率 (THUMB_LEVELS)，全部在线程池中完成
+    request(path) 返回请求 ID，生成完成后发出 ready(request_id, {尺寸: 缩略图路径})
+    """
+    ready = Signal(str, object)
+    failed = Signal(str, str)
+
+    def __init__(self, cache_dir=THUMB_DIR, levels=THUMB_LEVELS, max_bytes=512 * 1024 * 1024, parent=None):
+        super().__init__(parent)
+        self.cache_dir = Path(cache_dir)
+        self.levels = tuple(levels)
+        self._next_id = 0
+
+        self._signals = _ThumbnailSignals()
+        self._signals.finished.connect(self.ready)
+        self._signals.failed.connect(self.failed)
+        QThreadPool.globalInstance().start(_PruneTask(self.cache_dir, max_bytes))
+
+    def request(self, path):
+        self._next_id += 1
+        request_id = str(self._next_id)
+        QThreadPool.globalInstance().start(
+            _ThumbnailTask(request_id, path, self.cache_dir, self.levels, self._signals)
+        )
+        return request_id
+
+    def pick_level(self, width):
+        """不超过显示宽度的最大层级，保证插入文档后无需再缩放"""
+        fitting = [dim for dim in self.levels if dim <= width]
+        return max(fitting) if fitting else min(self.levels)
@@ -0,0 +1,241 @@
+import mmap
+import re
+from array import array
+from bisect import bisect_right
+from PySide6.QtWidgets import (
+    QAbstractScrollArea, QWidget, QVBoxLayout, QHBoxLayout,
+    QLineEdit, QPushButton, QLabel
+)
+from PySide6.QtGui import QPainter, QFontDatabase, QColor
+from PySide6.QtCore import Qt, QTimer, Signal
+
+class LineIndex:
+    """
+    只读内存映射文件 + 行首偏移表
+    偏移表在后台按块增量构建 (build_step)，打开文件本身不需要扫描全文
+    """
+    CHUNK = 4 * 1024 * 1024
+    NEWLINE = re.compile(b"\n")
+
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        try:
+            self.data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # 空文件无法映射
+            self.data = b""
+        self.size = len(self.data)
+        self.offsets = array("Q", [0])
+        self._scanned = 0
+
+    @property
+    def scanned(self):
+        """已建立索引的字节数"""
+        return self._scanned
+
+    @property
+    def complete(self):
+        return self._scanned >= self.size
+
+    def build_step(self):
+        """扫描下一块，返回是否已扫描完全文"""
+        if self.complete:
+            return True
+        start = self._scanned
+        end = min(start + self.CHUNK, self.size)
+        self.offsets.extend(m.end() for m in self.NEWLINE.finditer(self.data, start, end))
+        self._scanned = end
+        if self.complete and self.offsets[-1] == self.size and self.size:
+            self.offsets.pop()  # 文件以换行结尾时不产生额外的空行
+        return self.complete
+
+    def line_count(self):
+        return len(self.offsets)
+
+    def line(self, n, max_chars=None):
+        """第 n 行的文本；指定 max_chars 时只解码行首部分 (UTF-8 每个字符最多 4 字节)，超长的行不会整行解码"""
+        start = self.offsets[n]
+        end = self.offsets[n + 1] if n + 1 < len(self.offsets) else (self.size if self.complete else self._scanned)
+        if max_chars is not None:
+            end = min(end, start + max_chars * 4)
+        return self.data[start:end].rstrip(b"\r\n").decode("utf-8", errors="replace")[:max_chars]
+
+    def line_of(self, offset):
+        return bisect_right(self.offsets, offset) - 1
+
+    def find(self, needle, start, backward=False):
+        if backward:
+            return self.data.rfind(needle, 0, start)
+        return self.data.find(needle, start)
+
+    def close(self):
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+        self._file.close()
+
+class LargeTextView(QAbstractScrollArea):
+    """只绘制可见行的只读文本视图"""
+    MAX_LINE_CHARS = 4000
+
+    def __init__(self, index, parent=None):
+        super().__init__(parent)
+        self.index = index
+        self.highlight_line = -1
+        self.setFont(QFontDatabase.systemFont(QFontDatabase.FixedFont))
+        self.setFocusPolicy(Qt.StrongFocus)
+        self.viewport().setStyleSheet("background: white;")
+        self._max_width = 0
+        self.update_scrollbars()
+
+    def line_height(self):
+        return self.fontMetrics().lineSpacing()
+
+    def visible_lines(self):
+        return max(1, self.viewport().height() // self.line_height())
+
+    def update_scrollbars(self):
+        bar = self.verticalScrollBar()
+        bar.setRange(0, max(0, self.index.line_count() - self.visible_lines()))
+        bar.setPageStep(self.visible_lines())
+        hbar = self.horizontalScrollBar()
+        hbar.setRange(0, max(0, self._max_width - self.viewport().width()))
+        hbar.setPageStep(self.viewport().width())
+
+    def scroll_to_line(self, n):
+        self.highlight_line = n
+        bar = self.verticalScrollBar()
+        top = bar.value()
+        if not (top <= n < top + self.visible_lines()):
+            bar.setValue(max(0, n - self.visible_lines() // 3))
+        self.viewport().update()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.update_scrollbars()
+
+    def paintEvent(self, event):
+        painter = QPainter(self.viewport())
+        metrics = self.fontMetrics()
+        line_h = self.line_height()
+        first = self.verticalScrollBar().value()
+        x = 4 - self.horizontalScrollBar().value()
+        last = min(self.index.line_count(), first + self.visible_lines() + 1)
+        width_changed = False
+
+        for row, n in enumerate(range(first, last)):
+            y = row * line_h
+            if n == self.highlight_line:
+                painter.fillRect(0, y, self.viewport().width(), line_h, QColor("#FFF3B0"))
+            text = self.index.line(n, self.MAX_LINE_CHARS).expandtabs(4)
+            painter.drawText(x, y + metrics.ascent(), text)
+            w = metrics.horizontalAdvance(text) + 8
+            if w > self._max_width:
+                self._max_width = w
+                width_changed = True
+
+        painter.end()
+        if width_changed:
+            self.update_scrollbars()
+
+class TextViewer(QWidget):
+    """
+    大文本查看器：内存映射 + 行偏移索引，只渲染可见区域，支持增量搜索
+    打开 100MB 的日志也不会把全文读入内存或塞进 QTextDocument
+    """
+    indexProgress = Signal(int)
+
+    def __init__(self, path, parent=None):
+        super().__init__(parent)
+        self.index = LineIndex(path)
+        # 作为标签页或停靠窗口时只会被 deleteLater()，不会收到 closeEvent；销毁时释放映射和文件句柄
+        self.destroyed.connect(self.index.close)
+        self.view = LargeTextView(self.index)
+        self._last_match = -1
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(2)
+
+        bar = QHBoxLayout()
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("搜索 (回车查找下一个)...")
+        self.search_input.textChanged.connect(self.on_search_changed)
+        self.search_input.returnPressed.connect(self.find_next)
+        prev_btn = QPushButton("↑")
+        prev_btn.setFixedWidth(30)
+        prev_btn.clicked.connect(self.find_prev)
+        next_btn = QPushButton("↓")
+        next_btn.setFixedWidth(30)
+        next_btn.clicked.connect(self.find_next)
+        self.status_lbl = QLabel()
+        self.status_lbl.setStyleSheet("color: gray;")
+        bar.addWidget(self.search_input)
+        bar.addWidget(prev_btn)
+        bar.addWidget(next_btn)
+        bar.addWidget(self.status_lbl)
+
+        layout.addLayout(bar)
+        layout.addWidget(self.view)
+
+        self._index_timer = QTimer(self)
+        self._index_timer.timeout.connect(self._build_index_step)
+        self._index_timer.start(0)
+        self._update_status()
+
+    def _build_index_step(self):
+        done = self.index.build_step()
+        self.view.update_scrollbars()
+        self.view.viewport().update()
+        self._update_status()
+        if done:
+            self._index_timer.stop()
+        if self.index.size:
+            self.indexProgress.emit(min(100, self.index.scanned * 100 // self.index.size))
+
+    def _update_status(self, extra=""):
+        lines = f"{self.index.line_count()} 行" + ("" if self.index.complete else " (索引中...)")
+        self.status_lbl.setText(f"{extra}  {lines}" if extra else lines)
+
+    def _needle(self):
+        return self.search_input.text().encode("utf-8")
+
+    def _search(self, start, backward=False):
+        needle = self._needle()
+        if not needle:
+            return
+        # 需要时同步补齐索引，保证命中位置能映射到行号
+        pos = self.index.find(needle, start, backward)
+        if pos < 0:
+            self._update_status("未找到")
+            return
+        while not self.index.complete and pos >= self.index.scanned:
+            self.index.build_step()
+        self._last_match = pos
+        self.view.update_scrollbars()
+        self.view.scroll_to_line(self.index.line_of(pos))
+        self._update_status(f"第 {self.index.line_of(pos) + 1} 行")
+
+    def _view_offset(self, line):
+        """第 line 行行首的偏移，超出已索引的行时为已扫描部分的末尾"""
+        if line < self.index.line_count():
+            return self.index.offsets[line]
+        return self.index.scanned
+
+    def on_search_changed(self, text):
+        # 增量搜索：从当前可见区域开始重新查找
+        top = self.view.verticalScrollBar().value()
+        self._search(self._view_offset(min(top, self.index.line_count() - 1)))
+
+    def find_next(self):
+        self._search(self._last_match + 1 if self._last_match >= 0 else 0)
+
+    def find_prev(self):
+        if self._last_match >= 0:
+            self._search(self._last_match, backward=True)
+        else:
+            # 还没有命中过：从可见区域的末尾向前查找
+            bottom = self.view.verticalScrollBar().value() + self.view.visible_lines()
+            self._search(self._view_offset(bottom), backward=True)
+
+    def closeEvent(self, event):
+        self._index_timer.stop()
+        super().closeEvent(event)
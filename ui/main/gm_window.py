@@ -1,33 +1,42 @@
-import subprocess
 import shlex
-import base64
 import html
 from pathlib import Path
 import datetime
 
 from PySide6.QtWidgets import (
     QMainWindow, QDockWidget, QTextEdit, QWidget, QVBoxLayout, 
-    QLabel, QPushButton, QHBoxLayout, QListWidget, QSpinBox, 
+    QLabel, QPushButton, QHBoxLayout, QTreeWidget, QSpinBox, 
     QTabWidget, QFileDialog, QMessageBox, QSplitter,
-    QDialog, QListWidgetItem,QMenu, QInputDialog
+    QDialog, QTreeWidgetItem,QMenu, QInputDialog, QProgressBar, QHeaderView
 )
-from PySide6.QtGui import QAction
-from PySide6.QtCore import Qt, QFileInfo,QSettings
+from PySide6.QtGui import QAction, QImage, QPainter, QColor, QTextDocument
+from PySide6.QtCore import Qt, QFileInfo,QSettings,Signal,QUrl
 from core.network.server import GMServer
-
-from ui.character.tabs.basic import BasicInfoTab
-from ui.character.tabs.balance import WorkLifeBalanceTab
-from ui.character.tabs.abilities import AbilitiesTab
-from ui.character.tabs.requisitions import RequisitionsTab
-from ui.character.tabs.relationships import RelationshipsTab
-from ui.character.tabs.custom_tracks import CustomTracksTab
+from core.network.telemetry import format_bytes, format_eta
+from core.storage import get_storage
+from core.process_supervisor import get_supervisor
+from core.network.relay import RelayServer, RelayHost, parse_address, RELAY_PORT, DEFAULT_ROOM
 from ui.common.styles import GLOBAL_STYLE_SHEET
+from ui.common.preview import ImagePreviewLoader, ImageView, ThumbnailCache
 
 class DragDropEditor(QTextEdit):
-    def __init__(self, parent=None):
+    # 超过此大小的文本文件不再内联，交给独立的大文本查看器
+    INLINE_TEXT_LIMIT = 256 * 1024
+    largeTextDropped = Signal(str)
+    imageActivated = Signal(str)
+    thumbnailFailed = Signal(str)       # 错误信息，由窗口写入日志
+
+    def __init__(self, thumbnails, parent=None):
         super().__init__(parent)
         self.setAcceptDrops(True)
         self.setPlaceholderText("主文档区域\n\n您可以直接将图片、文本文件拖入此处查看...")
+
+        # 文档中只插入缩略图 (thumb:<请求ID>)，原图通过点击打开
+        self.thumbnails = thumbnails
+        self.thumbnails.ready.connect(self.on_thumbnail_ready)
+        self.thumbnails.failed.connect(self.on_thumbnail_failed)
+        self._thumb_images = {}
+        self._thumb_requests = {}
         
     def canInsertFromMimeData(self, source):
         if source.hasUrls() or source.hasImage():
@@ -64,16 +73,21 @@ class DragDropEditor(QTextEdit):
         txt_exts = {'txt', 'md', 'json', 'py', 'log', 'ini', 'yaml'}
 
         if ext in img_exts:
+            request_id = self.thumbnails.request(path)
+            self._thumb_requests[request_id] = self.thumbnails.pick_level(self.viewport().width() - 30)
             html_img = f"""
             <div style='margin: 10px 0;'>
-                <img src='{path.as_uri()}' style='max-width: 100%; border-radius: 5px; box-shadow: 0 0 5px rgba(0,0,0,0.3);'>
-                <div style='color: gray; font-size: 0.8em; text-align: center;'>{filename}</div>
+                <a href='{path.as_uri()}'><img src='thumb:{request_id}'></a>
+                <div style='color: gray; font-size: 0.8em; text-align: center;'>{html.escape(filename)}</div>
             </div>
             <br>
             """
             self.insertHtml(html_img)
             self.append("")
 
+        elif ext in txt_exts and info.size() > self.INLINE_TEXT_LIMIT:
+            self.largeTextDropped.emit(str(path))
+
         elif ext in txt_exts:
             try:
                 content = path.read_text(encoding='utf-8', errors='replace')
@@ -94,9 +108,65 @@ class DragDropEditor(QTextEdit):
         else:
             self.append(f"无法识别的文件格式: {file_path}")
 
+    def on_thumbnail_ready(self, request_id, levels):
+        level = self._thumb_requests.pop(request_id, None)
+        if level is None:
+            return
+        image = QImage(levels[level])
+        if image.isNull():
+            return
+        self._set_thumb(request_id, image)
+
+    def on_thumbnail_failed(self, request_id, error):
+        if self._thumb_requests.pop(request_id, None) is None:
+            return
+        image = QImage(160, 40, QImage.Format_RGB32)
+        image.fill(QColor("#EEEEEE"))
+        painter = QPainter(image)
+        painter.drawText(image.rect(), Qt.AlignCenter, "无法生成预览")
+        painter.end()
+        self._set_thumb(request_id, image)
+        self.thumbnailFailed.emit(error)
+
+    def _set_thumb(self, request_id, image):
+        url = QUrl(f"thumb:{request_id}")
+        self._thumb_images[url.toString()] = image
+        doc = self.document()
+        doc.addResource(QTextDocument.ImageResource, url, image)
+        # 资源替换后需要重新排版图片所在的块
+        doc.markContentsDirty(0, doc.characterCount())
+
+    def loadResource(self, type, name):
+        if name.scheme() == "thumb":
+            image = self._thumb_images.get(name.toString())
+            if image is None:
+                # 仍在后台生成，先用占位图
+                image = QImage(1, 1, QImage.Format_ARGB32)
+                image.fill(Qt.transparent)
+            return image
+        return super().loadResource(type, name)
+
+    def mouseReleaseEvent(self, event):
+        super().mouseReleaseEvent(event)
+        if event.button() != Qt.LeftButton or self.textCursor().hasSelection():
+            return
+        anchor = self.anchorAt(event.position().toPoint())
+        if anchor:
+            url = QUrl(anchor)
+            if url.isLocalFile():
+                self.imageActivated.emit(url.toLocalFile())
+
 class CharacterViewerDialog(QDialog):
-    def __init__(self, char_name, char_data, parent=None):
+    def __init__(self, char_name, char_data, ruleset=None, parent=None):
         super().__init__(parent)
+        # 标签页与静态数据只在首次查看角色卡时加载
+        from ui.character.tabs.basic import BasicInfoTab
+        from ui.character.tabs.balance import WorkLifeBalanceTab
+        from ui.character.tabs.abilities import AbilitiesTab
+        from ui.character.tabs.requisitions import RequisitionsTab
+        from ui.character.tabs.relationships import RelationshipsTab
+        from ui.character.tabs.custom_tracks import CustomTracksTab
+
         self.setWindowTitle(f"角色卡查看: {char_name}")
         self.resize(1000, 700)
         
@@ -104,52 +174,76 @@ class CharacterViewerDialog(QDialog):
         self.setStyleSheet(GLOBAL_STYLE_SHEET)
         self.tabs = QTabWidget()
 
-        self.tabs.addTab(BasicInfoTab(char_data, self), "基本信息")
-        self.tabs.addTab(WorkLifeBalanceTab(char_data, self), "平衡")
-        self.tabs.addTab(AbilitiesTab(char_data, self), "能力")
-        self.tabs.addTab(RequisitionsTab(char_data, self), "补给")
+        self.tabs.addTab(BasicInfoTab(char_data, self, ruleset), "基本信息")
+        self.tabs.addTab(WorkLifeBalanceTab(char_data, self, ruleset), "平衡")
+        self.tabs.addTab(AbilitiesTab(char_data, self, ruleset), "能力")
+        self.tabs.addTab(RequisitionsTab(char_data, self, ruleset), "补给")
         self.tabs.addTab(RelationshipsTab(char_data, self), "关系")
         self.tabs.addTab(CustomTracksTab(char_data, self), "自定义")
         
         layout.addWidget(self.tabs)
 
 class GMMainWindow(QMainWindow):
+    # 本程序中打开的所有桌 (多桌时每个游戏一个窗口)
+    tables = []
+    # 同一端口上的各桌共用一个端口转发进程和一个中继连接 (PL 按 HELLO 中的房间进入各桌)，
+    # 端口上最后一桌停止服务器 (ServerHub 关闭) 时才结束；端口 -> RelayHost
+    relay_hosts = {}
+    # 本机中继每个程序只运行一个，由所有桌共用
+    local_relay = None
+
     def __init__(self, game_name):
         super().__init__()
         self.game_name = game_name
+        GMMainWindow.tables.append(self)
         self.setWindowTitle(f"TA Assistant - GM Control - {game_name}")
         self.resize(1400, 900)
         
-        self.server = GMServer()
+        self.storage = get_storage()
+        # 本次会话的日志 (超出内存部分写入磁盘)，供中途加入的 PL 补发
+        # 以游戏名为房间：同一程序中打开的多桌可以共用一个端口
+        self.server = GMServer(
+            journal_path=self.storage.game_dir("GM", game_name) / "session_log.jsonl", room=game_name
+        )
 
-        # key: uid (str) -> value: {"name": str, "sheet": dict, "item": QListWidgetItem}
+        # 各桌可以使用不同的规则包，查看角色卡时按本桌的规则包显示
+        from models.game_data import default_ruleset
+        self.ruleset = self.storage.get_setting("GM", game_name, "ruleset", default_ruleset())
+
+        # key: uid (str) -> value: {"name": str, "sheet": dict, "item": QTreeWidgetItem}
         self.players_data = {} 
         self.doc_window_count = 0
 
-        self.pf_process = None
-
         self._init_menu()
         self._init_ui()
+        self.restore_history()
+        if self.run_relay_action.isChecked():
+            self.start_local_relay()
         self.setup_server_signals()
 
-        self.net_update=True
+        self.net_update=False
 
     def setup_server_signals(self):
         self.server.log_received.connect(self.append_log)
-        self.server.chaos_received.connect(self.sync_chaos)
+        self.server.chaos_changed.connect(self.sync_chaos)
 
         self.server.player_connected.connect(self.on_player_connected)
+        self.server.player_hello.connect(self.on_player_hello)
         self.server.player_disconnected.connect(self.on_player_disconnected)
         self.server.sheet_received.connect(self.update_pl_sheet)
+        self.server.file_delivered.connect(self.on_file_delivered)
+        self.server.file_progress.connect(self.on_file_progress)
+        self.server.player_rtt.connect(self.on_player_rtt)
+        self.server.player_timed_out.connect(self.on_player_timed_out)
 
     def on_player_connected(self, uid, ip):
         self.log_system(f"新连接: {ip} (ID: {uid})")
 
         item_text = f"⏳ 连接中... ({ip})"
-        item = QListWidgetItem(item_text)
-        item.setData(Qt.UserRole, uid) 
+        item = QTreeWidgetItem([item_text, "-"])
+        item.setData(0, Qt.UserRole, uid) 
         
-        self.pl_list.addItem(item)
+        self.pl_list.addTopLevelItem(item)
 
         self.players_data[uid] = {
             "name": "Unknown",
@@ -157,19 +251,48 @@ class GMMainWindow(QMainWindow):
             "item": item
         }
 
+    def on_player_hello(self, uid, info):
+        name = info["identity"].get("name") or uid
+        features = "、".join(info["features"]) or "无"
+        record = self.players_data.get(uid)
+        if record and record.get("name", "Unknown") == "Unknown":
+            # 角色卡到达之前先用握手中的名字
+            record["item"].setText(0, f"⏳ {name}")
+        if info.get("resumed"):
+            self.log_system(f"{name} 已重新连接 (恢复会话)")
+        else:
+            self.log_system(f"{name} 完成握手 (协议 v{info['version']}，启用功能: {features})")
+
+    def on_player_rtt(self, uid, rtt):
+        record = self.players_data.get(uid)
+        if record:
+            item = record["item"]
+            item.setText(1, f"{rtt:.0f} ms")
+            # 隧道延迟过高时标红，否则恢复默认颜色 (跟随主题)
+            if rtt > 500:
+                item.setForeground(1, Qt.red)
+            else:
+                item.setData(1, Qt.ForegroundRole, None)
+
+    def on_player_timed_out(self, uid):
+        name = self.players_data.get(uid, {}).get("name", uid)
+        self.log_system(f"⚠️ {name} 心跳超时，已断开")
+
     def on_player_disconnected(self, uid):
-        self.log_system(f"❌ 玩家断开: {self.players_data[uid]['name']} ({uid})")
-        
-        if uid in self.players_data:
-            row = self.pl_list.row(self.players_data[uid]['item'])
-            if row != -1:
-                self.pl_list.takeItem(row)
+        record = self.players_data.pop(uid, None)
+        if record is None:
+            return
+        self.log_system(f"❌ 玩家断开: {record.get('name', 'Unknown')} ({uid})")
+
+        index = self.pl_list.indexOfTopLevelItem(record['item'])
+        if index != -1:
+            self.pl_list.takeTopLevelItem(index)
 
     def update_pl_sheet(self, uid, name, sheet_data):
         if uid not in self.players_data:
-            item = QListWidgetItem()
-            item.setData(Qt.UserRole, uid)
-            self.pl_list.addItem(item)
+            item = QTreeWidgetItem(["", "-"])
+            item.setData(0, Qt.UserRole, uid)
+            self.pl_list.addTopLevelItem(item)
             self.players_data[uid] = {"item": item}
 
         player_record = self.players_data[uid]
@@ -179,7 +302,7 @@ class GMMainWindow(QMainWindow):
         player_record["name"] = name
         player_record["sheet"] = sheet_data
 
-        item.setText(name)
+        item.setText(0, name)
 
         if old_name == "Unknown":
             self.log_system(f"接收到新角色卡: {name}")
@@ -188,15 +311,15 @@ class GMMainWindow(QMainWindow):
         else:
             self.log_system(f"{name} 更新了角色卡数据")
 
-    def on_pl_double_clicked(self, item):
-        uid = item.data(Qt.UserRole)
+    def on_pl_double_clicked(self, item, column=0):
+        uid = item.data(0, Qt.UserRole)
         
         if uid in self.players_data:
             p_data = self.players_data[uid]
             name = p_data["name"]
             sheet = p_data["sheet"]
             if sheet:
-                viewer = CharacterViewerDialog(name, sheet, self)
+                viewer = CharacterViewerDialog(name, sheet, self.ruleset, self)
                 viewer.show()
             else:
                 self.log_system("该玩家尚未发送角色卡数据。")
@@ -210,6 +333,11 @@ class GMMainWindow(QMainWindow):
         open_action.triggered.connect(self.manual_open_file)
         file_menu.addAction(open_action)
 
+        table_action = QAction("打开另一桌...", self)
+        table_action.setStatusTip("在同一程序中主持另一个游戏，可与本桌使用同一端口")
+        table_action.triggered.connect(self.open_another_table)
+        file_menu.addAction(table_action)
+
         view_menu = menubar.addMenu("视图")
         new_doc_action = QAction("新建文档窗口", self)
         new_doc_action.setShortcut("Ctrl+N")
@@ -222,9 +350,25 @@ class GMMainWindow(QMainWindow):
         pf_action.triggered.connect(self.set_port_forwarding_cmd)
         config_menu.addAction(pf_action)
 
+        relay_action = QAction("设置内置中继...", self)
+        relay_action.setStatusTip("服务器启动时连接到中继，PL 通过同一个中继加入")
+        relay_action.triggered.connect(self.set_relay)
+        config_menu.addAction(relay_action)
+
+        self.run_relay_action = QAction("在本机运行中继", self)
+        self.run_relay_action.setCheckable(True)
+        self.run_relay_action.setChecked(QSettings("TA_Assistant", "GM_Config").value("run_relay", "false") == "true")
+        self.run_relay_action.toggled.connect(self.toggle_local_relay)
+        config_menu.addAction(self.run_relay_action)
+
     def _init_ui(self):
         # 1. Main Doc
-        self.main_doc_viewer = DragDropEditor()
+        self.thumbnails = ThumbnailCache(parent=self)
+        self.preview_loader = ImagePreviewLoader(parent=self)
+        self.main_doc_viewer = DragDropEditor(self.thumbnails)
+        self.main_doc_viewer.largeTextDropped.connect(self.open_text_viewer)
+        self.main_doc_viewer.imageActivated.connect(self.open_image_viewer)
+        self.main_doc_viewer.thumbnailFailed.connect(self.on_thumbnail_failed)
         self.setCentralWidget(self.main_doc_viewer)
 
         # 2. Left Dock
@@ -255,7 +399,13 @@ class GMMainWindow(QMainWindow):
         top_layout.addLayout(h_layout)
         
         top_layout.addWidget(QLabel("在线玩家 (双击查看):"))
-        self.pl_list = QListWidget()
+        self.pl_list = QTreeWidget()
+        self.pl_list.setHeaderLabels(["玩家", "延迟", "传输"])
+        self.pl_list.setRootIsDecorated(False)
+        self.pl_list.header().setStretchLastSection(False)
+        self.pl_list.header().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.pl_list.header().setSectionResizeMode(1, QHeaderView.ResizeToContents)
+        self.pl_list.setColumnWidth(2, 120)
         self.pl_list.setContextMenuPolicy(Qt.CustomContextMenu)
         self.pl_list.customContextMenuRequested.connect(self.show_pl_context_menu)
         self.pl_list.itemDoubleClicked.connect(self.on_pl_double_clicked)
@@ -264,6 +414,10 @@ class GMMainWindow(QMainWindow):
         send_file_btn = QPushButton("向所有 PL 发送文件")
         send_file_btn.clicked.connect(self.send_file_to_all)
         top_layout.addWidget(send_file_btn)
+        self.session_lbl = QLabel()
+        self.session_lbl.setStyleSheet("color: gray;")
+        self.session_lbl.setWordWrap(True)
+        top_layout.addWidget(self.session_lbl)
         
         # Bottom: Notes
         bottom_widget = QWidget()
@@ -317,11 +471,40 @@ class GMMainWindow(QMainWindow):
         new_dock.setAttribute(Qt.WA_DeleteOnClose)
         new_dock.setAllowedAreas(Qt.AllDockWidgetAreas)
         
-        editor = DragDropEditor()
+        editor = DragDropEditor(self.thumbnails)
         editor.setPlaceholderText(f"{dock_title}")
+        editor.largeTextDropped.connect(self.open_text_viewer)
+        editor.imageActivated.connect(self.open_image_viewer)
+        editor.thumbnailFailed.connect(self.on_thumbnail_failed)
         new_dock.setWidget(editor)
         self.addDockWidget(Qt.RightDockWidgetArea, new_dock)
 
+    def on_thumbnail_failed(self, error):
+        self.append_log(f"<span style='color:red'>无法生成缩略图: {error}</span>")
+
+    def open_text_viewer(self, file_path):
+        from ui.common.text_viewer import TextViewer
+        try:
+            viewer = TextViewer(file_path)
+        except OSError as e:
+            self.append_log(f"<span style='color:red'>无法打开文件: {e}</span>")
+            return
+        dock = QDockWidget(f"📄 {Path(file_path).name}", self)
+        dock.setAttribute(Qt.WA_DeleteOnClose)
+        dock.setAllowedAreas(Qt.AllDockWidgetAreas)
+        dock.setWidget(viewer)
+        self.addDockWidget(Qt.RightDockWidgetArea, dock)
+
+    def open_image_viewer(self, file_path):
+        dialog = QDialog(self)
+        dialog.setAttribute(Qt.WA_DeleteOnClose)
+        dialog.setWindowTitle(Path(file_path).name)
+        dialog.resize(1000, 700)
+        layout = QVBoxLayout(dialog)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(ImageView(self.preview_loader, file_path))
+        dialog.show()
+
     def toggle_server(self):
         if self.btn_server.text() == "启动服务器":
             port = self.port_spin.value()
@@ -335,10 +518,11 @@ class GMMainWindow(QMainWindow):
                 self.port_spin.setEnabled(False)
 
                 self.start_port_forwarding()
+                self.start_relay_host()
             else:
                 QMessageBox.critical(self, "Error", msg)
         else:
-            self.stop_port_forwarding()
+            # 端口转发与中继连接在端口上的最后一桌停止时随 ServerHub 关闭
             self.server.stop()
             self.log_system("Server stopped.")
             self.btn_server.setText("启动服务器")
@@ -349,17 +533,32 @@ class GMMainWindow(QMainWindow):
         self.append_log(f"<span style='color:gray'>[SYSTEM] {msg}</span>")
     def append_log(self, html):
         self.log_widget.append(html)
+        self.storage.append_log("GM", self.game_name, html)
+
+    @classmethod
+    def log_tables(cls, msg, port=None, error=False):
+        """记录到所有桌 (指定 port 时只记录到使用该端口的桌)，用于多桌共用的端口转发与中继"""
+        for window in cls.tables:
+            if port is not None and window.port_spin.value() != port:
+                continue
+            if error:
+                window.append_log(f"<span style='color:red'>{msg}</span>")
+            else:
+                window.log_system(msg)
+
+    def restore_history(self):
+        for _, html in self.storage.query_logs("GM", self.game_name, limit=500):
+            self.log_widget.append(html)
+        self.gm_notes.setPlainText(self.storage.load_notes("GM", self.game_name))
 
     def sync_chaos(self, val):
-        self.net_update=True
+        # 服务器已应用 PL 的增量并推送给所有 PL，这里只更新显示
         self.chaos_spin.blockSignals(True)
-        self.chaos_spin.setValue(self.chaos_spin.value() + val)
+        self.chaos_spin.setValue(val)
         self.chaos_spin.blockSignals(False)
-        self.broadcast_chaos()
-        self.net_update=False
 
     def broadcast_chaos(self):
-        self.server.send_to_all("chaos", self.chaos_spin.value())
+        self.server.set_chaos(self.chaos_spin.value())
         if not self.net_update:
             log_msg = f"<span style='color: #FF5722;'>⚠️ GM 修改了混沌值 -> {self.chaos_spin.value()}</span>"
             self.append_log(log_msg) 
@@ -379,26 +578,63 @@ class GMMainWindow(QMainWindow):
                 reply = QMessageBox.question(self, "文件过大", "文件超过10MB，发送可能会导致卡顿。是否继续？", QMessageBox.Yes | QMessageBox.No)
                 if reply == QMessageBox.No: return
 
-            b64_str = base64.b64encode(content).decode('utf-8')
-            return path,b64_str
+            return path,content
         except Exception as e:
             QMessageBox.critical(self, "打开文件时发生错误", str(e))
 
     def send_file_to_all(self):
         try:
-            path,b64_str = self.prepare_sending_file("选择文件")
-            self.server.send_to_all("file", {"name": path.name, "content": b64_str})
+            path,content = self.prepare_sending_file("选择文件")
+            # 先发送哈希，已持有相同内容的 PL 不会再收到文件本体
+            self.server.offer_file(path.name, content)
             self.log_system(f"已发送文件: {path.name}")
         except Exception as e:
             QMessageBox.critical(self, "发送文件时发生错误", str(e))
     
     def send_file_private(self, target_uid, target_name):
         try:
-            path,b64_str = self.prepare_sending_file(f"选择文件发送给 {target_name}")
-            self.server.send_to(target_uid,"file",{"name": path.name, "content": b64_str})
+            path,content = self.prepare_sending_file(f"选择文件发送给 {target_name}")
+            self.server.offer_file(path.name, content, uid=target_uid)
             self.log_system(f"已向 {target_name} 发送文件: {path.name}")
         except Exception as e:
             QMessageBox.critical(self, "发送错误", str(e))
+
+    def on_file_delivered(self, uid, fname, cached):
+        name = self.players_data.get(uid, {}).get("name", uid)
+        if cached:
+            self.log_system(f"{name} 已有文件 {fname}，跳过传输")
+        else:
+            self.statusBar().showMessage(f"📤 {name} 已收到 {fname}", 5000)
+            self.update_transfer_bar(uid, fname)
+            self.session_lbl.setText(self.server.telemetry.summary())
+
+    def on_file_progress(self, uid, fname, done, total):
+        self.update_transfer_bar(uid, fname)
+
+    def update_transfer_bar(self, uid, fname):
+        """在玩家列表的传输列显示该玩家所有进行中传输的总进度"""
+        record = self.players_data.get(uid)
+        if not record:
+            return
+        peer = self.server.telemetry.peer(uid)
+        bar = record.get("progress")
+        if peer is None:
+            if bar is not None:
+                self.pl_list.removeItemWidget(record["item"], 2)
+                record["progress"] = None
+            return
+
+        if bar is None:
+            bar = QProgressBar()
+            bar.setRange(0, 100)
+            bar.setMaximumHeight(16)
+            self.pl_list.setItemWidget(record["item"], 2, bar)
+            record["progress"] = bar
+
+        done, total, rate, eta = peer
+        bar.setValue(done * 100 // max(total, 1))
+        bar.setFormat(f"%p%  {format_bytes(rate)}/s")
+        bar.setToolTip(f"{fname}: {format_bytes(done)} / {format_bytes(total)}，剩余 {format_eta(eta)}")
     
     def manual_open_file(self):
         path_str, _ = QFileDialog.getOpenFileName(
@@ -434,8 +670,8 @@ class GMMainWindow(QMainWindow):
         if not item:
             return
             
-        uid = item.data(Qt.UserRole)
-        name = item.text()
+        uid = item.data(0, Qt.UserRole)
+        name = item.text(0)
         
         menu = QMenu()
         send_action = menu.addAction(f"📤 发送文件给: {name}")
@@ -443,6 +679,21 @@ class GMMainWindow(QMainWindow):
         
         menu.exec(self.pl_list.mapToGlobal(pos))
 
+    def open_another_table(self):
+        from ui.startup.game_select import GameSelectDialog
+        dialog = GameSelectDialog("GM", self)
+        if not dialog.exec() or not dialog.selected_game:
+            return
+        game = dialog.selected_game
+        for window in GMMainWindow.tables:
+            if window.game_name == game:
+                window.raise_()
+                window.activateWindow()
+                return
+        window = GMMainWindow(game)
+        window.port_spin.setValue(self.port_spin.value())
+        window.show()
+
     def set_port_forwarding_cmd(self):
         settings = QSettings("TA_Assistant", "GM_Config")
         current_cmd = settings.value("pf_cmd", "")
@@ -477,28 +728,128 @@ class GMMainWindow(QMainWindow):
         
         try:
             args = shlex.split(cmd_str)
+        except ValueError as e:
+            self.append_log(f"<span style='color:red'>启动外部命令失败: {e}</span>")
+            return
+        if not args:
+            return
 
-            import platform
-            creation_flags = 0
-            if platform.system() == "Windows":
-                creation_flags = subprocess.CREATE_NEW_CONSOLE
+        # 多桌共用端口时只需要一个端口转发进程 (崩溃后由 ProcessSupervisor 自动重启)
+        name = f"port-forwarding:{port}"
+        if get_supervisor().get(name) is not None:
+            self.log_system("端口转发已由同一端口上的其他桌启动")
+            return
+        process = get_supervisor().spawn(name, args)
+        process.output.connect(lambda line: GMMainWindow.log_tables(f"[端口转发] {line}", port))
+        process.exited.connect(
+            lambda exit_code, restart_delay: GMMainWindow.on_port_forwarding_exited(port, exit_code, restart_delay)
+        )
+        process.failed.connect(lambda reason: GMMainWindow.log_tables(f"端口转发失败: {reason}", port, error=True))
+        self.server.hub.closed.connect(lambda: GMMainWindow.stop_port_forwarding(port))
+        process.start()
+        self.log_system(f"已启动外部命令: {cmd_str}")
+
+    @classmethod
+    def on_port_forwarding_exited(cls, port, exit_code, restart_delay):
+        if restart_delay >= 0:
+            cls.log_tables(
+                f"端口转发进程意外退出 (退出码 {exit_code})，{restart_delay:.1f} 秒后重启", port, error=True
+            )
+
+    @classmethod
+    def stop_port_forwarding(cls, port):
+        name = f"port-forwarding:{port}"
+        if get_supervisor().get(name) is not None:
+            cls.log_tables("正在关闭外部端口转发服务...", port)
+            get_supervisor().stop(name)
+    
+    def set_relay(self):
+        settings = QSettings("TA_Assistant", "GM_Config")
+        current = settings.value("relay", "")
+        info_text = (
+            "服务器启动时连接到该中继，PL 在连接窗口中选择 \"内置中继\" 并填写相同的地址与房间名。\n"
+            "格式: 地址:端口/房间名，留空表示不使用中继。\n\n"
+            "本机多开测试时可勾选 \"在本机运行中继\"，或单独运行:\n"
+            f"python -m core.network.relay --port {RELAY_PORT}"
+        )
+        text, ok = QInputDialog.getText(
+            self, "内置中继", info_text, text=current or f"localhost:{RELAY_PORT}/{DEFAULT_ROOM}"
+        )
+        if ok:
+            settings.setValue("relay", text.strip())
+            self.log_system(f"中继已设置为: {text.strip() or '不使用'}")
 
-            self.pf_process = subprocess.Popen(args, creationflags=creation_flags)
-            self.log_system(f"已启动外部命令: {cmd_str}")
-            
-        except Exception as e:
-            self.log_system(f"<span style='color:red'>启动外部命令失败: {e}</span>")
+    def toggle_local_relay(self, checked):
+        QSettings("TA_Assistant", "GM_Config").setValue("run_relay", "true" if checked else "false")
+        if checked:
+            self.start_local_relay()
+        else:
+            self.stop_local_relay()
+
+    @classmethod
+    def sync_relay_action(cls, checked):
+        """各桌的 "在本机运行中继" 菜单项显示同一个中继的状态 (不写入设置)"""
+        for window in cls.tables:
+            window.run_relay_action.blockSignals(True)
+            window.run_relay_action.setChecked(checked)
+            window.run_relay_action.blockSignals(False)
+
+    def start_local_relay(self):
+        if GMMainWindow.local_relay is not None:
+            return
+        relay = RelayServer()
+        relay.log.connect(lambda msg: GMMainWindow.log_tables(f"[中继] {msg}"))
+        ok, msg = relay.start()
+        if ok:
+            GMMainWindow.local_relay = relay
+            self.log_tables(msg)
+        else:
+            relay.deleteLater()
+            self.append_log(f"<span style='color:red'>中继启动失败: {msg}</span>")
+        self.sync_relay_action(ok)
+
+    def stop_local_relay(self):
+        relay = GMMainWindow.local_relay
+        if relay is not None:
+            GMMainWindow.local_relay = None
+            relay.stop()
+            relay.deleteLater()
+            self.log_tables("本机中继已关闭")
+        self.sync_relay_action(False)
+
+    def start_relay_host(self):
+        relay = QSettings("TA_Assistant", "GM_Config").value("relay", "")
+        if not relay:
+            return
+        port = self.port_spin.value()
+        if port in GMMainWindow.relay_hosts:
+            self.log_system("中继已由同一端口上的其他桌连接")
+            return
+        address, _, room = relay.partition("/")
+        try:
+            relay_addr, relay_port = parse_address(address)
+        except ValueError:
+            self.append_log(f"<span style='color:red'>中继地址格式错误: {relay}</span>")
+            return
+        relay_host = RelayHost(relay_addr, relay_port, room or DEFAULT_ROOM, port)
+        relay_host.log.connect(lambda msg: GMMainWindow.log_tables(f"[中继] {msg}", port))
+        GMMainWindow.relay_hosts[port] = relay_host
+        self.server.hub.closed.connect(lambda: GMMainWindow.stop_relay_host(port))
+        relay_host.start()
+
+    @classmethod
+    def stop_relay_host(cls, port):
+        relay_host = cls.relay_hosts.pop(port, None)
+        if relay_host is not None:
+            relay_host.stop()
+            relay_host.deleteLater()
 
-    def stop_port_forwarding(self):
-        if self.pf_process:
-            self.log_system("正在关闭外部端口转发服务...")
-            try:
-                self.pf_process.terminate()
-                self.pf_process = None
-            except Exception as e:
-                self.log_system(f"关闭外部进程出错: {e}")
-    
     def closeEvent(self, event):
-        self.stop_port_forwarding()
+        self.storage.save_notes("GM", self.game_name, self.gm_notes.toPlainText())
         self.server.stop()
+        if self in GMMainWindow.tables:
+            # 本机中继在最后一桌关闭时结束
+            if len(GMMainWindow.tables) == 1 and GMMainWindow.local_relay is not None:
+                self.stop_local_relay()
+            GMMainWindow.tables.remove(self)
         super().closeEvent(event)
\ No newline at end of file
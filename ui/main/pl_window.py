@@ -1,22 +1,23 @@
-import json
 import datetime
-import base64
-import subprocess
-import shlex
-import time
 from pathlib import Path
 from PySide6.QtWidgets import (
     QMainWindow, QDockWidget, QTextBrowser, QWidget, QVBoxLayout, 
-    QLabel, QPushButton, QHBoxLayout, QSpinBox, QTabWidget,
+    QLabel, QPushButton, QHBoxLayout, QSpinBox, QTabWidget, QTabBar,
     QMessageBox, QFileDialog, QTextEdit,QDialog, QFormLayout, 
-    QLineEdit, QDialogButtonBox, QGroupBox
+    QLineEdit, QDialogButtonBox, QGroupBox, QProgressBar
 )
 from PySide6.QtGui import QAction,QDesktopServices
-from PySide6.QtCore import Qt,QTimer,QUrl,QFileInfo,QFile,QIODevice,QSettings
+from PySide6.QtCore import Qt,QTimer,QUrl,QFileInfo,QSettings
 
-from ui.character.editor import CharacterEditor
-from ui.tools.dice_tool import DiceTool
 from core.network.client import PLClient
+from core.network.tunnel import TunnelManager
+from core.network.relay import join_line, parse_address, RELAY_PORT, DEFAULT_ROOM
+from models.character import CharacterModel
+from core.storage import get_storage
+from core.file_store import FileStore
+from core.network.protocol import MsgType
+from core.network.telemetry import format_bytes, format_eta
+from ui.common.preview import ImagePreviewLoader, ImageView
 
 class PLMainWindow(QMainWindow):
     def __init__(self, game_name):
@@ -25,40 +26,84 @@ class PLMainWindow(QMainWindow):
         self.setWindowTitle(f"TA Assistant - PL - {game_name}")
         self.resize(1200, 800)
 
-        self.game_dir = Path("data") / "PL" / self.game_name
-        self.char_file = self.game_dir / "character.json"
+        self.storage = get_storage()
+        self.game_dir = self.storage.game_dir("PL", self.game_name)
+        self.file_store = FileStore(self.game_dir / "files", self.game_dir / "downloads")
 
-        self.character_data = self.load_character()
+        from models.game_data import set_active_ruleset, default_ruleset
+        set_active_ruleset(self.storage.get_setting("PL", self.game_name, "ruleset", default_ruleset()))
+
+        self.character = CharacterModel(self.storage, self.game_name, self)
+        self.character.dataChanged.connect(self.save_character)
 
         self._init_menu()
 
+        self.preview_loader = ImagePreviewLoader(parent=self)
+
         self.doc_tabs = QTabWidget()
         self.doc_tabs.setTabsClosable(True)
         self.doc_tabs.tabCloseRequested.connect(self.close_doc_tab)
         self.home_page = QTextBrowser()
         self.home_page.setHtml("<div style='text-align:center; margin-top:50px; color:gray'><h3>等待接收文件...</h3></div>")
-        self.doc_tabs.addTab(self.home_page, "文件接收")
+
+        # 接收页：进行中的传输 (进度条) + 提示页 + 会话统计
+        receive_page = QWidget()
+        receive_layout = QVBoxLayout(receive_page)
+        receive_layout.setContentsMargins(5, 5, 5, 5)
+        self.transfer_layout = QVBoxLayout()
+        receive_layout.addLayout(self.transfer_layout)
+        receive_layout.addWidget(self.home_page)
+        self.session_lbl = QLabel()
+        self.session_lbl.setStyleSheet("color: gray;")
+        receive_layout.addWidget(self.session_lbl)
+        self.transfer_rows = {}
+        self.receive_page = receive_page
+        self.doc_tabs.addTab(receive_page, "文件接收")
+        # 接收页持有传输进度与会话统计，不能关闭
+        self.doc_tabs.tabBar().setTabButton(0, QTabBar.RightSide, None)
+        self.doc_tabs.tabBar().setTabButton(0, QTabBar.LeftSide, None)
         self.setCentralWidget(self.doc_tabs)
 
         self._init_docks()
 
         self.update_connection_ui(False)
+        self.restore_history()
 
         self.client = PLClient()
-        self.proxy_process = None
+        self.tunnel = TunnelManager(self)
+        # 断线期间 (或上次运行后) 角色卡可能有改动，恢复会话后需要重新推送
+        self._sheet_dirty = True
+        self._resuming = False
+        self._reconnected = False
+        # 沿用上次运行的会话，重新打开程序后 GM 只补发期间错过的日志
+        session = self.storage.get_setting("PL", self.game_name, "session") or {}
+        self.client.session_token = session.get("token")
+        self.client.last_seq = session.get("last_seq", 0)
         self.setup_network()
     
     def close_doc_tab(self, index):
-        if self.doc_tabs.count() > 0:
+        widget = self.doc_tabs.widget(index)
+        if widget is not None and widget is not self.receive_page:
             self.doc_tabs.removeTab(index)
+            widget.deleteLater()
     
     def setup_network(self):
         self.client.chaos_updated.connect(self.on_server_chaos_sync)
         self.client.log_updated.connect(self.append_log)
         self.client.file_received.connect(self.on_file_received)
+        self.client.file_offered.connect(self.on_file_offered)
+        self.client.file_chunk_received.connect(self.on_file_chunk)
+        self.client.file_unavailable.connect(self.on_file_unavailable)
+        self.client.transfer_progress.connect(self.on_transfer_progress)
         self.client.connected.connect(self.on_connected_success)
         self.client.disconnected.connect(self.on_disconnected)
         self.client.error_occurred.connect(self.on_connection_error)
+        self.client.session_started.connect(self.on_session_started)
+        self.client.reconnecting.connect(self.on_reconnecting)
+        self.tunnel.ready.connect(self.on_tunnel_ready)
+        self.tunnel.failed.connect(self.on_tunnel_failed)
+        self.tunnel.state_changed.connect(self.on_tunnel_state)
+        self.tunnel.output.connect(lambda line: self.append_log(f"<span style='color:gray'>[隧道] {line}</span>"))
     
     def update_connection_ui(self, is_connected):
         if is_connected:
@@ -75,12 +120,9 @@ class PLMainWindow(QMainWindow):
         self.chaos_spin.setValue(absolute_val)
         self.chaos_spin.blockSignals(False)
     
-    def save_file(self,fname,content):
-        download_dir = Path("data") / "PL" / self.game_name / "downloads"
-        download_dir.mkdir(parents=True, exist_ok=True)
-        file_path = download_dir / fname
-        with open(file_path, "wb") as f:
-            f.write(content)
+    def save_file(self, fname, content, digest=None):
+        file_path = self.file_store.put(fname, content, digest)
+        self.storage.record_file("PL", self.game_name, file_path.name, file_path, len(content))
         return file_path
     
     def render_file(self, uri):
@@ -95,57 +137,35 @@ class PLMainWindow(QMainWindow):
         fname = file_info.fileName()
         preview_successful=True
 
-        if ext == 'jpg':
-            ext = 'jpeg'
-
-        image_types = {'png', 'jpeg', 'gif', 'bmp', 'svg'}
+        image_types = {'png', 'jpg', 'jpeg', 'gif', 'bmp', 'svg', 'webp'}
         text_types = {'txt', 'md', 'json', 'log', 'csv', 'py', 'ini', 'xml', 'yaml', 'yml'}
 
-        file = QFile(file_path)
-        if not file.open(QIODevice.ReadOnly):
+        if not file_info.isFile() or not file_info.isReadable():
             self.append_log(f"<span style='color:red'>无法打开文件: {fname}</span>")
             return
 
-        raw = file.readAll()
-        file.close()
-
-        viewer = QTextBrowser()
-        viewer.setOpenLinks(False)
-        viewer.anchorClicked.connect(self.open_local_link)
-
         if ext in image_types:
-            b64 = base64.b64encode(bytes(raw)).decode('ascii')
-            html_content = f"""
-            <div style="text-align:center; margin-top:10px;">
-                <img src="data:image/{ext};base64,{b64}" style="max-width:100%;" />
-                <p style="color:gray;">{fname}</p>
-            </div>
-            """
+            # 图片在线程池中按窗口可用尺寸解码，结果按 路径+mtime 缓存
+            viewer = ImageView(self.preview_loader, file_path)
 
         elif ext in text_types:
+            # 内存映射 + 行索引，只渲染可见行，大日志也能立即打开
+            from ui.common.text_viewer import TextViewer
             try:
-                text_content = bytes(raw).decode('utf-8', errors='ignore')
-            except Exception:
-                text_content = str(raw)
-            import html
-            safe = html.escape(text_content)
-            html_content = f"""
-            <div style="line-height:1.4; padding:10px;">
-                <pre>{safe}</pre>
-            </div>
-            """
+                viewer = TextViewer(file_path)
+            except OSError:
+                self.append_log(f"<span style='color:red'>无法打开文件: {fname}</span>")
+                return
 
         else:
-            html_content = f"""
+            viewer = self._create_html_viewer(f"""
             <div style="padding:20px; text-align:center;">
                 <h3>无法预览此文件类型 ({ext})</h3>
                 <p>请点击日志中的URL，使用系统程序打开</p>
             </div>
-            """
+            """)
             preview_successful=False
 
-        viewer.setHtml(html_content)
-
         def add_tab():
             idx = self.doc_tabs.addTab(viewer, fname)
             self.doc_tabs.setCurrentIndex(idx)
@@ -154,19 +174,95 @@ class PLMainWindow(QMainWindow):
         QTimer.singleShot(0, add_tab)
         return preview_successful
 
-    def on_file_received(self, fname, b64_content):
+    def _create_html_viewer(self, html_content):
+        viewer = QTextBrowser()
+        viewer.setOpenLinks(False)
+        viewer.anchorClicked.connect(self.open_local_link)
+        viewer.setHtml(html_content)
+        return viewer
+
+    def on_file_offered(self, fname, digest, size):
+        if not self.file_store.has(digest) and size > 0:
+            offset = self.file_store.begin_partial(digest, fname, size)
+            self.client.request_file(digest, fname, size, offset)
+            return
+        if size == 0:
+            self.file_store.put(fname, b"")
+        # 相同内容已在本地，只需登记文件名
+        self.client.send(MsgType.FILE_HAVE, {"hash": digest})
+        try:
+            file_path = self.file_store.link(fname, digest)
+            self.storage.record_file("PL", self.game_name, file_path.name, file_path, size)
+            self.show_received_file(file_path, "(本地已有)")
+        except Exception as e:
+            self.append_log(f"<span style='color:red'>文件处理失败: {e}</span>")
+
+    def on_file_chunk(self, digest, offset, data):
         try:
-            data_bytes = base64.b64decode(b64_content)
+            received = self.file_store.write_partial(digest, offset, data)
+            self.client.send(MsgType.FILE_ACK, {"hash": digest, "offset": received})
+            size = self.file_store.partial_size(digest)
+            if size is not None and received >= size:
+                file_path = self.file_store.finish_partial(digest)
+                self.storage.record_file("PL", self.game_name, file_path.name, file_path, received)
+                self.show_received_file(file_path, "(已保存)")
+        except Exception as e:
+            self.append_log(f"<span style='color:red'>文件处理失败: {e}</span>")
 
-            file_path = self.save_file(fname, data_bytes)
-            file_uri = file_path.absolute().as_uri()
+    def on_file_unavailable(self, digest):
+        name = self.file_store.discard_partial(digest)
+        if name:
+            self.append_log(f"<span style='color:gray'>GM 已不再保留 {name}，已放弃接收，需要时请 GM 重新发送</span>")
+
+    def on_transfer_progress(self, digest):
+        stat = self.client.telemetry.transfers.get(("GM", digest))
+        row = self.transfer_rows.get(digest)
+        if stat is None:
+            # 传输已完成
+            if row:
+                row[0].deleteLater()
+                del self.transfer_rows[digest]
+            self.session_lbl.setText(self.client.telemetry.summary())
+            return
+
+        if row is None:
+            widget = QWidget()
+            layout = QVBoxLayout(widget)
+            layout.setContentsMargins(0, 0, 0, 0)
+            label = QLabel()
+            bar = QProgressBar()
+            bar.setRange(0, 100)
+            layout.addWidget(label)
+            layout.addWidget(bar)
+            self.transfer_layout.addWidget(widget)
+            row = self.transfer_rows[digest] = (widget, label, bar)
+
+        _, label, bar = row
+        label.setText(
+            f"📥 {stat.name}  {format_bytes(stat.done)} / {format_bytes(stat.total)}  "
+            f"{format_bytes(stat.rate)}/s  剩余 {format_eta(stat.eta())}"
+        )
+        bar.setValue(stat.percent())
+
+    def resume_transfers(self):
+        """重连后报告未完成传输的进度，GM 从已确认的位置继续发送"""
+        for digest, fname, size, offset in self.file_store.partials():
+            self.client.request_file(digest, fname, size, offset)
+            self.append_log(f"<span style='color:gray'>继续接收 {fname} ({offset}/{size} 字节)</span>")
 
-            self.append_log(f"📥 收到文件: <a href='{file_uri}'>{fname}</a> (已保存)")
-            self.render_file(file_uri)
+    def on_file_received(self, fname, content, digest=""):
+        try:
+            file_path = self.save_file(fname, content, digest or None)
+            self.show_received_file(file_path, "(已保存)")
 
         except Exception as e:
             self.append_log(f"<span style='color:red'>文件处理失败: {e}</span>")
 
+    def show_received_file(self, file_path, note):
+        file_uri = file_path.absolute().as_uri()
+        self.append_log(f"📥 收到文件: <a href='{file_uri}'>{file_path.name}</a> {note}")
+        self.render_file(file_uri)
+
     def _init_menu(self):
         menubar = self.menuBar()
 
@@ -199,6 +295,9 @@ class PLMainWindow(QMainWindow):
         last_port = settings.value("last_port", 12345)
         use_gs = settings.value("use_gs", "false") == "true"
         gs_cmd_template = settings.value("gs_cmd", "gs-netcat -s TriangleAgency -p {port}")
+        use_relay = settings.value("use_relay", "false") == "true"
+        relay_addr = settings.value("relay_addr", f"localhost:{RELAY_PORT}")
+        relay_room = settings.value("relay_room", DEFAULT_ROOM)
 
         dialog = QDialog(self)
         dialog.setWindowTitle("连接服务器")
@@ -214,8 +313,12 @@ class PLMainWindow(QMainWindow):
         port_input.setRange(1024, 65535)
         port_input.setValue(int(last_port))
         
+        room_input = QLineEdit(settings.value("last_room", ""))
+        room_input.setPlaceholderText("GM 同时主持多桌时填写其游戏名")
+
         form_layout.addRow("服务器 IP:", ip_input)
         form_layout.addRow("端口号:", port_input)
+        form_layout.addRow("房间 (可选):", room_input)
         layout.addLayout(form_layout)
 
         gs_group = QGroupBox("高级 / 内网穿透")
@@ -234,6 +337,24 @@ class PLMainWindow(QMainWindow):
         
         layout.addWidget(gs_group)
 
+        relay_group = QGroupBox("内置中继")
+        relay_group.setCheckable(True)
+        relay_group.setChecked(use_relay and not use_gs)
+        relay_layout = QFormLayout(relay_group)
+        relay_input = QLineEdit(relay_addr)
+        relay_input.setPlaceholderText("中继地址:端口")
+        relay_room_input = QLineEdit(relay_room)
+        relay_layout.addRow("中继地址:", relay_input)
+        relay_layout.addRow("中继房间:", relay_room_input)
+        relay_hint = QLabel("GM 与 PL 都连接到同一个中继，无需外部工具\n(上方 IP 与端口将被忽略)")
+        relay_hint.setStyleSheet("color: gray; font-size: 0.9em;")
+        relay_layout.addRow(relay_hint)
+        layout.addWidget(relay_group)
+
+        # 两种方式只能选一种
+        gs_group.toggled.connect(lambda on: on and relay_group.setChecked(False))
+        relay_group.toggled.connect(lambda on: on and gs_group.setChecked(False))
+
         buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
         buttons.accepted.connect(dialog.accept)
         buttons.rejected.connect(dialog.reject)
@@ -243,58 +364,105 @@ class PLMainWindow(QMainWindow):
             ip = ip_input.text().strip()
             port = port_input.value()
             is_gs_mode = gs_group.isChecked()
+            is_relay_mode = relay_group.isChecked()
             cmd_str = cmd_input.text().strip()
             
             settings.setValue("last_ip", ip)
             settings.setValue("last_port", port)
             settings.setValue("use_gs", "true" if is_gs_mode else "false")
             settings.setValue("gs_cmd", cmd_str)
+            settings.setValue("use_relay", "true" if is_relay_mode else "false")
+            settings.setValue("relay_addr", relay_input.text().strip())
+            settings.setValue("relay_room", relay_room_input.text().strip())
+            settings.setValue("last_room", room_input.text().strip())
 
             self.stop_proxy()
             self.client.disconnect_from_host()
 
+            self.client.preamble = b""
+            self.client.room = room_input.text().strip() or None
             if is_gs_mode:
                 self.start_proxy_connection(cmd_str, port)
+            elif is_relay_mode:
+                self.start_relay_connection(relay_input.text(), relay_room_input.text().strip() or DEFAULT_ROOM)
             else:
                 if not ip:
                     QMessageBox.warning(self, "错误", "IP 地址不能为空")
                     return
                 self.append_log(f"正在尝试直连 {ip}:{port}...")
+                self.client.identity = self.client_identity()
                 self.client.connect_to_host(ip, port)
 
     def start_proxy_connection(self, cmd_template, port):
         final_cmd = cmd_template.replace("{port}", str(port))
-        
         self.append_log(f"正在启动代理命令: <code>{final_cmd}</code>")
-        
+        self.append_log("正在等待隧道就绪...")
+        self.tunnel.start(final_cmd, port)
+
+    def start_relay_connection(self, address, room):
         try:
-            import platform
-            creation_flags = 0
-            if platform.system() == "Windows":
-                creation_flags = subprocess.CREATE_NO_WINDOW
-            
-            args = shlex.split(final_cmd)
-            self.pf_process = subprocess.Popen(args, creationflags=creation_flags)
+            host, port = parse_address(address)
+        except ValueError:
+            QMessageBox.warning(self, "错误", f"中继地址格式错误: {address}")
+            return
+        self.append_log(f"正在通过中继 {host}:{port} 加入房间 {room}...")
+        self.client.preamble = join_line(room)
+        self.client.identity = self.client_identity()
+        self.client.connect_to_host(host, port)
 
-            self.append_log("正在等待 gsocket 建立隧道 (约 2 秒)...")
-            from PySide6.QtWidgets import QApplication
-            
-            t_end = time.time() + 2
-            while time.time() < t_end:
-                QApplication.processEvents()
-                time.sleep(0.1)
+    def on_tunnel_ready(self, port):
+        self.append_log(f"正在通过隧道连接 localhost:{port}...")
+        self.client.identity = self.client_identity()
+        self.client.connect_to_host("127.0.0.1", port)
+
+    def on_tunnel_failed(self, reason):
+        self.update_connection_ui(False)
+        self.append_log(f"<span style='color:red'>代理启动失败: {reason}</span>")
+
+    def on_tunnel_state(self, state):
+        if state == TunnelManager.STARTING:
+            self.conn_status_lbl.setText("🟡 正在建立隧道")
+            self.conn_status_lbl.setStyleSheet("color: #FFB300; font-weight: bold;")
+            self.disconnect_btn.setEnabled(True)
+        elif state == TunnelManager.RESTARTING:
+            self.conn_status_lbl.setText("🟡 隧道重启中")
+            self.conn_status_lbl.setStyleSheet("color: #FFB300; font-weight: bold;")
 
-            self.append_log(f"正在通过隧道连接 localhost:{port}...")
-            self.client.connect_to_host("127.0.0.1", port)
-            
-        except Exception as e:
-            self.append_log(f"<span style='color:red'>代理启动失败: {e}</span>")
-            self.stop_proxy()
-    
     def on_connected_success(self):
         self.update_connection_ui(True)
-        self.append_log("<b>✅ 已成功连接到 GM 服务器！</b>")
-        self.push_character_sheet()
+        if self._reconnected:
+            self.append_log("<b>✅ 已重新连接到 GM 服务器</b>")
+        else:
+            self.append_log("<b>✅ 已成功连接到 GM 服务器！</b>")
+        self._reconnected = False
+        # 角色卡没有改动时等 GM 确认会话是否恢复，恢复了就不必重新推送
+        self._resuming = self.client.session_token is not None and not self._sheet_dirty
+        if not self._resuming:
+            self.push_character_sheet()
+        self.resume_transfers()
+
+    def on_session_started(self, resumed):
+        self.save_session()
+        if not self._resuming:
+            return
+        self._resuming = False
+        if resumed:
+            self.append_log("<span style='color:gray'>已恢复会话，补发断线期间的日志</span>")
+        else:
+            # GM 已重启，会话无法恢复
+            self.push_character_sheet()
+
+    def save_session(self):
+        self.storage.set_setting("PL", self.game_name, "session", {
+            "token": self.client.session_token, "last_seq": self.client.last_seq
+        })
+
+    def on_reconnecting(self, attempt, delay):
+        self._reconnected = True
+        self.conn_status_lbl.setText(f"🟡 重连中 (第 {attempt} 次)")
+        self.conn_status_lbl.setStyleSheet("color: #FFB300; font-weight: bold;")
+        self.disconnect_btn.setEnabled(True)
+        self.append_log(f"<span style='color:gray'>将在 {delay:.1f} 秒后尝试重新连接...</span>")
     
     def on_disconnected(self):
         self.update_connection_ui(False)
@@ -304,9 +472,12 @@ class PLMainWindow(QMainWindow):
         self.update_connection_ui(False)
         self.append_log(f"<span style='color:red'>❌ 连接错误: {error_msg}</span>")
 
+    def client_identity(self):
+        return {"name": self.character.get("name", "Unknown PL"), "game": self.game_name}
+
     def push_character_sheet(self):
-        name = self.character_data.get("name", "Unknown PL")
-        self.client.send("sheet", {"name": name, "sheet": self.character_data})
+        name = self.character.get("name", "Unknown PL")
+        self._sheet_dirty = not self.client.send("sheet", {"name": name, "sheet": self.character.data})
 
     def _init_docks(self):
         # 1. Log Dock
@@ -392,7 +563,7 @@ class PLMainWindow(QMainWindow):
         timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M")
         default_name = f"{self.game_name}_{suffix}_{timestamp}.{ext}"
 
-        save_dir = Path("data") / "PL" / self.game_name / "exported"
+        save_dir = self.game_dir / "exported"
         save_dir.mkdir(parents=True, exist_ok=True)
         
         file_path, _ = QFileDialog.getSaveFileName(
@@ -409,28 +580,25 @@ class PLMainWindow(QMainWindow):
                 QMessageBox.critical(self, "错误", str(e))
 
     def handle_dice_chaos(self, growth_value):
-        current = self.chaos_spin.value()
-        self.chaos_spin.setValue(current + growth_value)
-        self.client.send("chaos", growth_value)
+        # 显示值由 client 计算 (GM 的值 + 尚未确认的增量)，经 chaos_updated 更新
+        self.client.add_chaos(growth_value)
 
     def handle_dice_log(self, html_content):
-        name = self.character_data.get("name", "Unknown PL")
+        name = self.character.get("name", "Unknown PL")
         full_log = f"<div style='border-left: 4px solid #0055AA; padding-left: 5px; margin: 5px 0;'><b>{name}</b> 进行了掷骰:<br>{html_content}</div>"
         self.append_log(full_log)
         self.client.send("log", full_log)
 
     def open_character_editor(self):
-        editor = CharacterEditor(self.game_name)
+        from ui.character.editor import CharacterEditor
+        editor = CharacterEditor(self.game_name, self.character, self)
         if editor.exec():
-            self.character_data = self.load_character()
-            self.push_character_sheet()
             self.append_log("<i>角色卡已更新并同步。</i>")
 
     def open_dice_tool(self):
-        self.character_data = self.load_character()
-        
-        dialog = DiceTool(self.game_name, self.character_data, self)
-        dialog.dataChanged.connect(self.save_character)
+        from ui.tools.dice_tool import DiceTool
+        dialog = DiceTool(self.game_name, self.character, self)
+        dialog.setAttribute(Qt.WA_DeleteOnClose)
 
         dialog.log_signal.connect(self.handle_dice_log)
         
@@ -440,6 +608,12 @@ class PLMainWindow(QMainWindow):
     def append_log(self, html_content):
         if hasattr(self, 'log_widget'):
             self.log_widget.append(html_content)
+            self.storage.append_log("PL", self.game_name, html_content)
+
+    def restore_history(self):
+        for _, html_content in self.storage.query_logs("PL", self.game_name, limit=500):
+            self.log_widget.append(html_content)
+        self.notes_widget.setPlainText(self.storage.load_notes("PL", self.game_name))
     
     def manual_open_local_file(self):
         path_str, _ = QFileDialog.getOpenFileName(
@@ -451,13 +625,9 @@ class PLMainWindow(QMainWindow):
             self.render_file(file_url)
     
     def stop_proxy(self):
-        if self.proxy_process:
-            try:
-                self.proxy_process.terminate()
-                self.proxy_process = None
-                self.append_log("<i>已关闭本地代理进程</i>")
-            except Exception:
-                pass
+        if self.tunnel.running:
+            self.tunnel.stop()
+            self.append_log("<i>已关闭本地代理进程</i>")
     
     def manual_disconnect(self):
         self.stop_proxy()
@@ -467,22 +637,16 @@ class PLMainWindow(QMainWindow):
         self.disconnect_btn.setEnabled(False)
         self.append_log("<i>已手动断开连接。</i>")
 
-    def load_character(self):
-        if not self.char_file.exists():
-            return {}
-        try:
-            with open(self.char_file, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except:
-            return {}
-
     def save_character(self):
-        self.char_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(self.char_file, "w", encoding="utf-8") as f:
-            json.dump(self.character_data, f, ensure_ascii=False, indent=4)
+        try:
+            self.character.save()
+        except Exception as e:
+            self.append_log(f"<span style='color:red'>角色卡保存失败: {e}</span>")
         self.push_character_sheet()
     
     def closeEvent(self, event):
+        self.storage.save_notes("PL", self.game_name, self.notes_widget.toPlainText())
         self.stop_proxy()
         self.client.disconnect_from_host()
+        self.save_session()
         super().closeEvent(event)
\ No newline at end of file
@@ -1,16 +1,15 @@
-import shutil
-from pathlib import Path
 from PySide6.QtWidgets import (
     QDialog, QVBoxLayout, QListWidget, QPushButton, 
     QHBoxLayout, QInputDialog, QMessageBox, QLabel
 )
+from core.storage import get_storage
 
 class GameSelectDialog(QDialog):
     def __init__(self, role, parent=None):
         super().__init__(parent)
         self.role = role
         self.selected_game = None
-        self.GAMES_DIR = Path("data") / self.role
+        self.storage = get_storage()
         
         self.setWindowTitle(f"选择游戏 ({self.role})")
         self.resize(450, 350)
@@ -55,12 +54,7 @@ class GameSelectDialog(QDialog):
 
     def refresh_list(self):
         self.game_list.clear()
-        if not self.GAMES_DIR.exists():
-            self.GAMES_DIR.mkdir(parents=True, exist_ok=True)
-        if self.GAMES_DIR.exists():
-            for item in self.GAMES_DIR.iterdir():
-                if item.is_dir():
-                    self.game_list.addItem(item.name)
+        self.game_list.addItems(self.storage.list_games(self.role))
 
     def create_game(self):
         name, ok = QInputDialog.getText(self, "新建游戏", "请输入游戏名称:")
@@ -70,13 +64,32 @@ class GameSelectDialog(QDialog):
                 QMessageBox.warning(self, "无效名称", "游戏名包含非字母数字字符或为空。")
                 return
 
-            path = self.GAMES_DIR / safe_name
-            if path.exists():
+            ruleset = self.choose_ruleset()
+            if ruleset is None:
+                return
+
+            if not self.storage.create_game(self.role, safe_name):
                 QMessageBox.warning(self, "错误", "该游戏名称已存在")
             else:
-                path.mkdir(parents=True)
+                self.storage.set_setting(self.role, safe_name, "ruleset", ruleset)
                 self.refresh_list()
 
+    def choose_ruleset(self):
+        """只有一个规则包时直接使用；取消选择时返回 None"""
+        from models.game_data import get_ruleset_loader, default_ruleset
+        packs = get_ruleset_loader().available()
+        default = default_ruleset()
+        if len(packs) <= 1:
+            return next(iter(packs), default)
+
+        pack_ids = list(packs)
+        labels = [f"{packs[p].get('name', p)} ({p})" for p in pack_ids]
+        current = pack_ids.index(default) if default in pack_ids else 0
+        label, ok = QInputDialog.getItem(self, "选择规则包", "此游戏使用的规则包:", labels, current, False)
+        if not ok:
+            return None
+        return pack_ids[labels.index(label)]
+
     def delete_game(self):
         item = self.game_list.currentItem()
         if not item: return
@@ -89,9 +102,8 @@ class GameSelectDialog(QDialog):
         )
         
         if reply == QMessageBox.Yes:
-            path = self.GAMES_DIR / game_name
             try:
-                shutil.rmtree(path)
+                self.storage.delete_game(self.role, game_name)
                 self.refresh_list()
             except Exception as e:
                 QMessageBox.critical(self, "删除失败", str(e))
@@ -6,7 +6,7 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtCore import Qt, Signal
 
-from models.static_data import QUALITY_ASSURANCES
+from models.game_data import get_game_data
 
 class DiceButton(QPushButton):
     def __init__(self, index, value=0, is_burned=False, parent=None):
@@ -52,7 +52,8 @@ class QADistributionDialog(QDialog):
         layout.addWidget(QLabel(f"请分配 {self.total_points} 点数到下列 QA 中："))
         
         grid = QGridLayout()
-        for row, (key, name) in enumerate(QUALITY_ASSURANCES.items()):
+        for row, (key, qa) in enumerate(get_game_data().qualities.items()):
+            name = qa.name
             current = self.qa_data.get(key, {}).get("current", 0)
             max_val = self.qa_data.get(key, {}).get("max", 0)
             
@@ -101,14 +102,15 @@ class QADistributionDialog(QDialog):
         return {k: s.value() for k, s in self.spinboxes.items() if s.value() > 0}
 
 class DiceTool(QDialog):
-    dataChanged = Signal()
     log_signal = Signal(str)
     chaosSignal = Signal(int)
 
-    def __init__(self, game_name, character_data, parent=None):
+    def __init__(self, game_name, model, parent=None):
         super().__init__(parent)
         self.game_name = game_name
-        self.data = character_data
+        self.model = model
+        self.data = model.data
+        self.model.fieldChanged.connect(self.on_field_changed)
         self.setWindowTitle("掷骰工具")
         self.resize(500, 700)
         
@@ -214,13 +216,18 @@ class DiceTool(QDialog):
         grid.addWidget(QLabel("检定素质 (QA):"), 0, 0)
         self.qa_combo = QComboBox()
         self.qa_combo.setStyleSheet("color: #333333; background: white;")
-        self.qa_keys = list(QUALITY_ASSURANCES.keys())
+        self.game_data = get_game_data()
+        self.qa_keys = list(self.game_data.qualities)
         self.refresh_qa_combo()
         self.qa_combo.currentIndexChanged.connect(self.update_burnout_display)
         grid.addWidget(self.qa_combo, 0, 1)
         
         parent_layout.addWidget(frame)
 
+    def on_field_changed(self, key):
+        if key in ("quality_assurances", "additional_burnout"):
+            self.refresh_qa_combo()
+
     def refresh_qa_combo(self):
         cur_idx = self.qa_combo.currentIndex()
         self.qa_combo.blockSignals(True)
@@ -228,7 +235,7 @@ class DiceTool(QDialog):
         qa = self.data.get("quality_assurances", {})
         for k in self.qa_keys:
             d = qa.get(k, {})
-            self.qa_combo.addItem(f"{QUALITY_ASSURANCES[k]} ({d.get('current',0)}/{d.get('max',0)})")
+            self.qa_combo.addItem(f"{self.game_data.quality_name(k)} ({d.get('current',0)}/{d.get('max',0)})")
         if cur_idx >= 0: self.qa_combo.setCurrentIndex(cur_idx)
         self.qa_combo.blockSignals(False)
         self.update_burnout_display()
@@ -244,7 +251,7 @@ class DiceTool(QDialog):
         key,val=self.get_current_qa()
         base = self.data.get("additional_burnout", 0)
         extra = 1 if val <= 0 else 0
-        self.burnout_label.setText(f"下次掷骰时的燃尽: {base + extra} {'(缺少素质【'+QUALITY_ASSURANCES[key]+'】)' if extra else ''}")
+        self.burnout_label.setText(f"下次掷骰时的燃尽: {base + extra} {'(缺少素质【'+self.game_data.quality_name(key)+'】)' if extra else ''}")
 
     def refresh_ui_dice(self, burned_indices):
         for i, btn in enumerate(self.dice_buttons):
@@ -274,7 +281,7 @@ class DiceTool(QDialog):
         self.unused_burnout=total_burn-len(burned_indices)
         
         self.roll_history = {
-            "qa_name": QUALITY_ASSURANCES.get(key, "未知"),
+            "qa_name": self.game_data.quality_name(key),
             "base_burnout": base_burn,
             "missing_qa": not has_qa,
             "total_burnout": total_burn,
@@ -331,14 +338,13 @@ class DiceTool(QDialog):
             
         item, ok = QInputDialog.getItem(
             self, "消耗 QA", "选择要消耗的素质保障来将此骰子改为3:",
-            [QUALITY_ASSURANCES[k] for k in available_qas], 0, False
+            [self.game_data.quality_name(k) for k in available_qas], 0, False
         )
         
         if ok and item:
-            selected_key = next(k for k in available_qas if QUALITY_ASSURANCES[k] == item)
+            selected_key = self.game_data.quality_key_by_name[item]
             qa_data[selected_key]['current'] -= 1
-            self.refresh_qa_combo()
-            self.dataChanged.emit()
+            self.model.notify("quality_assurances")
             
             self.current_rolls[index] = 3
             
@@ -364,17 +370,15 @@ class DiceTool(QDialog):
                 for key, added_val in distribution.items():
                     qa_data[key]['current'] += added_val
 
-                self.refresh_qa_combo()
-                self.dataChanged.emit()
+                self.model.notify("quality_assurances")
                 QMessageBox.information(self, "成功", "QA点数已回复")
-                info = ", ".join([f"{QUALITY_ASSURANCES[k]}+{v}" for k,v in distribution.items()])
+                info = ", ".join([f"{self.game_data.quality_name(k)}+{v}" for k,v in distribution.items()])
                 self.roll_history["triscendence_choice"] = f"回复QA ({info})"
             else:
                 return
 
         elif effect_type == "commendation":
-            self.data['commendations'] = self.data.get('commendations', 0) + 3
-            self.dataChanged.emit()
+            self.model.set('commendations', self.data.get('commendations', 0) + 3)
             self.roll_history["triscendence_choice"] = "获得3点嘉奖"
             QMessageBox.information(self, "成功", "已获得3点嘉奖")
             